@@ -7,15 +7,26 @@ both keep working.
 from .utils import *  # noqa: F401,F403
 from .events import *  # noqa: F401,F403
 from .config import *  # noqa: F401,F403
+from .blobs import *  # noqa: F401,F403
 from .state import *  # noqa: F401,F403
+from .scheduler import *  # noqa: F401,F403
 from .specs import *  # noqa: F401,F403
 from .prompts import *  # noqa: F401,F403
+from .procfs import *  # noqa: F401,F403
+from .sandbox import *  # noqa: F401,F403
 from .sessions import *  # noqa: F401,F403
+from .test_impact import *  # noqa: F401,F403
 from .tests_metrics import *  # noqa: F401,F403
+from .durations import *  # noqa: F401,F403
+from .verify_cache import *  # noqa: F401,F403
 from .git_ops import *  # noqa: F401,F403
+from .control import *  # noqa: F401,F403
+from .control_socket import *  # noqa: F401,F403
 from .supervisor import *  # noqa: F401,F403
 from .execution_log import *  # noqa: F401,F403
 from .executor import *  # noqa: F401,F403
+from .parallel import *  # noqa: F401,F403
+from .pipeline import *  # noqa: F401,F403
 from .entry import *  # noqa: F401,F403
 
 # Explicit re-exports for private names (skipped by * imports)
@@ -28,6 +39,7 @@ from .state import _REQUIRED_STATE_FIELDS_COMMON  # noqa: F401
 from .state import _REQUIRED_STATE_FIELDS_SINGLE  # noqa: F401
 from .state import _REQUIRED_STATE_FIELDS_EPIC  # noqa: F401
 from .state import _store_attempt_diff  # noqa: F401
+from .state import _drop_attempt_diff  # noqa: F401
 from .git_ops import _resolve_git_dir  # noqa: F401
 from .git_ops import _GIT_STUCK_STATE_MARKERS  # noqa: F401
 from .sessions import _kill_process_group  # noqa: F401
@@ -35,6 +47,7 @@ from .sessions import _is_permanent_error  # noqa: F401
 from .sessions import _extract_json_from_text  # noqa: F401
 from .supervisor import _get_memory_usage_mb  # noqa: F401
 from .supervisor import _get_child_pids  # noqa: F401
+from .supervisor import _get_process_tree  # noqa: F401
 from .supervisor import _count_completed_stories  # noqa: F401
 from .supervisor import _count_total_stories  # noqa: F401
 from .supervisor import _handle_split_story  # noqa: F401
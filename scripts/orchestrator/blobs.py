@@ -0,0 +1,73 @@
+"""Part of the KitTools orchestrator package (split from the monolithic
+execute_orchestrator.py during the 2.4.0 refactor). See the package-level
+__init__ for the full public API.
+
+Content-addressed blob store for large per-story payloads (attempt diffs).
+State keeps only the SHA-256; the payload lives gzip-compressed in
+`kit_tools/.execution-blobs/<sha>.<kind>.gz` and is read back only when a
+prompt needs it.
+"""
+from __future__ import annotations
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
+
+from .utils import log
+
+BLOB_DIR = os.path.join("kit_tools", ".execution-blobs")
+
+
+def get_blob_path(project_dir: str, sha: str, kind: str = "diff") -> str:
+    """Return absolute path of a blob."""
+    return os.path.join(project_dir, BLOB_DIR, f"{sha}.{kind}.gz")
+
+
+def put_blob(project_dir: str, data: str, kind: str = "diff") -> str:
+    """Store `data` (if not already present) and return its SHA-256."""
+    sha = hashlib.sha256(data.encode()).hexdigest()
+    path = get_blob_path(project_dir, sha, kind)
+    if os.path.exists(path):
+        return sha
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(gzip.compress(data.encode(), mtime=0))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return sha
+
+
+def get_blob(project_dir: str, sha: str | None, kind: str = "diff") -> str:
+    """Return a blob's text, or "" if it is missing or unreadable."""
+    if not sha:
+        return ""
+    try:
+        with open(get_blob_path(project_dir, sha, kind), "rb") as f:
+            return gzip.decompress(f.read()).decode("utf-8", errors="replace")
+    except (OSError, EOFError) as e:
+        log(f"  WARNING: Could not read blob {sha[:12]}: {e}")
+        return ""
+
+
+def delete_blob(project_dir: str, sha: str | None, kind: str = "diff") -> None:
+    """Remove a blob; missing blobs are ignored."""
+    if not sha:
+        return
+    try:
+        os.remove(get_blob_path(project_dir, sha, kind))
+    except OSError:
+        pass
+
+
+def remove_blob_store(project_dir: str) -> None:
+    """Delete the whole blob directory (run cleanup)."""
+    shutil.rmtree(os.path.join(project_dir, BLOB_DIR), ignore_errors=True)
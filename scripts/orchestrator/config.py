@@ -18,6 +18,9 @@ DEFAULT_MODEL_CONFIG = {
     "escalation": "opus",
 }
 
+# Seconds without any stream-json event before a session counts as stalled.
+DEFAULT_SESSION_STALL_TIMEOUT = 600
+
 
 def load_config(config_path: str) -> dict:
     """Read .execution-config.json written by the skill."""
@@ -41,3 +44,152 @@ def get_model_config(config: dict) -> dict:
     return merged
 
 
+
+
+def get_session_stall_timeout(config: dict) -> int | None:
+    """Return the session stall timeout in seconds (`session_stall_timeout`).
+
+    A session that emits no stream-json event for this long is killed early
+    instead of running out its full timeout. Missing or non-integer values
+    use DEFAULT_SESSION_STALL_TIMEOUT; 0 or negative disables stall detection.
+    """
+    value = config.get("session_stall_timeout", DEFAULT_SESSION_STALL_TIMEOUT)
+    if isinstance(value, bool) or not isinstance(value, int):
+        return DEFAULT_SESSION_STALL_TIMEOUT
+    return value if value > 0 else None
+
+
+def get_parallel_stories(config: dict) -> int:
+    """Return how many stories may run concurrently (`parallel_stories`).
+
+    Reads `config["parallel_stories"]` from `.execution-config.json`. Missing,
+    non-integer, or < 1 values fall back to 1 (the original serial executor).
+    Booleans are rejected explicitly — `True` is an int in Python and would
+    otherwise silently mean "one worker".
+    """
+    value = config.get("parallel_stories", 1)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        return 1
+    return value
+
+
+def get_speculative_candidates(config: dict, size: str | None = None) -> int:
+    """Return how many candidate attempts to race for a retry (`speculative_candidates`).
+
+    The config value maps spec sizes to candidate counts, e.g.
+    `{"L": 2, "XL": 3}`; sizes not listed get 1 (a normal serial retry).
+    With `size=None`, returns the largest count configured for any size.
+    Non-integer, boolean, or < 1 counts are ignored, as in
+    `get_parallel_stories`.
+    """
+    value = config.get("speculative_candidates")
+    if not isinstance(value, dict):
+        return 1
+    counts = {
+        str(k).upper(): v for k, v in value.items()
+        if isinstance(v, int) and not isinstance(v, bool) and v >= 1
+    }
+    if size is None:
+        return max(counts.values(), default=1)
+    return counts.get(size.upper(), 1)
+
+
+def get_max_sessions(config: dict) -> int:
+    """Return how many claude sessions may run at once (`max_sessions`).
+
+    Defaults to the larger of `parallel_stories` and the largest
+    `speculative_candidates` count, plus one for the overlapping verifier
+    when `pipeline_verification` is on, so those settings bound the number
+    of claude processes instead of multiplying. Invalid values use the
+    default, as in `get_parallel_stories`.
+    """
+    value = config.get("max_sessions")
+    if isinstance(value, int) and not isinstance(value, bool) and value >= 1:
+        return value
+    default = max(get_parallel_stories(config), get_speculative_candidates(config))
+    return default + 1 if config.get("pipeline_verification") else default
+
+
+ATTEMPT_ISOLATION_MODES = ("checkout", "worktree")
+
+
+def get_attempt_isolation(config: dict) -> str:
+    """Return how serial attempts are isolated (`attempt_isolation`).
+
+    `"checkout"` (the default) switches the main checkout to each attempt
+    branch; `"worktree"` runs each attempt in its own linked worktree so the
+    main checkout stays on the feature branch. Unknown values fall back to
+    `"checkout"`.
+    """
+    value = config.get("attempt_isolation", "checkout")
+    return value if value in ATTEMPT_ISOLATION_MODES else "checkout"
+
+
+def get_control_socket_enabled(config: dict) -> bool:
+    """Return whether to serve the Unix control socket (`control_socket`).
+
+    On by default; `false` leaves the supervisor on the control and health
+    files alone.
+    """
+    return config.get("control_socket", True) is not False
+
+
+HEARTBEAT_INTERVAL = 30  # seconds between health heartbeats while sessions run
+
+
+def get_heartbeat_interval(config: dict) -> int:
+    """Return seconds between health-file heartbeats (`heartbeat_interval`).
+
+    Defaults to HEARTBEAT_INTERVAL; 0 disables the heartbeat thread.
+    Negative, non-integer, or boolean values fall back to the default.
+    """
+    value = config.get("heartbeat_interval", HEARTBEAT_INTERVAL)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        return HEARTBEAT_INTERVAL
+    return value
+
+
+def get_session_memory_limit(config: dict) -> int | None:
+    """Return the per-session memory ceiling in MB (`session_memory_limit_mb`).
+
+    A session whose process tree (claude plus everything it spawned) grows
+    past this combined RSS is killed before the kernel OOM killer picks a
+    victim. Missing, non-integer, or <= 0 values disable the ceiling.
+    """
+    value = config.get("session_memory_limit_mb")
+    if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+        return None
+    return value
+
+
+def get_session_sandbox(config: dict) -> dict | None:
+    """Return resource limits for sandboxed subprocesses (`session_sandbox`).
+
+    `session_sandbox` is `true` (cgroup per session, no limits — kills still
+    go through `cgroup.kill`) or an object with `cpu_quota` (CPUs, e.g.
+    `1.5`), `memory_max_mb`, `pids_max` and `cgroup_parent` (a delegated
+    cgroup v2 directory to create sandboxes under). `cpu_quota` and
+    `pids_max` require `cgroup_parent`: the orchestrator's own cgroup holds
+    its process, so controllers cannot be enabled below it. Without it,
+    `memory_max_mb` is a per-process `RLIMIT_DATA`. Returns those keys with
+    None for unset or invalid values, or None when sandboxing is off.
+    """
+    value = config.get("session_sandbox")
+    if value is True:
+        value = {}
+    if not isinstance(value, dict) or value.get("enabled") is False:
+        return None
+
+    def positive(key: str, kind):
+        v = value.get(key)
+        if isinstance(v, bool) or not isinstance(v, kind) or v <= 0:
+            return None
+        return v
+
+    cpu_quota = positive("cpu_quota", (int, float))
+    return {
+        "cpu_quota": float(cpu_quota) if cpu_quota is not None else None,
+        "memory_max_mb": positive("memory_max_mb", int),
+        "pids_max": positive("pids_max", int),
+        "cgroup_parent": value.get("cgroup_parent") if isinstance(value.get("cgroup_parent"), str) else None,
+    }
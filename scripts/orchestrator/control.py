@@ -0,0 +1,303 @@
+"""Part of the KitTools orchestrator package (split from the monolithic
+execute_orchestrator.py during the 2.4.0 refactor). See the package-level
+__init__ for the full public API.
+
+Control-plane watcher for the pause file and the supervisor control file.
+A background thread wakes on inotify events for `kit_tools/` and
+`kit_tools/specs/` (falling back to polling every CONTROL_POLL_INTERVAL
+where inotify is unavailable), so a pause is lifted as soon as the file
+goes away. An `abort`, or a `skip_story`/`split_story` naming a running
+story, interrupts that story's sessions through their cancel events instead
+of waiting for the attempt to finish. The control file is only peeked at
+here; the coordinator still consumes it through `read_control_file`.
+"""
+from __future__ import annotations
+import atexit
+import contextlib
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import sys
+import threading
+import time
+from collections import deque
+
+from .utils import log
+
+PAUSE_FILE = os.path.join("kit_tools", ".pause_execution")
+CONTROL_FILE = os.path.join("kit_tools", "specs", ".execution-control.json")
+CONTROL_POLL_INTERVAL = 0.5  # seconds between checks without inotify
+CONTROL_RESCAN_INTERVAL = 5  # seconds; safety rescan while waiting on inotify
+# Control actions that interrupt running sessions: abort stops everything,
+# the others only the story they name.
+INTERRUPT_ACTIONS = ("abort", "skip_story", "split_story")
+
+# inotify(7) constants
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_WATCH_MASK = (
+    _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE
+    | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+)
+
+
+def _inotify_watch(dirs: list[str]) -> int | None:
+    """Return a non-blocking inotify fd watching `dirs`, or None if unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        init1, add_watch = libc.inotify_init1, libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    fd = init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        return None
+    watched = sum(add_watch(fd, os.fsencode(d), _WATCH_MASK) >= 0 for d in dirs)
+    if not watched:
+        os.close(fd)
+        return None
+    return fd
+
+
+class ControlWatcher:
+    """Background thread that reacts to pause and control file changes.
+
+    `generation` increases on every change of either file; `wait_for_change`
+    blocks until it moves. Sessions registered through `interruptible` have
+    their cancel event set when a matching control action appears.
+    """
+
+    def __init__(self, project_dir: str):
+        self.project_dir = project_dir
+        self.paths = [os.path.join(project_dir, PAUSE_FILE), os.path.join(project_dir, CONTROL_FILE)]
+        self.mode = "poll"
+        self.generation = 0
+        self._changed = threading.Condition()
+        self._sessions: dict[int, dict] = {}
+        self._stop = threading.Event()
+        self._fd: int | None = None
+        self._wake_r, self._wake_w = os.pipe()
+        self._last: tuple = ()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._fd = _inotify_watch(sorted({os.path.dirname(p) for p in self.paths}))
+        self.mode = "inotify" if self._fd is not None else "poll"
+        self._last = self._stamp()  # Baseline before returning, so no change is missed
+        self._thread = threading.Thread(target=self._run, name="kit-control-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        try:
+            os.write(self._wake_w, b"\0")
+        except OSError:
+            pass
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._fd = None
+
+    def _stamp(self) -> tuple:
+        stamp = []
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+                stamp.append((st.st_ino, st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _wait_for_event(self) -> None:
+        """Block until inotify reports activity, or one poll interval passes."""
+        if self._fd is None:
+            self._stop.wait(CONTROL_POLL_INTERVAL)
+            return
+        try:
+            ready, _, _ = select.select([self._fd, self._wake_r], [], [], CONTROL_RESCAN_INTERVAL)
+        except (OSError, ValueError):
+            self._stop.wait(CONTROL_POLL_INTERVAL)
+            return
+        if self._fd in ready:
+            # Only "something changed" matters — stat() tells which file
+            with contextlib.suppress(BlockingIOError, OSError):
+                while os.read(self._fd, 65536):
+                    pass
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wait_for_event()
+            stamp = self._stamp()
+            if stamp == self._last:
+                continue
+            self._last = stamp
+            with self._changed:
+                self.generation += 1
+                self._changed.notify_all()
+            if stamp[1] is not None:
+                self._interrupt_for(self._peek_control())
+
+    def _peek_control(self) -> dict | None:
+        """Read the control file without consuming it (None if absent or partial)."""
+        try:
+            with open(self.paths[1], "r") as f:
+                control = json.load(f)
+        except (OSError, ValueError):
+            return None  # A partial write is re-read on its next close
+        return control if isinstance(control, dict) else None
+
+    def _interrupt_for(self, control: dict | None) -> None:
+        action = (control or {}).get("action")
+        if action not in INTERRUPT_ACTIONS:
+            return
+        with self._changed:
+            targets = [
+                s for s in self._sessions.values()
+                if not s["cancel"].is_set()
+                and (action == "abort" or s["story_id"] == control.get("story_id"))
+            ]
+            for session in targets:
+                session["interrupted"] = action
+                session["cancel"].set()
+        if targets:
+            labels = ", ".join(sorted({s["story_id"] or "session" for s in targets}))
+            log(f"  Supervisor {action} received — interrupting {labels}")
+
+    def register(self, story_id: str | None, cancel: threading.Event) -> dict:
+        with self._changed:
+            session = {"story_id": story_id, "cancel": cancel, "interrupted": None}
+            self._sessions[id(session)] = session
+        # An action already waiting in the control file applies straight away
+        if os.path.exists(self.paths[1]):
+            self._interrupt_for(self._peek_control())
+        return session
+
+    def unregister(self, session: dict) -> None:
+        with self._changed:
+            self._sessions.pop(id(session), None)
+
+    def notify(self, control: dict) -> None:
+        """Apply a control action that arrived without touching the files."""
+        with self._changed:
+            self.generation += 1
+            self._changed.notify_all()
+        self._interrupt_for(control)
+
+    def wait_for_change(self, generation: int, timeout: float) -> int:
+        """Wait until `generation` moves on (or `timeout`); return the current one."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.generation != generation, timeout=timeout)
+            return self.generation
+
+
+_WATCHER: ControlWatcher | None = None
+_WATCHER_LOCK = threading.Lock()
+# Control actions submitted in-process (control socket); `read_control_file`
+# consumes them ahead of the control file.
+_SUBMITTED: deque[dict] = deque()
+_SUBMITTED_LOCK = threading.Lock()
+
+
+def start_control_watcher(project_dir: str) -> ControlWatcher:
+    """Start (or return the running) control watcher for `project_dir`."""
+    global _WATCHER
+    with _WATCHER_LOCK:
+        if _WATCHER is None:
+            _WATCHER = ControlWatcher(project_dir)
+            _WATCHER.start()
+            log(f"  Control watcher: {_WATCHER.mode}")
+        return _WATCHER
+
+
+def stop_control_watcher() -> None:
+    """Stop the control watcher, if one is running."""
+    global _WATCHER
+    with _WATCHER_LOCK:
+        watcher, _WATCHER = _WATCHER, None
+    if watcher is not None:
+        watcher.stop()
+
+
+atexit.register(stop_control_watcher)
+
+
+def get_control_watcher() -> ControlWatcher | None:
+    """Return the running control watcher, or None."""
+    return _WATCHER
+
+
+@contextlib.contextmanager
+def interruptible(story_id: str | None, cancel: threading.Event):
+    """Let control actions for `story_id` set `cancel` while the block runs.
+
+    Yields a dict whose `interrupted` key names the action (e.g. "abort")
+    once the watcher has set `cancel`, and stays None otherwise. Without a
+    running watcher the block simply runs uninterruptible.
+    """
+    watcher = _WATCHER
+    if watcher is None:
+        yield {"story_id": story_id, "cancel": cancel, "interrupted": None}
+        return
+    session = watcher.register(story_id, cancel)
+    try:
+        yield session
+    finally:
+        watcher.unregister(session)
+
+
+def control_generation() -> int:
+    """Current change counter of the pause/control files (0 without a watcher)."""
+    watcher = _WATCHER
+    return watcher.generation if watcher else 0
+
+
+def wait_for_control_change(generation: int, timeout: float) -> int:
+    """Sleep up to `timeout`, returning early when the pause or control file changes.
+
+    Without a running watcher this is a plain sleep. Returns the current
+    `control_generation()` for the next call.
+    """
+    watcher = _WATCHER
+    if watcher is None:
+        time.sleep(timeout)
+        return 0
+    return watcher.wait_for_change(generation, timeout)
+
+
+def submit_control(control: dict) -> None:
+    """Queue a control action exactly as if it had been written to the control file.
+
+    Running sessions it targets are interrupted straight away; the
+    coordinator applies the action at its next control check.
+    """
+    with _SUBMITTED_LOCK:
+        _SUBMITTED.append(control)
+    watcher = _WATCHER
+    if watcher is not None:
+        watcher.notify(control)
+
+
+def pop_submitted_control() -> dict | None:
+    """Return (and remove) the oldest submitted control action, or None."""
+    with _SUBMITTED_LOCK:
+        return _SUBMITTED.popleft() if _SUBMITTED else None
+
+
+def pending_control_count() -> int:
+    """Number of submitted control actions not yet applied."""
+    with _SUBMITTED_LOCK:
+        return len(_SUBMITTED)
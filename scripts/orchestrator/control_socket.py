@@ -0,0 +1,266 @@
+"""Part of the KitTools orchestrator package (split from the monolithic
+execute_orchestrator.py during the 2.4.0 refactor). See the package-level
+__init__ for the full public API.
+
+Unix-domain control socket. The supervisor sends newline-delimited
+JSON-RPC 2.0 requests to `kit_tools/specs/.execution-control.sock` and gets
+one response line per request:
+
+    {"jsonrpc": "2.0", "id": 1, "method": "skip_story",
+     "params": {"story_id": "US-003", "reason": "..."}}
+
+Methods: `status` (in-memory health snapshot with live session progress),
+`pause`, `resume`, `abort`, `skip_story`, `split_story` (same params as the
+control file actions, applied through `handle_control_action`) and
+`subscribe`, which turns the connection into a stream of
+`{"method": "event", "params": {"kind", "data"}}` notifications for
+health snapshots, notifications and structured events. The control and
+health files keep working alongside the socket.
+"""
+from __future__ import annotations
+import atexit
+import hashlib
+import json
+import os
+import queue
+import socket
+import socketserver
+import tempfile
+import threading
+
+from .control import PAUSE_FILE, pending_control_count, submit_control
+from .events import subscribe_events, unsubscribe_events
+from .sessions import get_session_progress
+from .utils import log
+
+CONTROL_SOCKET = os.path.join("kit_tools", "specs", ".execution-control.sock")
+SOCKET_PATH_MAX = 100  # bytes; sun_path holds 104 (macOS) / 108 (Linux)
+REQUEST_MAX = 1024 * 1024  # bytes per request line
+SUBSCRIBER_QUEUE_MAX = 1000  # events buffered for a slow subscriber before it is dropped
+CONTROL_ACTIONS = ("pause", "abort", "skip_story", "split_story")
+
+_SERVER: socketserver.BaseServer | None = None
+_SERVER_LOCK = threading.Lock()
+_SOCKET_PATH: str | None = None
+_LAST_HEALTH: dict | None = None
+
+
+class _RpcError(Exception):
+    """A JSON-RPC error response (`code`, message)."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def _remember_health(event: dict) -> None:
+    """Keep the latest health snapshot (and control receipts) for `status`."""
+    global _LAST_HEALTH
+    if event["kind"] == "health":
+        _LAST_HEALTH = event["data"]
+    elif event["kind"] == "control" and _LAST_HEALTH is not None:
+        _LAST_HEALTH = {**_LAST_HEALTH, **event["data"]}
+
+
+def get_control_socket_path() -> str | None:
+    """Path of the running control socket, or None when it is not serving."""
+    return _SOCKET_PATH
+
+
+def _socket_path(project_dir: str) -> str:
+    """Socket path for a project; a temp-dir path when the project path is too long."""
+    path = os.path.join(project_dir, CONTROL_SOCKET)
+    if len(os.fsencode(path)) <= SOCKET_PATH_MAX:
+        return path
+    digest = hashlib.sha256(os.path.realpath(project_dir).encode()).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"kit-tools-{digest}.sock")
+
+
+def _rpc_status(config: dict, params: dict) -> dict:
+    health = dict(_LAST_HEALTH) if _LAST_HEALTH else None
+    if health is not None:
+        health["sessions"] = get_session_progress()
+    return {
+        "pid": os.getpid(),
+        "paused": os.path.exists(os.path.join(config["project_dir"], PAUSE_FILE)),
+        "pending_controls": pending_control_count(),
+        "health": health,
+    }
+
+
+def _rpc_resume(config: dict, params: dict) -> dict:
+    try:
+        os.remove(os.path.join(config["project_dir"], PAUSE_FILE))
+        return {"resumed": True}
+    except FileNotFoundError:
+        return {"resumed": False}
+
+
+def _rpc_control(method: str, params: dict) -> dict:
+    """Queue a control action; same shape as the control file's JSON."""
+    if method in ("skip_story", "split_story") and not isinstance(params.get("story_id"), str):
+        raise _RpcError(-32602, f"{method} requires a 'story_id' string")
+    if method == "split_story" and not isinstance(params.get("new_stories"), list):
+        raise _RpcError(-32602, "split_story requires a 'new_stories' list")
+    submit_control({**params, "action": method})
+    log(f"  Control socket: queued {method}")
+    return {"queued": True, "pending_controls": pending_control_count()}
+
+
+def _dispatch(line: bytes, config: dict) -> tuple[dict | None, bool]:
+    """Answer one request line. Returns (response or None, start_subscription)."""
+    request_id = None
+    try:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            raise _RpcError(-32700, "Parse error")
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            raise _RpcError(-32600, "Invalid request")
+        request_id = request.get("id")
+        method = request["method"]
+        params = request.get("params") or {}
+        if not isinstance(params, dict):
+            raise _RpcError(-32602, "params must be an object")
+        if method == "status":
+            result = _rpc_status(config, params)
+        elif method == "resume":
+            result = _rpc_resume(config, params)
+        elif method in CONTROL_ACTIONS:
+            result = _rpc_control(method, params)
+        elif method == "subscribe":
+            return {"jsonrpc": "2.0", "id": request_id, "result": {"subscribed": True}}, True
+        else:
+            raise _RpcError(-32601, f"Method not found: {method}")
+    except _RpcError as e:
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": e.code, "message": str(e)}}, False
+    if "id" not in request:
+        return None, False  # Notification: no response
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}, False
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    """One client connection: request/response lines, or an event stream."""
+
+    def _send(self, message: dict) -> None:
+        self.wfile.write(json.dumps(message).encode() + b"\n")
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        try:
+            while True:
+                line = self.rfile.readline(REQUEST_MAX + 1)
+                if not line:
+                    return
+                if len(line) > REQUEST_MAX:
+                    self._send({"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Request too large"}})
+                    return
+                if not line.strip():
+                    continue
+                response, subscribe = _dispatch(line, self.server.config)
+                if response is not None:
+                    self._send(response)
+                if subscribe:
+                    self._stream_events()
+                    return
+        except OSError:
+            pass  # Client went away
+
+    def _stream_events(self) -> None:
+        events: queue.Queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_MAX)
+        overflowed = threading.Event()
+
+        def deliver(event: dict) -> None:
+            try:
+                events.put_nowait(event)
+            except queue.Full:
+                overflowed.set()
+
+        subscribe_events(deliver)
+        try:
+            while not self.server.stopping.is_set() and not overflowed.is_set():
+                try:
+                    event = events.get(timeout=1)
+                except queue.Empty:
+                    continue
+                self._send({"jsonrpc": "2.0", "method": "event", "params": event})
+        finally:
+            unsubscribe_events(deliver)
+
+
+class _ControlServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    block_on_close = False
+
+    def __init__(self, path: str, config: dict):
+        self.config = config
+        self.stopping = threading.Event()
+        super().__init__(path, _ControlHandler)
+
+
+def _socket_in_use(path: str) -> bool:
+    """True if another process is accepting connections on `path`."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.settimeout(1)
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def start_control_socket(config: dict) -> str | None:
+    """Serve the control socket for this run; returns its path, or None if unavailable."""
+    global _SERVER, _SOCKET_PATH
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    with _SERVER_LOCK:
+        if _SERVER is not None:
+            return _SOCKET_PATH
+        path = _socket_path(config["project_dir"])
+        if os.path.exists(path):
+            if _socket_in_use(path):
+                log(f"  WARNING: control socket {path} is in use by another process — not serving")
+                return None
+            try:
+                os.remove(path)  # Stale socket from a crashed run
+            except OSError:
+                pass
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            old_umask = os.umask(0o077)  # Owner-only from the moment it is bound
+            try:
+                server = _ControlServer(path, config)
+            finally:
+                os.umask(old_umask)
+        except OSError as e:
+            log(f"  WARNING: could not start control socket: {e}")
+            return None
+        subscribe_events(_remember_health)
+        threading.Thread(target=server.serve_forever, name="kit-control-socket", daemon=True).start()
+        _SERVER, _SOCKET_PATH = server, path
+    log(f"  Control socket: {path}")
+    return path
+
+
+def stop_control_socket() -> None:
+    """Stop serving and remove the socket file."""
+    global _SERVER, _SOCKET_PATH
+    with _SERVER_LOCK:
+        server, path = _SERVER, _SOCKET_PATH
+        _SERVER = _SOCKET_PATH = None
+    if server is None:
+        return
+    server.stopping.set()
+    server.shutdown()
+    server.server_close()
+    unsubscribe_events(_remember_health)
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+atexit.register(stop_control_socket)
@@ -0,0 +1,185 @@
+"""Part of the KitTools orchestrator package (split from the monolithic
+execute_orchestrator.py during the 2.4.0 refactor). See the package-level
+__init__ for the full public API.
+
+Session duration history and adaptive timeouts. Every implementation and
+verification session's wall-clock is recorded in the state file and in the
+project-level `kit_tools/.execution-session-history.jsonl`; timeouts for new sessions
+come from percentiles of similar past sessions instead of the fixed
+size map alone.
+"""
+from __future__ import annotations
+import json
+import math
+import os
+
+from .utils import log, now_iso
+
+SESSION_HISTORY_FILE = os.path.join("kit_tools", ".execution-session-history.jsonl")
+SESSION_HISTORY_MAX = 2000  # entries kept in the history file
+STATE_DURATIONS_MAX = 200  # entries kept in state["session_durations"]
+ADAPTIVE_MIN_SAMPLES = 5  # similar sessions needed before trusting the history
+ADAPTIVE_PERCENTILE = 95
+ADAPTIVE_HEADROOM = 1.5  # multiplier on the percentile
+ADAPTIVE_TIMEOUT_MIN = 180
+ADAPTIVE_TIMEOUT_MAX = 3600
+
+# Parsed history per path, keyed on (mtime, size) so repeated lookups in one
+# run don't re-read the file.
+_HISTORY_CACHE: dict[str, tuple[tuple[float, int], list[dict]]] = {}
+
+
+def get_session_history_path(project_dir: str) -> str:
+    """Return absolute path to the session duration history file."""
+    return os.path.join(project_dir, SESSION_HISTORY_FILE)
+
+
+def criteria_band(count: int) -> str:
+    """Bucket an acceptance-criteria count into a coarse band."""
+    if count <= 3:
+        return "1-3"
+    if count <= 6:
+        return "4-6"
+    return "7+"
+
+
+def session_outcome(output: str) -> str:
+    """Classify a session result for the history: ok, timeout, stalled or error."""
+    if not output.startswith(("SESSION_ERROR:", "SESSION_ERROR_PERMANENT:")):
+        return "ok"
+    if "Timed out" in output:
+        return "stalled" if "stalled" in output else "timeout"
+    return "error"
+
+
+def load_session_history(project_dir: str) -> list[dict]:
+    """Read the duration history (oldest first). Malformed lines are skipped."""
+    path = get_session_history_path(project_dir)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return []
+    key = (st.st_mtime, st.st_size)
+    cached = _HISTORY_CACHE.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+    entries = []
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict) and isinstance(entry.get("duration_s"), (int, float)):
+                    entries.append(entry)
+    except OSError:
+        return []
+    _HISTORY_CACHE[path] = (key, entries)
+    return entries
+
+
+def _append_history(project_dir: str, entry: dict) -> None:
+    """Append one entry to the history file, trimming it to SESSION_HISTORY_MAX.
+
+    Uses fcntl for file locking, like the persistent learnings file — several
+    orchestrators may share one project.
+    """
+    import fcntl
+
+    path = get_session_history_path(project_dir)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a+") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            # Trim with slack so the rewrite happens rarely, not on every append
+            history = load_session_history(project_dir)
+            if len(history) > SESSION_HISTORY_MAX * 1.25:
+                f.seek(0)
+                f.truncate()
+                for kept in history[-SESSION_HISTORY_MAX:]:
+                    f.write(json.dumps(kept) + "\n")
+    except OSError as e:
+        log(f"  WARNING: Could not update session history: {e}")
+
+
+def record_session_duration(
+    config: dict, state: dict, kind: str, story: dict, model: str | None,
+    size: str, duration_s: float, output: str, timeout: int,
+) -> None:
+    """Record one session's wall-clock in the state and the project history.
+
+    `kind` is "implementation" or "verification". Timed-out sessions are kept
+    with their duration as a lower bound; stalled and errored sessions are
+    recorded but ignored when computing timeouts.
+    """
+    entry = {
+        "at": now_iso(),
+        "kind": kind,
+        "story_id": story["id"],
+        "model": model,
+        "size": size,
+        "criteria": len(story.get("criteria", [])),
+        "duration_s": round(duration_s, 1),
+        "timeout_s": timeout,
+        "outcome": session_outcome(output),
+    }
+    durations = state.setdefault("session_durations", [])
+    durations.append(entry)
+    if len(durations) > STATE_DURATIONS_MAX:
+        del durations[:-STATE_DURATIONS_MAX]
+    _append_history(config["project_dir"], entry)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = min(len(ordered), max(1, math.ceil(pct / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def adaptive_timeout(
+    config: dict, kind: str, model: str | None, size: str, criteria_count: int,
+    default: int, story_state: dict | None = None,
+) -> int:
+    """Pick a session timeout from the history of similar sessions.
+
+    Looks for at least ADAPTIVE_MIN_SAMPLES completed or timed-out sessions
+    of the same kind, widening the bucket from (model, size, criteria band)
+    to (model, size) to (size). The timeout is the ADAPTIVE_PERCENTILE
+    duration times ADAPTIVE_HEADROOM, clamped to
+    [ADAPTIVE_TIMEOUT_MIN, ADAPTIVE_TIMEOUT_MAX]. Falls back to `default` (the
+    size-map timeout) without enough history or when `adaptive_timeouts` is
+    false. If this story's last attempt timed out in this kind of session,
+    the retry never gets less time than `default`.
+    """
+    if config.get("adaptive_timeouts", True) is False:
+        return default
+    timeout_type = "TIMEOUT_IMPL" if kind == "implementation" else "TIMEOUT_VERIFY"
+    retry_after_timeout = bool(story_state) and story_state.get("failure_type") == timeout_type
+
+    history = [
+        e for e in load_session_history(config["project_dir"])
+        if e.get("kind") == kind and e.get("outcome") in ("ok", "timeout")
+    ]
+    band = criteria_band(criteria_count)
+    buckets = (
+        lambda e: e.get("model") == model and e.get("size") == size
+        and criteria_band(e.get("criteria", 0)) == band,
+        lambda e: e.get("model") == model and e.get("size") == size,
+        lambda e: e.get("size") == size,
+    )
+    for matches in buckets:
+        samples = [e["duration_s"] for e in history if matches(e)]
+        if len(samples) >= ADAPTIVE_MIN_SAMPLES:
+            break
+    else:
+        return default
+
+    timeout = _percentile(samples, ADAPTIVE_PERCENTILE) * ADAPTIVE_HEADROOM
+    timeout = int(max(ADAPTIVE_TIMEOUT_MIN, min(ADAPTIVE_TIMEOUT_MAX, timeout)))
+    if retry_after_timeout:
+        return max(timeout, default)
+    return timeout
@@ -9,7 +9,19 @@ import os
 import signal
 import sys
 
-from .config import get_model_config, load_config
+from .config import (
+    get_control_socket_enabled,
+    get_max_sessions,
+    get_model_config,
+    get_parallel_stories,
+    get_session_memory_limit,
+    get_session_sandbox,
+    get_session_stall_timeout,
+    get_speculative_candidates,
+    load_config,
+)
+from .control import start_control_watcher
+from .control_socket import start_control_socket
 from .events import (
     NOTIFICATION_FILE,
     log_event,
@@ -19,6 +31,7 @@ from .execution_log import (
     get_log_path,
     init_execution_log,
     log_completion,
+    log_critical_path,
 )
 from .executor import execute_spec_stories
 from .git_ops import (
@@ -31,19 +44,35 @@ from .git_ops import (
     verify_branch_base,
     verify_clean_worktree,
 )
+from .parallel import execute_spec_stories_parallel, prepare_spec_run, run_parallel_specs
+from .pipeline import execute_spec_stories_pipelined
 from .prompts import persist_learnings
-from .sessions import clean_result_files, is_session_error, run_claude_session
-from .specs import archive_spec, check_dependencies_archived, tag_checkpoint
+from .sandbox import check_sandbox_limits
+from .sessions import clean_result_files, is_session_error, run_claude_session, set_max_sessions
+from .scheduler import build_story_dag, critical_path, has_dependencies, ready_nodes
+from .specs import (
+    archive_spec,
+    build_spec_dag,
+    check_dependencies_archived,
+    parse_stories_from_spec,
+    tag_checkpoint,
+)
 from .state import (
     StateCorrupt,
     _atomic_json_write,
+    compact_state_journal,
     get_state_path,
     load_or_create_epic_state,
     load_or_create_state,
     save_state,
 )
-from .supervisor import pause_file_exists, wait_for_pause_removal
-from .utils import kill_tmux_session, log, now_iso, run_git
+from .supervisor import (
+    pause_file_exists,
+    start_heartbeat,
+    wait_for_pause_removal,
+    write_session_progress,
+)
+from .utils import format_git_timings, kill_tmux_session, log, now_iso, run_git
 
 
 def register_crash_handler(config: dict) -> None:
@@ -53,6 +82,7 @@ def register_crash_handler(config: dict) -> None:
     def _on_exit():
         try:
             kill_tmux_session(config)
+            compact_state_journal(config)
             if not os.path.exists(state_path):
                 return
             with open(state_path, "r") as f:
@@ -85,6 +115,69 @@ def register_crash_handler(config: dict) -> None:
     signal.signal(signal.SIGTERM, _on_sigterm)
 
 
+def run_spec_stories(
+    spec_path: str, feature_name: str, config: dict, state: dict,
+    spec_key: str | None = None
+) -> dict:
+    """Run a spec's stories with the serial, pipelined or parallel executor.
+
+    Parallel execution (`parallel_stories` > 1 or `speculative_candidates`)
+    and pipelined verification (`pipeline_verification`) are autonomous-only: guarded mode prompts on
+    the terminal after repeated failures, which cannot be interleaved
+    sensibly across concurrent attempts.
+    """
+    workers = get_parallel_stories(config)
+    if _use_parallel_executor(config):
+        return execute_spec_stories_parallel(spec_path, feature_name, config, state, spec_key=spec_key)
+    if config.get("mode") == "guarded":
+        if workers > 1 or config.get("pipeline_verification") or get_speculative_candidates(config) > 1:
+            log("  parallel_stories / pipeline_verification / speculative_candidates ignored in guarded mode — running stories serially")
+    elif config.get("pipeline_verification"):
+        return execute_spec_stories_pipelined(spec_path, feature_name, config, state, spec_key=spec_key)
+    return execute_spec_stories(spec_path, feature_name, config, state, spec_key=spec_key)
+
+
+def _use_parallel_executor(config: dict) -> bool:
+    """True if stories should go through the parallel coordinator.
+
+    Speculative candidates need per-attempt worktrees, so configuring
+    `speculative_candidates` selects the coordinator even with one worker.
+    """
+    if config.get("mode") == "guarded":
+        return False
+    return get_parallel_stories(config) > 1 or get_speculative_candidates(config) > 1
+
+
+def log_story_critical_path(config: dict, spec_path: str) -> None:
+    """Log the spec's story critical path if any story declares `Depends on:`."""
+    dag = build_story_dag(parse_stories_from_spec(spec_path))
+    if has_dependencies(dag):
+        log_critical_path(config, critical_path(dag), len(dag))
+
+
+def log_epic_critical_path(
+    config: dict, epic_specs: list[dict], spec_dag: dict[str, list[str]]
+) -> None:
+    """Log the critical path across an epic's stories.
+
+    Every story of a spec depends on every story of the specs it depends on,
+    plus its own `Depends on:` stories. Nodes are `<spec basename>:<story id>`.
+    """
+    stories_by_spec = {
+        os.path.basename(info["spec_path"]): parse_stories_from_spec(info["spec_path"])
+        for info in epic_specs
+    }
+    dag: dict[str, list[str]] = {}
+    for key, stories in stories_by_spec.items():
+        upstream = [
+            f"{dep}:{s['id']}" for dep in spec_dag.get(key, []) for s in stories_by_spec.get(dep, [])
+        ]
+        for story_id, deps in build_story_dag(stories).items():
+            dag[f"{key}:{story_id}"] = [f"{key}:{d}" for d in deps] + upstream
+    if has_dependencies(dag):
+        log_critical_path(config, critical_path(dag), len(dag))
+
+
 def run_single_spec(config: dict) -> None:
     """Execute a single feature spec (original behavior, backwards compatible)."""
     state, is_rerun = load_or_create_state(config)
@@ -117,10 +210,11 @@ def run_single_spec(config: dict) -> None:
 
     # Initialize execution log
     init_execution_log(config)
+    log_story_critical_path(config, spec_path)
     commit_tracking_files(project_dir, config.get("feature_name", "feature"))
 
     # Execute all stories
-    execute_spec_stories(spec_path, config.get("feature_name", "feature"), config, state)
+    run_spec_stories(spec_path, config.get("feature_name", "feature"), config, state)
 
     # All stories complete
     log("All stories complete!")
@@ -149,7 +243,13 @@ def run_single_spec(config: dict) -> None:
         f"Run /kit-tools:validate-implementation for feature spec {spec_basename}. "
         f"Mode: autonomous. Branch: {branch}."
     )
-    validate_output = run_claude_session(validate_prompt, project_dir, model=validator_model)
+    validate_output = run_claude_session(
+        validate_prompt, project_dir, model=validator_model,
+        label=f"validate {spec_basename}", stall_timeout=get_session_stall_timeout(config),
+        on_progress=lambda: write_session_progress(config),
+        memory_limit_mb=get_session_memory_limit(config),
+        sandbox_limits=get_session_sandbox(config),
+    )
 
     if is_session_error(validate_output):
         log(f"Validation session error: {validate_output[:200]}")
@@ -182,8 +282,132 @@ def run_single_spec(config: dict) -> None:
     complete_feature(config, state, validation_clean)
 
 
+def _start_epic_spec(config: dict, state: dict, spec_info: dict, index: int) -> None:
+    """Gate on archived dependencies and open the spec's state entry."""
+    project_dir = config["project_dir"]
+    epic_name = config["epic_name"]
+    spec_path = spec_info["spec_path"]
+    spec_basename = os.path.basename(spec_path)
+
+    # Hard gate: verify dependencies are archived
+    deps_ok, missing = check_dependencies_archived(project_dir, spec_path)
+    if not deps_ok:
+        log(f"ERROR: Dependencies not met for {spec_basename}: {missing}")
+        log("Cannot continue epic execution.")
+        state["status"] = "blocked"
+        save_state(state, config)
+        write_notification(
+            config, "execution_paused",
+            "Epic blocked on dependencies",
+            f"{spec_basename} blocked — missing: {', '.join(missing)}",
+            severity="critical",
+        )
+        commit_tracking_files(project_dir, epic_name)
+        clean_result_files(project_dir)
+        sys.exit(1)
+
+    log(f"--- Feature spec {index+1}/{len(config['epic_specs'])}: {spec_basename} ---")
+
+    # Initialize feature spec state entry
+    if spec_basename not in state["specs"]:
+        state["specs"][spec_basename] = {
+            "feature_name": spec_info["feature_name"],
+            "status": "in_progress",
+            "started_at": now_iso(),
+            "stories": {},
+        }
+    state["current_spec"] = spec_basename
+    save_state(state, config)
+
+
+def _finish_epic_spec(config: dict, state: dict, spec_info: dict, index: int) -> None:
+    """Validate, tag, archive and commit a feature spec whose stories are all done."""
+    project_dir = config["project_dir"]
+    epic_name = config["epic_name"]
+    spec_path = spec_info["spec_path"]
+    feature_name = spec_info["feature_name"]
+    is_final = spec_info.get("epic_final", False)
+    spec_basename = os.path.basename(spec_path)
+
+    # Feature spec stories complete — validate
+    validator_model = get_model_config(config)["validator"]
+    log(f"  All stories complete for {spec_basename}. Validating (model={validator_model})...")
+    validate_prompt = (
+        f"Run /kit-tools:validate-implementation for feature spec {spec_basename}. "
+        f"Mode: autonomous. Branch: {config['branch_name']}. "
+        f"This is part of an epic — do NOT invoke complete-implementation."
+    )
+    validate_output = run_claude_session(
+        validate_prompt, project_dir, model=validator_model,
+        label=f"validate {spec_basename}", stall_timeout=get_session_stall_timeout(config),
+        on_progress=lambda: write_session_progress(config),
+        memory_limit_mb=get_session_memory_limit(config),
+        sandbox_limits=get_session_sandbox(config),
+    )
+    state["sessions"]["total"] += 1
+    state["sessions"]["validation"] += 1
+
+    if is_session_error(validate_output):
+        log(f"  Validation error: {validate_output[:200]}")
+        # Continue anyway — validation is informational
+
+    # Check for pause file (created by validate-implementation if critical findings exist)
+    if pause_file_exists(project_dir):
+        log(f"  Critical validation findings for {spec_basename}. Pausing.")
+        wait_for_pause_removal(project_dir, config=config)
+        log("  Resuming after pause.")
+
+    # Commit tracking files for this feature spec
+    commit_tracking_files(project_dir, feature_name)
+
+    # Tag checkpoint
+    tag_checkpoint(project_dir, epic_name, feature_name)
+
+    # Archive feature spec
+    archive_spec(project_dir, spec_path, feature_name)
+
+    # Commit archive + tag
+    run_git(
+        ["commit", "-m", f"chore({epic_name}): complete {feature_name}", "--allow-empty"],
+        project_dir, check=True
+    )
+
+    # Update state
+    state["specs"][spec_basename]["status"] = "completed"
+    state["specs"][spec_basename]["completed_at"] = now_iso()
+    save_state(state, config)
+
+    log(f"  {spec_basename} complete. Tagged: {epic_name}/{feature_name}-complete")
+    write_notification(
+        config, "spec_complete",
+        f"Feature spec complete: {feature_name}",
+        f"{spec_basename} ({index+1}/{len(config['epic_specs'])}) complete in epic {epic_name}",
+        severity="info",
+    )
+
+    # Pause between feature specs if configured
+    if config.get("epic_pause_between_specs") and not is_final:
+        pause_path = os.path.join(project_dir, "kit_tools", ".pause_execution")
+        with open(pause_path, "w") as f:
+            f.write(f"Epic paused after {spec_basename}. Remove this file to continue.\n")
+        log(f"  Pausing between feature specs. Review {spec_basename} results, then:")
+        log(f"    rm kit_tools/.pause_execution")
+        write_notification(
+            config, "execution_paused",
+            "Epic paused between feature specs",
+            f"Paused after {spec_basename}. Remove pause file to continue.",
+            severity="warning",
+        )
+        wait_for_pause_removal(project_dir, config=config)
+
+
 def run_epic(config: dict) -> None:
-    """Execute an epic: multiple feature specs in sequence on a shared branch."""
+    """Execute an epic: multiple feature specs on a shared branch.
+
+    Specs run in dependency order (frontmatter `depends_on`), falling back to
+    listed order among independent specs. With `parallel_stories` > 1 the
+    stories of independent specs overlap in one worker pool.
+    """
     state, is_rerun = load_or_create_epic_state(config)
     save_state(state, config)
 
@@ -207,118 +431,52 @@ def run_epic(config: dict) -> None:
             with open(log_path, "a") as f:
                 f.write("\n---\n> Previous epic run ended. New run starting below.\n---\n\n")
 
-    init_execution_log(config, epic_mode=True)
-    commit_tracking_files(project_dir, epic_name)
-
+    # Skip already completed specs (resume support)
+    specs_by_key: dict[str, tuple[int, dict]] = {}
     for i, spec_info in enumerate(epic_specs):
-        spec_path = spec_info["spec_path"]
-        feature_name = spec_info["feature_name"]
-        is_final = spec_info.get("epic_final", False)
-        spec_basename = os.path.basename(spec_path)
-
-        # Skip already completed specs (resume support)
-        spec_entry = state["specs"].get(spec_basename, {})
-        if spec_entry.get("status") == "completed":
+        spec_basename = os.path.basename(spec_info["spec_path"])
+        if state["specs"].get(spec_basename, {}).get("status") == "completed":
             log(f"Skipping {spec_basename} (already completed)")
             continue
+        specs_by_key[spec_basename] = (i, spec_info)
+    pending = [info for _, info in specs_by_key.values()]
+    spec_dag = build_spec_dag([info["spec_path"] for info in pending])
 
-        # Hard gate: verify dependencies are archived
-        deps_ok, missing = check_dependencies_archived(project_dir, spec_path)
-        if not deps_ok:
-            log(f"ERROR: Dependencies not met for {spec_basename}: {missing}")
-            log("Cannot continue epic execution.")
-            state["status"] = "blocked"
-            save_state(state, config)
-            write_notification(
-                config, "execution_paused",
-                "Epic blocked on dependencies",
-                f"{spec_basename} blocked — missing: {', '.join(missing)}",
-                severity="critical",
-            )
-            commit_tracking_files(project_dir, epic_name)
-            clean_result_files(project_dir)
-            sys.exit(1)
-
-        log(f"--- Feature spec {i+1}/{len(epic_specs)}: {spec_basename} ---")
-
-        # Initialize feature spec state entry
-        if spec_basename not in state["specs"]:
-            state["specs"][spec_basename] = {
-                "feature_name": feature_name,
-                "status": "in_progress",
-                "started_at": now_iso(),
-                "stories": {},
-            }
-        state["current_spec"] = spec_basename
-        save_state(state, config)
-
-        # Execute all stories in this feature spec
-        execute_spec_stories(spec_path, feature_name, config, state, spec_key=spec_basename)
-
-        # Feature spec stories complete — validate
-        validator_model = get_model_config(config)["validator"]
-        log(f"  All stories complete for {spec_basename}. Validating (model={validator_model})...")
-        validate_prompt = (
-            f"Run /kit-tools:validate-implementation for feature spec {spec_basename}. "
-            f"Mode: autonomous. Branch: {config['branch_name']}. "
-            f"This is part of an epic — do NOT invoke complete-implementation."
-        )
-        validate_output = run_claude_session(validate_prompt, project_dir, model=validator_model)
-        state["sessions"]["total"] += 1
-        state["sessions"]["validation"] += 1
-
-        if is_session_error(validate_output):
-            log(f"  Validation error: {validate_output[:200]}")
-            # Continue anyway — validation is informational
-
-        # Check for pause file (created by validate-implementation if critical findings exist)
-        if pause_file_exists(project_dir):
-            log(f"  Critical validation findings for {spec_basename}. Pausing.")
-            wait_for_pause_removal(project_dir, config=config)
-            log("  Resuming after pause.")
-
-        # Commit tracking files for this feature spec
-        commit_tracking_files(project_dir, feature_name)
-
-        # Tag checkpoint
-        tag_checkpoint(project_dir, epic_name, feature_name)
-
-        # Archive feature spec
-        archive_spec(project_dir, spec_path, feature_name)
+    init_execution_log(config, epic_mode=True)
+    log_epic_critical_path(config, pending, spec_dag)
+    commit_tracking_files(project_dir, epic_name)
 
-        # Commit archive + tag
-        run_git(
-            ["commit", "-m", f"chore({epic_name}): complete {feature_name}", "--allow-empty"],
-            project_dir, check=True
-        )
+    if _use_parallel_executor(config):
+        def on_spec_start(run: dict) -> None:
+            index, spec_info = specs_by_key[run["spec_key"]]
+            _start_epic_spec(config, state, spec_info, index)
 
-        # Update state
-        state["specs"][spec_basename]["status"] = "completed"
-        state["specs"][spec_basename]["completed_at"] = now_iso()
-        save_state(state, config)
+        def on_spec_complete(run: dict) -> None:
+            index, spec_info = specs_by_key[run["spec_key"]]
+            _finish_epic_spec(config, state, spec_info, index)
 
-        log(f"  {spec_basename} complete. Tagged: {epic_name}/{feature_name}-complete")
-        write_notification(
-            config, "spec_complete",
-            f"Feature spec complete: {feature_name}",
-            f"{spec_basename} ({i+1}/{len(epic_specs)}) complete in epic {epic_name}",
-            severity="info",
-        )
-
-        # Pause between feature specs if configured
-        if config.get("epic_pause_between_specs") and not is_final:
-            pause_path = os.path.join(project_dir, "kit_tools", ".pause_execution")
-            with open(pause_path, "w") as f:
-                f.write(f"Epic paused after {spec_basename}. Remove this file to continue.\n")
-            log(f"  Pausing between feature specs. Review {spec_basename} results, then:")
-            log(f"    rm kit_tools/.pause_execution")
-            write_notification(
-                config, "execution_paused",
-                "Epic paused between feature specs",
-                f"Paused after {spec_basename}. Remove pause file to continue.",
-                severity="warning",
+        runs = [
+            prepare_spec_run(
+                info["spec_path"], info["feature_name"], config, state,
+                spec_key=key, depends_on=spec_dag[key],
             )
-            wait_for_pause_removal(project_dir, config=config)
+            for key, (_, info) in specs_by_key.items()
+        ]
+        run_parallel_specs(
+            runs, config, state,
+            on_spec_start=on_spec_start, on_spec_complete=on_spec_complete,
+        )
+    else:
+        done: set[str] = set()
+        while len(done) < len(specs_by_key):
+            waiting = [key for key in specs_by_key if key not in done]
+            ready = ready_nodes(spec_dag, waiting, done)
+            key = ready[0] if ready else waiting[0]
+            index, spec_info = specs_by_key[key]
+            _start_epic_spec(config, state, spec_info, index)
+            run_spec_stories(spec_info["spec_path"], spec_info["feature_name"], config, state, spec_key=key)
+            _finish_epic_spec(config, state, spec_info, index)
+            done.add(key)
 
     # All feature specs complete
     log("All epic feature specs complete!")
@@ -409,7 +567,28 @@ def main():
         )
         sys.exit(1)
 
+    # A session_sandbox limit that cannot be enforced would silently leave
+    # sessions unbounded — stop before any session starts
+    sandbox_error = check_sandbox_limits(get_session_sandbox(config))
+    if sandbox_error:
+        log(f"FATAL: {sandbox_error}")
+        write_notification(
+            config, "execution_blocked",
+            "Orchestrator aborted — session_sandbox limits not enforceable",
+            sandbox_error,
+            severity="critical",
+        )
+        log_event(config, "abort_sandbox_limits", severity="critical", message=sandbox_error)
+        sys.exit(1)
+
+    set_max_sessions(get_max_sessions(config))
     register_crash_handler(config)
+    # Pause removal and supervisor abort/skip take effect as soon as the
+    # files change, including mid-session
+    start_control_watcher(config["project_dir"])
+    if get_control_socket_enabled(config):
+        start_control_socket(config)
+    start_heartbeat(config)
 
     try:
         if config.get("epic_specs"):
@@ -437,6 +616,9 @@ def main():
         log_event(config, "abort_git_recovery_failed", severity="critical", message=str(e))
         sys.exit(1)
 
+    git_timings = format_git_timings()
+    if git_timings:
+        log(git_timings)
     log("Orchestrator finished.")
 
 
@@ -6,6 +6,7 @@ import json
 import os
 import platform
 import subprocess
+import threading
 
 from .utils import now_iso
 
@@ -14,6 +15,35 @@ EVENTS_FILE = os.path.join("kit_tools", ".execution-events.jsonl")
 DESKTOP_NOTIFY_SEVERITIES = {"critical", "warning"}
 DESKTOP_NOTIFY_TYPES = {"execution_complete", "execution_crashed", "epic_complete"}
 
+# Live listeners (control socket `subscribe` streams). Each is called with
+# every published event on the publishing thread, so it must not block.
+_SUBSCRIBERS: list = []
+_SUBSCRIBERS_LOCK = threading.Lock()
+
+
+def subscribe_events(callback) -> None:
+    """Register `callback(event: dict)` for every event published from now on."""
+    with _SUBSCRIBERS_LOCK:
+        _SUBSCRIBERS.append(callback)
+
+
+def unsubscribe_events(callback) -> None:
+    """Remove a callback registered with `subscribe_events` (no-op if absent)."""
+    with _SUBSCRIBERS_LOCK:
+        if callback in _SUBSCRIBERS:
+            _SUBSCRIBERS.remove(callback)
+
+
+def publish_event(kind: str, data: dict) -> None:
+    """Hand `{"kind", "data"}` to every live subscriber. Best-effort."""
+    with _SUBSCRIBERS_LOCK:
+        subscribers = list(_SUBSCRIBERS)
+    for callback in subscribers:
+        try:
+            callback({"kind": kind, "data": data})
+        except Exception:
+            pass
+
 
 def get_notification_path(config: dict) -> str:
     """Return absolute path to the notification file."""
@@ -52,21 +82,22 @@ def write_notification(
 ) -> None:
     """Append a JSON Lines notification entry and send desktop notification for
     important events. Best-effort — swallows OSError."""
+    entry = {
+        "type": ntype,
+        "title": title,
+        "details": details,
+        "severity": severity,
+        "feature": config.get("feature_name") or config.get("epic_name", ""),
+        "timestamp": now_iso(),
+    }
     try:
         path = get_notification_path(config)
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        entry = {
-            "type": ntype,
-            "title": title,
-            "details": details,
-            "severity": severity,
-            "feature": config.get("feature_name") or config.get("epic_name", ""),
-            "timestamp": now_iso(),
-        }
         with open(path, "a") as f:
             f.write(json.dumps(entry) + "\n")
     except OSError:
         pass
+    publish_event("notification", entry)
 
     # Send desktop notification for important events
     if severity in DESKTOP_NOTIFY_SEVERITIES or ntype in DESKTOP_NOTIFY_TYPES:
@@ -106,6 +137,7 @@ def log_event(
             if feat:
                 entry["feature"] = feat
         entry.update(fields)
+        publish_event("event", entry)
         path = os.path.join(project_dir, EVENTS_FILE)
         os.makedirs(os.path.dirname(path), exist_ok=True)
         with open(path, "a") as f:
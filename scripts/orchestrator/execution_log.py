@@ -121,6 +121,19 @@ def log_story_failure(
         f.write(entry)
 
 
+def log_critical_path(config: dict, path: list[str], total: int) -> None:
+    """Append the dependency critical path to EXECUTION_LOG.md.
+
+    `path` is the longest chain of stories that must run back to back;
+    `total` is the number of stories scheduled. No-op for an empty path.
+    """
+    if not path:
+        return
+    entry = f"- **Critical path:** {' → '.join(path)} ({len(path)} of {total} stories)\n\n"
+    with open(get_log_path(config), "a") as f:
+        f.write(entry)
+
+
 def log_completion(config: dict, state: dict) -> None:
     """Append a completion summary to EXECUTION_LOG.md."""
     log_path = get_log_path(config)
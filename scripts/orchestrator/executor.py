@@ -4,18 +4,32 @@ __init__ for the full public API."""
 from __future__ import annotations
 import os
 import sys
-
-from .config import get_model_config
+import threading
+import time
+
+from .config import (
+    get_attempt_isolation,
+    get_model_config,
+    get_session_memory_limit,
+    get_session_sandbox,
+    get_session_stall_timeout,
+)
+from .control import interruptible
+from .durations import adaptive_timeout, record_session_duration
 from .events import write_notification
 from .execution_log import log_story_failure, log_story_success
 from .git_ops import (
     check_git_clean_recovery,
+    collect_diff,
     commit_tracking_files,
     create_attempt_branch,
+    create_attempt_worktree,
     delete_attempt_branch,
     get_head_commit,
     GitRecoveryFailed,
+    get_worktree_root,
     merge_attempt_branch,
+    remove_attempt_worktree,
 )
 from .prompts import (
     DIFF_CONTENT_MAX,
@@ -41,6 +55,7 @@ from .specs import (
     update_spec_checkboxes,
 )
 from .state import (
+    _drop_attempt_diff,
     _store_attempt_diff,
     save_state,
     update_state_story,
@@ -52,7 +67,9 @@ from .supervisor import (
     read_control_file,
     wait_for_pause_removal,
     write_health_snapshot,
+    write_session_progress,
 )
+from .test_impact import ensure_test_impact_index, get_test_impact_enabled, update_test_impact_index
 from .tests_metrics import (
     check_test_mapping_gaps,
     detect_test_command,
@@ -62,6 +79,226 @@ from .tests_metrics import (
     update_test_metrics,
 )
 from .utils import log, run_git
+from .verify_cache import get_verify_cache_key, lookup_cached_verdict, store_cached_verdict
+
+def _read_spec_size(spec_path: str | None) -> str:
+    """Return the spec's `size:` frontmatter value (S/M/L/XL), defaulting to M."""
+    if spec_path and os.path.exists(spec_path):
+        return str(parse_spec_frontmatter(spec_path).get("size", "M")).upper()
+    return "M"
+
+
+def _select_impl_model(config: dict, attempt: int, spec_size: str) -> str:
+    """Pick the implementer model, escalating retries of size-L/XL stories."""
+    models = get_model_config(config)
+    impl_model = models["implementer"]
+    if attempt > 1 and spec_size in ("L", "XL"):
+        impl_model = models.get("escalation", impl_model)
+        log(f"  Escalating to {impl_model} for retry of size-{spec_size} story")
+    return impl_model
+
+
+def _record_session_usage(
+    state: dict, kind: str, prompt_chars: int, output_chars: int,
+    resources: dict | None = None,
+) -> None:
+    """Bump session counters and char/4 token estimates for one session.
+
+    `resources` is the session's `/proc` sample (see `run_claude_session`);
+    its CPU time is totalled and its peaks kept per session kind under
+    `state["session_resources"]`.
+    """
+    state["sessions"]["total"] += 1
+    state["sessions"][kind] += 1
+    token_est = state.setdefault("token_estimates", {"input": 0, "output": 0})
+    token_est["input"] += prompt_chars // 4
+    token_est["output"] += output_chars // 4
+    log(f"  Session tokens: ~{prompt_chars // 4000}k input, ~{output_chars // 4000}k output")
+    if not resources or "peak_rss_mb" not in resources:
+        return  # No /proc sample (non-Linux, or the session ended before the first one)
+    totals = state.setdefault("session_resources", {}).setdefault(kind, {
+        "sessions": 0, "cpu_s": 0.0, "peak_rss_mb": 0.0, "peak_fds": 0,
+        "peak_processes": 0, "memory_limit_kills": 0, "oom_kills": 0,
+    })
+    totals["sessions"] += 1
+    totals["cpu_s"] = round(totals["cpu_s"] + resources["cpu_s"], 2)
+    for peak in ("peak_rss_mb", "peak_fds", "peak_processes"):
+        totals[peak] = max(totals[peak], resources[peak])
+    if resources.get("memory_limit_exceeded"):
+        totals["memory_limit_kills"] += 1
+    totals["oom_kills"] += resources.get("cgroup", {}).get("oom_kills", 0)
+    log(
+        f"  Session resources: peak {resources['peak_rss_mb']:.0f} MB RSS, "
+        f"{resources['peak_processes']} processes, {resources['peak_fds']} FDs, "
+        f"{resources['cpu_s']:.1f}s CPU"
+    )
+
+
+def _collect_attempt_changes(work_dir: str, base_ref: str) -> tuple[str, str, str]:
+    """Collect verifier context for `base_ref..HEAD` in `work_dir`.
+
+    Returns `(files_changed, diff_stat, diff_content)` from one `git diff`
+    pass (see `collect_diff`). `diff_content` is replaced by a truncation
+    notice plus the stat when the patch exceeds DIFF_CONTENT_MAX; reading
+    stops at that point.
+    """
+    changes = collect_diff(work_dir, f"{base_ref}..HEAD", DIFF_CONTENT_MAX)
+    files_changed = changes["files_changed"]
+    diff_stat = changes["diff_stat"]
+    if not changes["truncated"]:
+        diff_content = changes["patch"]
+    else:
+        diff_content = (
+            f"[Diff truncated — exceeds {DIFF_CONTENT_MAX} limit. "
+            f"Use the Read tool to examine full files.]\n\n"
+            f"Diff stat:\n{diff_stat}"
+        )
+    return files_changed, diff_stat, diff_content
+
+
+def _fail_attempt(
+    story: dict, attempt: int, config: dict, state: dict, spec_key: str | None,
+    attempt_branch: str, failure: str, learnings: list,
+    failure_type: str | None = None, capture_diff: bool = True,
+    work_dir: str | None = None,
+) -> None:
+    """Record a retryable attempt failure and discard the attempt branch.
+
+    Logs the failure, marks the story `retrying`, deletes the attempt branch
+    (capturing its diff as retry context unless `capture_diff` is False) and
+    clears the result files in `work_dir` (defaults to the project dir).
+    """
+    project_dir = config["project_dir"]
+    log_story_failure(story, attempt, config, failure, learnings)
+    update_state_story(
+        state, story["id"], "retrying", attempt, learnings, failure,
+        spec_key=spec_key, failure_type=failure_type
+    )
+    save_state(state, config)
+    attempt_diff = delete_attempt_branch(project_dir, config["branch_name"], attempt_branch)
+    if capture_diff:
+        _store_attempt_diff(state, story["id"], attempt_diff, spec_key, project_dir)
+        save_state(state, config)
+    clean_result_files(work_dir or project_dir)
+
+
+def _complete_verified_attempt(
+    story: dict, attempt: int, config: dict, state: dict, spec_path: str,
+    feature_name: str, spec_key: str | None, attempt_branch: str,
+    impl_result: dict | None, verdict: dict, files_changed_from_git: str,
+    fail_fast_test: str | None, work_dir: str | None = None,
+) -> bool:
+    """Merge a passing attempt, run the regression check and record success.
+
+    Returns False when the merge conflicted — the attempt has then already
+    been recorded as retrying and its branch deleted. A detected regression
+    reverts the merge, records the failure and exits the process.
+    """
+    project_dir = config["project_dir"]
+    feature_branch = config["branch_name"]
+    learnings = extract_learnings_from_results(impl_result, verdict)
+    verdict_warnings = verdict.get("warnings", []) if verdict["verdict"] == "pass_with_warnings" else []
+    if verdict_warnings:
+        log(f"  {story['id']} PASSED with {len(verdict_warnings)} warnings (attempt {attempt})")
+    else:
+        log(f"  {story['id']} PASSED (attempt {attempt})")
+    # Merge attempt branch into feature branch
+    merge_ok = merge_attempt_branch(project_dir, feature_branch, attempt_branch, config)
+    if not merge_ok:
+        log(f"  Merge conflict — will retry implementation.")
+        is_clean, stuck = check_git_clean_recovery(project_dir)
+        if not is_clean:
+            # Only the in-tree merge fallback (no merge-tree) leaves a merge in progress
+            run_git(["merge", "--abort"], project_dir, check=True)
+            is_clean, stuck = check_git_clean_recovery(project_dir)
+        if not is_clean:
+            raise GitRecoveryFailed(
+                f"`git merge --abort` did not clean up after merge conflict — repo stuck in {stuck} state. "
+                f"Cannot safely retry. Manual intervention required: cd {project_dir} && git status"
+            )
+        learnings.append("Merge conflict on attempt branch — retry with fresh approach")
+        _fail_attempt(
+            story, attempt, config, state, spec_key, attempt_branch,
+            "Merge conflict", learnings, work_dir=work_dir,
+        )
+        return False
+    # Run cross-story regression check
+    reg_passed, reg_msg = run_regression_check(
+        project_dir, state, story["id"], fail_fast_test, spec_key,
+        use_impact_index=get_test_impact_enabled(config),
+        sandbox_limits=get_session_sandbox(config),
+    )
+    if not reg_passed:
+        log(f"  REGRESSION detected after merging {story['id']}!")
+        log(f"  {reg_msg[:300]}")
+        # Revert the merge to keep feature branch clean
+        merge_head = get_head_commit(project_dir)
+        revert_result = run_git(["revert", "--no-edit", merge_head], project_dir, check=True)
+        if revert_result.returncode != 0:
+            # Revert itself failed — most likely a conflict during revert.
+            # Check whether the repo is stuck or whether revert failed
+            # for a non-conflict reason. Either way, don't proceed.
+            is_clean, stuck = check_git_clean_recovery(project_dir)
+            if not is_clean:
+                raise GitRecoveryFailed(
+                    f"`git revert` conflicted on {merge_head[:8]} — repo stuck in {stuck} state. "
+                    f"Manual intervention required: cd {project_dir} && git status, "
+                    f"resolve conflicts, then `git revert --continue` or `git revert --abort`."
+                )
+            raise GitRecoveryFailed(
+                f"`git revert {merge_head[:8]}` failed (exit {revert_result.returncode}) "
+                f"but repo is not stuck: {revert_result.stderr.strip()[:200]}. "
+                f"Manual review required."
+            )
+        log(f"  Reverted merge commit {merge_head[:8]}")
+        update_state_story(
+            state, story["id"], "failed", attempt,
+            [f"Regression: {reg_msg[:200]}"],
+            f"Regression detected: {reg_msg[:500]}",
+            spec_key=spec_key, failure_type="REGRESSION"
+        )
+        state["status"] = "failed"
+        save_state(state, config)
+        write_notification(
+            config, "regression_detected",
+            f"Regression detected after {story['id']}",
+            f"{story['id']}: {reg_msg[:200]}",
+            severity="critical",
+        )
+        commit_tracking_files(project_dir, feature_name)
+        clean_result_files(work_dir or project_dir)
+        sys.exit(1)
+    elif "Skipped" not in reg_msg:
+        log(f"  Regression check: {reg_msg}")
+
+    # Update feature spec checkboxes on the feature branch
+    if update_spec_checkboxes(spec_path, story["id"]):
+        log(f"  Updated feature spec checkboxes for {story['id']}")
+        run_git(["add", spec_path], project_dir, check=True)
+        run_git(
+            ["commit", "-m", f"chore({feature_name}): mark {story['id']} criteria complete"],
+            project_dir, check=True
+        )
+    # Store files_changed for regression detection
+    changed_file_list = [f.strip() for f in files_changed_from_git.split("\n") if f.strip()]
+    log_story_success(story, attempt, config, learnings, feature_name=feature_name)
+    update_state_story(
+        state, story["id"], "completed", attempt, learnings,
+        spec_key=spec_key, warnings=verdict_warnings,
+        files_changed=changed_file_list
+    )
+    _drop_attempt_diff(state, story["id"], spec_key, project_dir)
+    save_state(state, config)
+    update_test_impact_index(config)
+    write_notification(
+        config, "story_complete",
+        f"Story {story['id']} passed",
+        f"{story['id']}: {story['title']} (attempt {attempt})",
+        severity="info",
+    )
+    clean_result_files(work_dir or project_dir)
+    return True
+
 
 def execute_spec_stories(
     spec_path: str, feature_name: str, config: dict, state: dict,
@@ -86,12 +323,11 @@ def execute_spec_stories(
     fail_fast_test = make_fail_fast(test_command) if test_command else None
     if test_command:
         log(f"  Detected test command: {test_command}")
+    ensure_test_impact_index(config, test_command)
 
     # Compute size-based timeouts and model escalation from spec frontmatter
     impl_timeout, verify_timeout = get_size_timeouts(spec_path)
-    spec_size = "M"
-    if spec_path and os.path.exists(spec_path):
-        spec_size = str(parse_spec_frontmatter(spec_path).get("size", "M")).upper()
+    spec_size = _read_spec_size(spec_path)
     if impl_timeout != IMPL_SESSION_TIMEOUT or verify_timeout != VERIFY_SESSION_TIMEOUT:
         log(f"  Story size: {spec_size}, impl timeout: {impl_timeout}s, verify timeout: {verify_timeout}s")
 
@@ -104,6 +340,14 @@ def execute_spec_stories(
     # Track files already warned about for mapping gaps (dedup across stories)
     _warned_mapping_files: set[str] = set()
 
+    # `attempt_isolation: "worktree"` runs each attempt in a linked worktree;
+    # the main checkout never leaves the feature branch and a passing attempt
+    # lands on it as a fast-forward merge.
+    isolated = get_attempt_isolation(config) == "worktree"
+    worktree_root = get_worktree_root(project_dir, config) if isolated else None
+    if isolated:
+        log(f"  Attempt isolation: worktrees in {worktree_root}")
+
     while True:
         # Check pause file between stories
         if pause_file_exists(project_dir):
@@ -199,10 +443,17 @@ def execute_spec_stories(
             # --- Capture pre-attempt HEAD for unambiguous diffs ---
             pre_attempt_head = get_head_commit(project_dir)
 
-            # --- Create attempt branch ---
-            attempt_branch = create_attempt_branch(
-                project_dir, feature_branch, story["id"], attempt
-            )
+            # --- Create attempt branch (or worktree, leaving the main checkout alone) ---
+            if isolated:
+                attempt_branch, work_dir = create_attempt_worktree(
+                    project_dir, feature_branch, story["id"], attempt, worktree_root,
+                    base_ref=pre_attempt_head,
+                )
+            else:
+                work_dir = project_dir
+                attempt_branch = create_attempt_branch(
+                    project_dir, feature_branch, story["id"], attempt
+                )
 
             # --- Implementation session ---
             log(f"Implementing {story['id']}: {story['title']} (attempt {attempt})...")
@@ -212,30 +463,36 @@ def execute_spec_stories(
 
             prompt = build_implementation_prompt(
                 story, config, state, attempt,
-                feature_name=feature_name, spec_path=spec_path, spec_key=spec_key
+                feature_name=feature_name, spec_path=spec_path, spec_key=spec_key,
+                work_dir=work_dir,
             )
             prompt = check_and_trim_prompt(prompt, "implementation")
 
-            # Estimate input tokens
-            prompt_chars = len(prompt)
-            models = get_model_config(config)
-            impl_model = models["implementer"]
-            if attempt > 1 and spec_size in ("L", "XL"):
-                impl_model = models.get("escalation", impl_model)
-                log(f"  Escalating to {impl_model} for retry of size-{spec_size} story")
-            log(f"  Session timeout: {impl_timeout}s (implementation, model={impl_model})")
-            impl_output = run_claude_session(
-                prompt, project_dir, timeout=impl_timeout, model=impl_model
+            impl_model = _select_impl_model(config, attempt, spec_size)
+            story_state = stories_state.get("stories", {}).get(story["id"], {})
+            session_timeout = adaptive_timeout(
+                config, "implementation", impl_model, spec_size, len(story["criteria"]),
+                impl_timeout, story_state,
+            )
+            log(f"  Session timeout: {session_timeout}s (implementation, model={impl_model})")
+            session_started = time.monotonic()
+            # Set by the control watcher when an abort or a skip/split of this
+            # story arrives mid-attempt; the session is then killed.
+            interrupt = threading.Event()
+            impl_resources: dict = {}
+            with interruptible(story["id"], interrupt):
+                impl_output = run_claude_session(
+                    prompt, work_dir, timeout=session_timeout, model=impl_model,
+                    label=f"{story['id']} impl", stall_timeout=get_session_stall_timeout(config),
+                    on_progress=lambda: write_session_progress(config), cancel=interrupt,
+                    memory_limit_mb=get_session_memory_limit(config), resources=impl_resources,
+                    sandbox_limits=get_session_sandbox(config),
+                )
+            record_session_duration(
+                config, state, "implementation", story, impl_model, spec_size,
+                time.monotonic() - session_started, impl_output, session_timeout,
             )
-            output_chars = len(impl_output)
-
-            state["sessions"]["total"] += 1
-            state["sessions"]["implementation"] += 1
-            # Track token estimates
-            token_est = state.setdefault("token_estimates", {"input": 0, "output": 0})
-            token_est["input"] += prompt_chars // 4
-            token_est["output"] += output_chars // 4
-            log(f"  Session tokens: ~{prompt_chars // 4000}k input, ~{output_chars // 4000}k output")
+            _record_session_usage(state, "implementation", len(prompt), len(impl_output), impl_resources)
             save_state(state, config)
 
             # Check for session errors
@@ -256,6 +513,8 @@ def execute_spec_stories(
                     f"{story['id']}: {impl_output[:200]}",
                     severity="critical",
                 )
+                if isolated:
+                    remove_attempt_worktree(project_dir, work_dir)
                 delete_attempt_branch(project_dir, feature_branch, attempt_branch)
                 clean_result_files(project_dir)
                 sys.exit(1)
@@ -264,74 +523,70 @@ def execute_spec_stories(
                 f_type = classify_failure(impl_output, None, None)
                 log(f"  Implementation session error [{f_type}]: {impl_output[:200]}")
                 learnings = [f"Session error: {impl_output[:200]}"]
-                log_story_failure(story, attempt, config, impl_output[:500], learnings)
-                update_state_story(
-                    state, story["id"], "retrying", attempt, learnings, impl_output[:500],
-                    spec_key=spec_key, failure_type=f_type
-                )
-                save_state(state, config)
+                if isolated:
+                    remove_attempt_worktree(project_dir, work_dir)
                 # Delete the failed attempt branch (no diff to capture on session error)
-                delete_attempt_branch(project_dir, feature_branch, attempt_branch)
-                clean_result_files(project_dir)
+                _fail_attempt(
+                    story, attempt, config, state, spec_key, attempt_branch,
+                    impl_output[:500], learnings, failure_type=f_type, capture_diff=False,
+                    work_dir=work_dir,
+                )
+                if interrupt.is_set():
+                    break  # The control check at the top of the story loop applies it
                 continue
 
             # --- Read implementation result from file ---
-            impl_result, impl_error = read_implementation_result(project_dir)
+            impl_result, impl_error = read_implementation_result(work_dir)
             if impl_error:
                 log(f"  Implementation result: {impl_error}")
 
-            # --- Get files changed from git (for verifier) ---
-            git_files_result = run_git(
-                ["diff", "--name-only", f"{pre_attempt_head}..HEAD"], project_dir
+            # --- Get files changed, diff stat and inline diff (for verifier) ---
+            files_changed_from_git, diff_stat, diff_content = _collect_attempt_changes(
+                work_dir, pre_attempt_head
             )
-            files_changed_from_git = git_files_result.stdout.strip() if git_files_result.returncode == 0 else ""
 
             # --- Check test mapping gaps (informational, deduped across stories) ---
-            check_test_mapping_gaps(files_changed_from_git, project_dir, _warned_mapping_files)
+            check_test_mapping_gaps(files_changed_from_git, work_dir, _warned_mapping_files)
 
-            # --- Get diff stat (for verifier) ---
-            diff_stat_result = run_git(
-                ["diff", "--stat", f"{pre_attempt_head}..HEAD"], project_dir
-            )
-            diff_stat = diff_stat_result.stdout.strip() if diff_stat_result.returncode == 0 else ""
-
-            # --- Capture inline diff content (for verifier) ---
-            diff_content_result = run_git(
-                ["diff", f"{pre_attempt_head}..HEAD"], project_dir
-            )
-            raw_diff = diff_content_result.stdout.strip() if diff_content_result.returncode == 0 else ""
-            if len(raw_diff) <= DIFF_CONTENT_MAX:
-                diff_content = raw_diff
+            # --- Verification session (skipped when this tree was already judged) ---
+            verify_model = get_model_config(config)["verifier"]
+            cache_key = get_verify_cache_key(config, work_dir, story, verify_model)
+            cached_verdict = lookup_cached_verdict(project_dir, cache_key)
+            if cached_verdict:
+                log(f"  Verification cache hit for {story['id']} — reusing '{cached_verdict['verdict']}' verdict")
+                verify_output = "Verification result reused from cache"
             else:
-                diff_content = (
-                    f"[Diff truncated — {len(raw_diff)} chars exceeds {DIFF_CONTENT_MAX} limit. "
-                    f"Use the Read tool to examine full files.]\n\n"
-                    f"Diff stat:\n{diff_stat}"
+                log(f"  Verifying {story['id']}...")
+                verify_prompt = build_verification_prompt(
+                    story, config, files_changed_from_git,
+                    diff_stat=diff_stat, test_command=fail_fast_test, spec_path=spec_path,
+                    diff_content=diff_content, work_dir=work_dir,
                 )
+                verify_prompt = check_and_trim_prompt(verify_prompt, "verification")
 
-            # --- Verification session ---
-            log(f"  Verifying {story['id']}...")
-            verify_prompt = build_verification_prompt(
-                story, config, files_changed_from_git,
-                diff_stat=diff_stat, test_command=fail_fast_test, spec_path=spec_path,
-                diff_content=diff_content
-            )
-            verify_prompt = check_and_trim_prompt(verify_prompt, "verification")
-
-            verify_prompt_chars = len(verify_prompt)
-            verify_model = get_model_config(config)["verifier"]
-            log(f"  Session timeout: {verify_timeout}s (verification, model={verify_model})")
-            verify_output = run_claude_session(
-                verify_prompt, project_dir, timeout=verify_timeout, model=verify_model
-            )
-            verify_output_chars = len(verify_output)
-
-            state["sessions"]["total"] += 1
-            state["sessions"]["verification"] += 1
-            token_est["input"] += verify_prompt_chars // 4
-            token_est["output"] += verify_output_chars // 4
-            log(f"  Session tokens: ~{verify_prompt_chars // 4000}k input, ~{verify_output_chars // 4000}k output")
-            save_state(state, config)
+                session_timeout = adaptive_timeout(
+                    config, "verification", verify_model, spec_size, len(story["criteria"]),
+                    verify_timeout, story_state,
+                )
+                log(f"  Session timeout: {session_timeout}s (verification, model={verify_model})")
+                session_started = time.monotonic()
+                verify_resources: dict = {}
+                with interruptible(story["id"], interrupt):
+                    verify_output = run_claude_session(
+                        verify_prompt, work_dir, timeout=session_timeout, model=verify_model,
+                        label=f"{story['id']} verify", stall_timeout=get_session_stall_timeout(config),
+                        on_progress=lambda: write_session_progress(config), cancel=interrupt,
+                        memory_limit_mb=get_session_memory_limit(config), resources=verify_resources,
+                        sandbox_limits=get_session_sandbox(config),
+                    )
+                record_session_duration(
+                    config, state, "verification", story, verify_model, spec_size,
+                    time.monotonic() - session_started, verify_output, session_timeout,
+                )
+                _record_session_usage(
+                    state, "verification", len(verify_prompt), len(verify_output), verify_resources,
+                )
+                save_state(state, config)
 
             # --- Check for verification session errors ---
             if is_session_error(verify_output):
@@ -339,144 +594,49 @@ def execute_spec_stories(
                 log(f"  Verification session error [{f_type}]: {verify_output[:200]}")
                 learnings = extract_learnings_from_results(impl_result, None)
                 learnings.append(f"Verify session error: {verify_output[:200]}")
-                log_story_failure(story, attempt, config, verify_output[:500], learnings)
-                update_state_story(
-                    state, story["id"], "retrying", attempt,
-                    learnings, verify_output[:500], spec_key=spec_key,
-                    failure_type=f_type
+                if isolated:
+                    remove_attempt_worktree(project_dir, work_dir)
+                _fail_attempt(
+                    story, attempt, config, state, spec_key, attempt_branch,
+                    verify_output[:500], learnings, failure_type=f_type, work_dir=work_dir,
                 )
-                save_state(state, config)
-                attempt_diff = delete_attempt_branch(project_dir, feature_branch, attempt_branch)
-                _store_attempt_diff(state, story["id"], attempt_diff, spec_key)
-                save_state(state, config)
-                clean_result_files(project_dir)
+                if interrupt.is_set():
+                    break
                 continue
 
-            # --- Read verification result from file ---
-            verdict, verify_error = read_verification_result(project_dir)
+            # --- Read verification result from file (or the cache) ---
+            if cached_verdict:
+                verdict, verify_error = cached_verdict, ""
+            else:
+                verdict, verify_error = read_verification_result(work_dir)
+                # Record test metrics regardless of verdict outcome
+                if verdict:
+                    update_test_metrics(project_dir, verdict, story["id"])
+                    store_cached_verdict(project_dir, cache_key, verdict, story["id"])
 
-            # Record test metrics regardless of verdict outcome
-            if verdict:
-                update_test_metrics(project_dir, verdict, story["id"])
+            # The branch outlives the worktree; git refuses to merge or delete a
+            # branch that is still checked out in a linked worktree.
+            if isolated:
+                remove_attempt_worktree(project_dir, work_dir)
 
             if verify_error:
                 # Result file missing or invalid — treat as retryable failure
                 log(f"  Verification result error: {verify_error}")
                 learnings = extract_learnings_from_results(impl_result, None)
-                log_story_failure(story, attempt, config, verify_error, learnings)
-                update_state_story(
-                    state, story["id"], "retrying", attempt,
-                    learnings, verify_error, spec_key=spec_key
-                )
-                save_state(state, config)
                 # Capture diff as retry context, then delete attempt branch
-                attempt_diff = delete_attempt_branch(project_dir, feature_branch, attempt_branch)
-                _store_attempt_diff(state, story["id"], attempt_diff, spec_key)
-                save_state(state, config)
-                clean_result_files(project_dir)
+                _fail_attempt(
+                    story, attempt, config, state, spec_key, attempt_branch,
+                    verify_error, learnings, work_dir=work_dir,
+                )
                 continue
 
             if verdict["verdict"] in ("pass", "pass_with_warnings"):
-                learnings = extract_learnings_from_results(impl_result, verdict)
-                verdict_warnings = verdict.get("warnings", []) if verdict["verdict"] == "pass_with_warnings" else []
-                if verdict_warnings:
-                    log(f"  {story['id']} PASSED with {len(verdict_warnings)} warnings (attempt {attempt})")
-                else:
-                    log(f"  {story['id']} PASSED (attempt {attempt})")
-                # Merge attempt branch into feature branch
-                merge_ok = merge_attempt_branch(project_dir, feature_branch, attempt_branch)
-                if not merge_ok:
-                    log(f"  Merge conflict — aborting merge, will retry implementation.")
-                    run_git(["merge", "--abort"], project_dir, check=True)
-                    is_clean, stuck = check_git_clean_recovery(project_dir)
-                    if not is_clean:
-                        raise GitRecoveryFailed(
-                            f"`git merge --abort` did not clean up after merge conflict — repo stuck in {stuck} state. "
-                            f"Cannot safely retry. Manual intervention required: cd {project_dir} && git status"
-                        )
-                    learnings.append("Merge conflict on attempt branch — retry with fresh approach")
-                    log_story_failure(story, attempt, config, "Merge conflict", learnings)
-                    update_state_story(
-                        state, story["id"], "retrying", attempt,
-                        learnings, "Merge conflict", spec_key=spec_key
-                    )
-                    save_state(state, config)
-                    attempt_diff = delete_attempt_branch(project_dir, feature_branch, attempt_branch)
-                    _store_attempt_diff(state, story["id"], attempt_diff, spec_key)
-                    save_state(state, config)
-                    clean_result_files(project_dir)
-                    continue
-                # Run cross-story regression check
-                reg_passed, reg_msg = run_regression_check(
-                    project_dir, state, story["id"], fail_fast_test, spec_key
-                )
-                if not reg_passed:
-                    log(f"  REGRESSION detected after merging {story['id']}!")
-                    log(f"  {reg_msg[:300]}")
-                    # Revert the merge to keep feature branch clean
-                    merge_head = get_head_commit(project_dir)
-                    revert_result = run_git(["revert", "--no-edit", merge_head], project_dir, check=True)
-                    if revert_result.returncode != 0:
-                        # Revert itself failed — most likely a conflict during revert.
-                        # Check whether the repo is stuck or whether revert failed
-                        # for a non-conflict reason. Either way, don't proceed.
-                        is_clean, stuck = check_git_clean_recovery(project_dir)
-                        if not is_clean:
-                            raise GitRecoveryFailed(
-                                f"`git revert` conflicted on {merge_head[:8]} — repo stuck in {stuck} state. "
-                                f"Manual intervention required: cd {project_dir} && git status, "
-                                f"resolve conflicts, then `git revert --continue` or `git revert --abort`."
-                            )
-                        raise GitRecoveryFailed(
-                            f"`git revert {merge_head[:8]}` failed (exit {revert_result.returncode}) "
-                            f"but repo is not stuck: {revert_result.stderr.strip()[:200]}. "
-                            f"Manual review required."
-                        )
-                    log(f"  Reverted merge commit {merge_head[:8]}")
-                    update_state_story(
-                        state, story["id"], "failed", attempt,
-                        [f"Regression: {reg_msg[:200]}"],
-                        f"Regression detected: {reg_msg[:500]}",
-                        spec_key=spec_key, failure_type="REGRESSION"
-                    )
-                    state["status"] = "failed"
-                    save_state(state, config)
-                    write_notification(
-                        config, "regression_detected",
-                        f"Regression detected after {story['id']}",
-                        f"{story['id']}: {reg_msg[:200]}",
-                        severity="critical",
-                    )
-                    commit_tracking_files(project_dir, feature_name)
-                    clean_result_files(project_dir)
-                    sys.exit(1)
-                elif "Skipped" not in reg_msg:
-                    log(f"  Regression check: {reg_msg}")
-
-                # Update feature spec checkboxes on the feature branch
-                if update_spec_checkboxes(spec_path, story["id"]):
-                    log(f"  Updated feature spec checkboxes for {story['id']}")
-                    run_git(["add", spec_path], project_dir, check=True)
-                    run_git(
-                        ["commit", "-m", f"chore({feature_name}): mark {story['id']} criteria complete"],
-                        project_dir, check=True
-                    )
-                # Store files_changed for regression detection
-                changed_file_list = [f.strip() for f in files_changed_from_git.split("\n") if f.strip()]
-                log_story_success(story, attempt, config, learnings, feature_name=feature_name)
-                update_state_story(
-                    state, story["id"], "completed", attempt, learnings,
-                    spec_key=spec_key, warnings=verdict_warnings,
-                    files_changed=changed_file_list
-                )
-                save_state(state, config)
-                write_notification(
-                    config, "story_complete",
-                    f"Story {story['id']} passed",
-                    f"{story['id']}: {story['title']} (attempt {attempt})",
-                    severity="info",
-                )
-                clean_result_files(project_dir)
+                if not _complete_verified_attempt(
+                    story, attempt, config, state, spec_path, feature_name, spec_key,
+                    attempt_branch, impl_result, verdict, files_changed_from_git,
+                    fail_fast_test, work_dir=work_dir,
+                ):
+                    continue  # Merge conflict — retry implementation
                 write_health_snapshot(config, state, story["id"], attempt, event="story_passed")
                 break  # Move to next story
             else:
@@ -485,21 +645,12 @@ def execute_spec_stories(
                 f_type = classify_failure("", verify_output, verdict)
                 log(f"  {story['id']} FAILED verification (attempt {attempt}) [{f_type}]")
                 log(f"  Reason: {str(failure_details)[:200]}")
-                log_story_failure(story, attempt, config, str(failure_details), learnings)
-                update_state_story(
-                    state, story["id"], "retrying", attempt,
-                    learnings, str(failure_details), spec_key=spec_key,
-                    failure_type=f_type
-                )
-                save_state(state, config)
                 # Capture diff as retry context, then delete attempt branch
-                attempt_diff = delete_attempt_branch(project_dir, feature_branch, attempt_branch)
-                _store_attempt_diff(state, story["id"], attempt_diff, spec_key)
-                save_state(state, config)
-                clean_result_files(project_dir)
+                _fail_attempt(
+                    story, attempt, config, state, spec_key, attempt_branch,
+                    str(failure_details), learnings, failure_type=f_type, work_dir=work_dir,
+                )
                 write_health_snapshot(config, state, story["id"], attempt, event="attempt_failed")
                 # Loop continues to next attempt
 
     return state
-
-
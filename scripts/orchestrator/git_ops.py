@@ -2,10 +2,15 @@
 execute_orchestrator.py during the 2.4.0 refactor). See the package-level
 __init__ for the full public API."""
 from __future__ import annotations
+import atexit
 import os
 import re
+import shutil
 import subprocess
+import threading
+import time
 
+from .blobs import remove_blob_store
 from .events import write_notification
 from .specs import archive_spec
 from .supervisor import (
@@ -13,7 +18,7 @@ from .supervisor import (
     HEALTH_FILE,
     pause_file_exists,
 )
-from .utils import kill_tmux_session, log, run_git
+from .utils import kill_tmux_session, log, record_git_timing, run_git
 
 _GIT_STUCK_STATE_MARKERS = [
     ("MERGE_HEAD", "MERGING"),
@@ -21,12 +26,185 @@ _GIT_STUCK_STATE_MARKERS = [
     ("CHERRY_PICK_HEAD", "CHERRY-PICKING"),
     ("REBASE_HEAD", "REBASING"),
 ]
+WORKTREE_DIRNAME = "kit-tools-worktrees"  # under the git common dir
+
+
+class GitRepo:
+    """Repository handle that answers object and ref queries from long-lived
+    `git cat-file --batch-check` / `--batch` processes.
+
+    Each query is a line written to an already-running git, so resolving
+    HEAD, a tree or a branch costs a pipe round-trip instead of a fork plus
+    repository setup. Refs are re-read by git on every query, so answers stay
+    current while the orchestrator commits, merges and deletes branches.
+    Porcelain operations (checkout, merge, worktree, ...) go through `run`,
+    which is plain `run_git`. A batch process that dies is restarted once per
+    query; if that fails too the query falls back to `git rev-parse`.
+    Thread-safe: one lock per batch process.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._procs: dict[str, subprocess.Popen] = {}
+        self._locks = {"--batch-check": threading.Lock(), "--batch": threading.Lock()}
+
+    def _proc(self, mode: str) -> subprocess.Popen:
+        proc = self._procs.get(mode)
+        if proc is None or proc.poll() is not None:
+            proc = subprocess.Popen(
+                ["git", "cat-file", mode], cwd=self.path,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            )
+            self._procs[mode] = proc
+        return proc
+
+    def _query(self, mode: str, rev: str, op: str):
+        """Send `rev` to the `mode` process; return (header fields, body) or None.
+
+        Raises OSError when the process cannot be (re)started or talked to.
+        """
+        started = time.monotonic()
+        with self._locks[mode]:
+            for retry in (False, True):
+                proc = self._proc(mode)
+                try:
+                    proc.stdin.write(rev.encode() + b"\n")
+                    proc.stdin.flush()
+                    header = proc.stdout.readline()
+                    if not header:
+                        raise BrokenPipeError("cat-file exited")
+                    fields = header.decode().split()
+                    # "<rev> missing" / "<rev> ambiguous" — and <rev> may contain spaces
+                    if fields[-1] in ("missing", "ambiguous"):
+                        fields = []
+                    body = None
+                    if mode == "--batch" and len(fields) == 3:
+                        body = proc.stdout.read(int(fields[2]) + 1)[:-1]
+                    break
+                except (OSError, ValueError):
+                    self._kill(mode)
+                    if retry:
+                        raise OSError(f"git cat-file {mode} unavailable in {self.path}")
+        record_git_timing(f"cat-file {op}", time.monotonic() - started)
+        if len(fields) != 3:
+            return None
+        return fields, body
+
+    def object_info(self, rev: str) -> tuple[str, str, int] | None:
+        """Return `(sha, type, size)` for a revision expression, or None."""
+        if not rev or "\n" in rev:
+            return None
+        try:
+            found = self._query("--batch-check", rev, "resolve")
+        except OSError:
+            result = run_git(["rev-parse", "--verify", "--quiet", rev], self.path)
+            sha = result.stdout.strip()
+            if result.returncode != 0 or not sha:
+                return None
+            kind = run_git(["cat-file", "-t", sha], self.path).stdout.strip()
+            size = run_git(["cat-file", "-s", sha], self.path).stdout.strip()
+            return sha, kind, int(size or 0)
+        if found is None:
+            return None
+        sha, kind, size = found[0]
+        return sha, kind, int(size)
+
+    def resolve(self, rev: str) -> str | None:
+        """Return the object SHA `rev` names (HEAD, a branch, `X^{tree}`), or None."""
+        info = self.object_info(rev)
+        return info[0] if info else None
+
+    def read_object(self, rev: str) -> tuple[str, bytes] | None:
+        """Return `(type, content)` of the object `rev` names, or None."""
+        if not rev or "\n" in rev:
+            return None
+        try:
+            found = self._query("--batch", rev, "read")
+        except OSError:
+            info = self.object_info(rev)
+            if info is None:
+                return None
+            result = subprocess.run(
+                ["git", "cat-file", info[1], info[0]], cwd=self.path, capture_output=True
+            )
+            return (info[1], result.stdout) if result.returncode == 0 else None
+        if found is None:
+            return None
+        return found[0][1], found[1]
+
+    def head_commit(self) -> str:
+        """Return the HEAD commit SHA, or "" (unborn branch, not a repo)."""
+        return self.resolve("HEAD") or ""
+
+    def branch_exists(self, branch: str) -> bool:
+        """Return True if the local branch `branch` exists."""
+        return self.resolve(f"refs/heads/{branch}") is not None
+
+    def run(self, args: list[str], check: bool = False) -> subprocess.CompletedProcess:
+        """Run a porcelain git command in this repository (`run_git`)."""
+        return run_git(args, self.path, check=check)
+
+    def _kill(self, mode: str) -> None:
+        proc = self._procs.pop(mode, None)
+        if proc is None:
+            return
+        try:
+            proc.kill()
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        for stream in (proc.stdin, proc.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        """Stop the batch processes. The handle restarts them if used again."""
+        for mode, lock in self._locks.items():
+            with lock:
+                self._kill(mode)
+
+
+# Open handles by real path — one pair of cat-file processes per checkout
+# (the main project dir and each attempt worktree).
+_GIT_REPOS: dict[str, GitRepo] = {}
+_GIT_REPOS_LOCK = threading.Lock()
+
+
+def get_git_repo(path: str) -> GitRepo:
+    """Return the shared GitRepo handle for the checkout at `path`."""
+    key = os.path.realpath(path)
+    with _GIT_REPOS_LOCK:
+        repo = _GIT_REPOS.get(key)
+        if repo is None:
+            repo = _GIT_REPOS[key] = GitRepo(path)
+        return repo
+
+
+def close_git_repo(path: str) -> None:
+    """Close and forget the handle for `path` (e.g. before removing a worktree)."""
+    with _GIT_REPOS_LOCK:
+        repo = _GIT_REPOS.pop(os.path.realpath(path), None)
+    if repo is not None:
+        repo.close()
+
+
+def close_git_repos() -> None:
+    """Close every open GitRepo handle."""
+    with _GIT_REPOS_LOCK:
+        repos = list(_GIT_REPOS.values())
+        _GIT_REPOS.clear()
+    for repo in repos:
+        repo.close()
+
+
+atexit.register(close_git_repos)
 
 
 def get_head_commit(project_dir: str) -> str:
     """Get the current HEAD commit hash."""
-    result = run_git(["rev-parse", "HEAD"], project_dir)
-    return result.stdout.strip()
+    return get_git_repo(project_dir).head_commit()
 
 
 def get_current_branch(project_dir: str) -> str:
@@ -36,7 +214,12 @@ def get_current_branch(project_dir: str) -> str:
 
 
 def cleanup_attempt_branches(project_dir: str, feature_branch: str) -> None:
-    """Delete any leaked attempt branches from previous crashed runs."""
+    """Delete any leaked attempt branches from previous crashed runs.
+
+    Leaked attempt worktrees (parallel mode) are removed first — git refuses
+    to delete a branch that is still checked out in a linked worktree.
+    """
+    cleanup_attempt_worktrees(project_dir, feature_branch)
     result = run_git(["branch", "--list", f"{feature_branch}-*-attempt-*"], project_dir)
     if result.returncode != 0 or not result.stdout.strip():
         return
@@ -56,8 +239,7 @@ def create_attempt_branch(project_dir: str, feature_branch: str, story_id: str,
     # Ensure we're on the feature branch
     run_git(["checkout", feature_branch], project_dir, check=True)
     # Delete the branch if it already exists (leaked from a previous crash)
-    existing = run_git(["branch", "--list", attempt_branch], project_dir)
-    if existing.stdout.strip():
+    if get_git_repo(project_dir).branch_exists(attempt_branch):
         run_git(["branch", "-D", attempt_branch], project_dir)
         log(f"  Deleted pre-existing attempt branch: {attempt_branch}")
     # Create and switch to the attempt branch
@@ -66,17 +248,116 @@ def create_attempt_branch(project_dir: str, feature_branch: str, story_id: str,
     return attempt_branch
 
 
+def get_worktree_root(project_dir: str, config: dict | None = None) -> str:
+    """Return the directory that holds per-attempt linked worktrees.
+
+    Honours `config["worktree_dir"]` when set. The default lives inside the
+    git common dir (`.git/kit-tools-worktrees`) so the worktrees never show
+    up in `git status` of the main checkout and sit on the same filesystem
+    as the object store.
+    """
+    if config and config.get("worktree_dir"):
+        return os.path.abspath(config["worktree_dir"])
+    result = run_git(["rev-parse", "--git-common-dir"], project_dir)
+    common_dir = result.stdout.strip() if result.returncode == 0 else ".git"
+    if not os.path.isabs(common_dir):
+        common_dir = os.path.join(project_dir, common_dir)
+    return os.path.join(common_dir, WORKTREE_DIRNAME)
+
+
+def create_attempt_worktree(
+    project_dir: str, feature_branch: str, story_id: str, attempt: int,
+    worktree_root: str, base_ref: str | None = None, candidate: int | None = None,
+) -> tuple[str, str]:
+    """Create an attempt branch checked out in its own linked worktree.
+
+    The main checkout stays on the feature branch, so several attempts can
+    run side by side. `base_ref` defaults to the feature branch tip.
+    `candidate` suffixes the branch (`...-attempt-N-cK`) so speculative
+    candidates of the same attempt get distinct branches.
+
+    Returns `(attempt_branch, worktree_path)`.
+    """
+    attempt_branch = f"{feature_branch}-{story_id}-attempt-{attempt}"
+    if candidate is not None:
+        attempt_branch += f"-c{candidate}"
+    worktree_path = os.path.join(worktree_root, attempt_branch.replace("/", "__"))
+    # Clear anything leaked from a previous crash at the same path/branch
+    if os.path.exists(worktree_path):
+        remove_attempt_worktree(project_dir, worktree_path)
+    if get_git_repo(project_dir).branch_exists(attempt_branch):
+        run_git(["branch", "-D", attempt_branch], project_dir)
+        log(f"  Deleted pre-existing attempt branch: {attempt_branch}")
+    os.makedirs(worktree_root, exist_ok=True)
+    run_git(
+        ["worktree", "add", "-b", attempt_branch, worktree_path, base_ref or feature_branch],
+        project_dir, check=True,
+    )
+    log(f"  Created attempt worktree: {attempt_branch} at {worktree_path}")
+    return attempt_branch, worktree_path
+
+
+def rebase_attempt_worktree(worktree_path: str, onto: str, upstream: str) -> bool:
+    """Replay the worktree branch's commits after `upstream` onto `onto`.
+
+    Used when an attempt was cut from another attempt's head that was then
+    discarded. On conflict the rebase is aborted and False is returned.
+    """
+    result = run_git(["rebase", "--onto", onto, upstream], worktree_path)
+    if result.returncode == 0:
+        return True
+    run_git(["rebase", "--abort"], worktree_path)
+    return False
+
+
+def remove_attempt_worktree(project_dir: str, worktree_path: str) -> None:
+    """Remove a linked attempt worktree. The attempt branch is left intact.
+
+    Best-effort: falls back to deleting the directory and pruning git's
+    worktree metadata if `git worktree remove` refuses (e.g. the directory
+    was already half-deleted by a crash).
+    """
+    close_git_repo(worktree_path)
+    result = run_git(["worktree", "remove", "--force", worktree_path], project_dir)
+    if result.returncode != 0 and os.path.exists(worktree_path):
+        shutil.rmtree(worktree_path, ignore_errors=True)
+    run_git(["worktree", "prune"], project_dir)
+
+
+def cleanup_attempt_worktrees(project_dir: str, feature_branch: str) -> None:
+    """Remove linked worktrees left behind by crashed parallel runs."""
+    result = run_git(["worktree", "list", "--porcelain"], project_dir)
+    if result.returncode != 0:
+        return
+    prefix = f"refs/heads/{feature_branch}-"
+    path = None
+    for line in result.stdout.split("\n"):
+        if line.startswith("worktree "):
+            path = line[len("worktree "):]
+        elif line.startswith("branch ") and path:
+            ref = line[len("branch "):]
+            if ref.startswith(prefix) and "-attempt-" in ref:
+                remove_attempt_worktree(project_dir, path)
+                log(f"  Cleaned up leaked attempt worktree: {path}")
+            path = None
+    run_git(["worktree", "prune"], project_dir)
+
+
 def get_attempt_diff(project_dir: str, feature_branch: str, attempt_branch: str) -> str:
     """Capture the diff between the feature branch and the attempt branch.
 
     Used to provide patch-based retry context for subsequent attempts.
     """
-    result = run_git(["diff", f"{feature_branch}...{attempt_branch}"], project_dir)
-    diff = result.stdout.strip() if result.returncode == 0 else ""
-    # Truncate if too large
-    if len(diff) > 10000:
-        diff = diff[:10000] + "\n\n... [diff truncated at 10KB] ..."
-    return diff
+    status: dict = {}
+    data = b""
+    # Only the first 10KB is kept, so stop reading there
+    for chunk in _git_output_chunks(["diff", f"{feature_branch}...{attempt_branch}"], project_dir, status):
+        data += chunk
+        if len(data) > 10000:
+            break
+    if len(data) > 10000:
+        return data[:10000].decode("utf-8", errors="replace") + "\n\n... [diff truncated at 10KB] ..."
+    return data.decode("utf-8", errors="replace").strip() if status.get("returncode") == 0 else ""
 
 
 def get_diff_stat(project_dir: str, feature_branch: str, attempt_branch: str) -> str:
@@ -88,18 +369,226 @@ def get_diff_stat(project_dir: str, feature_branch: str, attempt_branch: str) ->
     return result.stdout.strip() if result.returncode == 0 else ""
 
 
-def merge_attempt_branch(project_dir: str, feature_branch: str, attempt_branch: str) -> bool:
+_DIFF_READ_CHUNK = 64 * 1024
+
+
+def _git_output_chunks(args: list[str], cwd: str, status: dict):
+    """Yield a git command's stdout in chunks as it is produced.
+
+    Closing the generator early (e.g. `break` out of the loop) kills git, so
+    callers can stop reading once they have enough. After a full read,
+    `status["returncode"]` holds git's exit code.
+    """
+    proc = subprocess.Popen(
+        ["git"] + args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    try:
+        while True:
+            chunk = proc.stdout.read1(_DIFF_READ_CHUNK)
+            if not chunk:
+                break
+            yield chunk
+        status["returncode"] = proc.wait()
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+
+
+def _format_numstat(entries: list[tuple[str, str, str, str]]) -> str:
+    """Render `(added, deleted, path, display)` numstat entries like `git diff --stat`."""
+    if not entries:
+        return ""
+    width = max(len(display) for _, _, _, display in entries)
+    counted = [(int(a), int(d)) for a, d, _, _ in entries if a != "-"]
+    largest = max((a + d for a, d in counted), default=0)
+    count_width = len(str(largest))
+    scale = min(1.0, 50 / largest) if largest else 1.0
+    lines = []
+    for added, deleted, _, display in entries:
+        if added == "-":
+            lines.append(f" {display.ljust(width)} | Bin")
+            continue
+        a, d = int(added), int(deleted)
+        plus = "+" * (max(1, round(a * scale)) if a else 0)
+        minus = "-" * (max(1, round(d * scale)) if d else 0)
+        lines.append(f" {display.ljust(width)} | {str(a + d).rjust(count_width)} {plus}{minus}".rstrip())
+    insertions = sum(a for a, _ in counted)
+    deletions = sum(d for _, d in counted)
+    summary = f" {len(entries)} file{'s' if len(entries) != 1 else ''} changed"
+    if insertions or not deletions:
+        summary += f", {insertions} insertion{'s' if insertions != 1 else ''}(+)"
+    if deletions or not insertions:
+        summary += f", {deletions} deletion{'s' if deletions != 1 else ''}(-)"
+    lines.append(summary)
+    return "\n".join(lines)
+
+
+def collect_diff(work_dir: str, rev_range: str, max_patch: int) -> dict:
+    """Collect name list, stat and a size-capped patch from a single `git diff`.
+
+    Runs `git diff --numstat -z -p <rev_range>` once. The NUL-separated
+    numstat records come first and give both the changed-file list and the
+    stat; the patch after them is read incrementally and git is killed as
+    soon as more than `max_patch` bytes have arrived, so oversized diffs are
+    never held in memory in full.
+
+    Returns a dict with `files_changed` (newline-joined paths), `diff_stat`,
+    `patch` (stripped; empty when truncated), `patch_bytes` (bytes read, a
+    lower bound when truncated) and `truncated`. Everything is empty when git
+    fails.
+    """
+    status: dict = {}
+    head = b""
+    patch = b""
+    in_patch = False
+    truncated = False
+    for chunk in _git_output_chunks(["diff", "--numstat", "-z", "-p", rev_range], work_dir, status):
+        if in_patch:
+            patch += chunk
+        else:
+            head += chunk
+            # The numstat section ends with an empty record: "...\0\0"
+            split = head.find(b"\0\0")
+            if split == -1:
+                continue
+            head, patch = head[:split + 1], head[split + 2:]
+            in_patch = True
+        if len(patch) > max_patch:
+            truncated = True
+            break
+    if not truncated and status.get("returncode") != 0:
+        return {"files_changed": "", "diff_stat": "", "patch": "", "patch_bytes": 0, "truncated": False}
+
+    # Records are "added\tdeleted\tpath"; renames are "added\tdeleted\t" followed
+    # by the old and new paths as two further fields.
+    fields = head.decode("utf-8", errors="replace").split("\0")
+    entries = []
+    i = 0
+    while i < len(fields):
+        record = fields[i]
+        i += 1
+        parts = record.split("\t", 2)
+        if len(parts) != 3:
+            continue
+        added, deleted, path = parts
+        display = path
+        if not path and i + 1 < len(fields):
+            path = fields[i + 1]
+            display = f"{fields[i]} => {path}"
+            i += 2
+        entries.append((added, deleted, path, display))
+
+    return {
+        "files_changed": "\n".join(entry[2] for entry in entries),
+        "diff_stat": _format_numstat(entries),
+        "patch": "" if truncated else patch.decode("utf-8", errors="replace").strip(),
+        "patch_bytes": len(patch),
+        "truncated": truncated,
+    }
+
+
+def _merge_tree(project_dir: str, ours: str, theirs: str) -> str | None | bool:
+    """Merge `theirs` into `ours` in memory with `git merge-tree --write-tree`.
+
+    Returns the merged tree SHA when the merge is clean, False when it
+    conflicts, or None when merge-tree is unavailable (git < 2.38) or errors.
+    Nothing in any working tree or ref is touched.
+    """
+    result = run_git(["merge-tree", "--write-tree", "--no-messages", ours, theirs], project_dir)
+    if result.returncode == 1:
+        return False
+    tree = result.stdout.split("\n", 1)[0].strip()
+    if result.returncode != 0 or not re.fullmatch(r"[0-9a-f]{40,64}", tree):
+        return None
+    return tree
+
+
+def _rebase_attempt_branch(
+    project_dir: str, feature_branch: str, attempt_branch: str, config: dict | None = None,
+) -> bool:
+    """Rebase `attempt_branch` onto `feature_branch` in a scratch worktree.
+
+    Only tried when the attempt has more than one commit: with a single
+    commit, replaying it sees the same three trees as the merge that just
+    conflicted. The attempt branch is moved only if the rebase applies
+    cleanly; the main checkout is never touched. The scratch worktree lives
+    under `get_worktree_root(project_dir, config)`, like attempt worktrees.
+    """
+    base = run_git(["merge-base", feature_branch, attempt_branch], project_dir).stdout.strip()
+    count = run_git(["rev-list", "--count", f"{base}..{attempt_branch}"], project_dir).stdout.strip()
+    if not base or not count.isdigit() or int(count) < 2:
+        return False
+    scratch = os.path.join(get_worktree_root(project_dir, config), f"rebase-{attempt_branch.replace('/', '__')}")
+    if os.path.exists(scratch):
+        remove_attempt_worktree(project_dir, scratch)
+    added = run_git(["worktree", "add", "--detach", scratch, attempt_branch], project_dir)
+    if added.returncode != 0:
+        return False
+    try:
+        if run_git(["rebase", feature_branch], scratch).returncode != 0:
+            run_git(["rebase", "--abort"], scratch)
+            log(f"  Automatic rebase of {attempt_branch} onto {feature_branch} conflicted")
+            return False
+        rebased = get_git_repo(scratch).head_commit()
+    finally:
+        remove_attempt_worktree(project_dir, scratch)
+    if not rebased:
+        return False
+    run_git(["branch", "-f", attempt_branch, rebased], project_dir, check=True)
+    log(f"  Rebased {attempt_branch} onto {feature_branch}")
+    return True
+
+
+def merge_attempt_branch(
+    project_dir: str, feature_branch: str, attempt_branch: str, config: dict | None = None,
+) -> bool:
     """Merge a successful attempt branch into the feature branch.
 
+    The merge is computed in memory with `git merge-tree` first, so a
+    conflict is detected without checking anything out and leaves no merge
+    in progress. A conflicting multi-commit attempt is rebased onto the
+    feature branch (in a scratch worktree) and merged if that applies
+    cleanly. A clean result is committed with `commit-tree` when it is not a
+    fast-forward, and the feature branch then fast-forwards to it, so its ref
+    only advances on a clean merge. Falls back to an in-tree `git merge` when
+    merge-tree is unavailable — that path may leave a merge in progress on
+    failure. `config` is used for the scratch worktree's `worktree_dir`.
+
     Returns True if merge succeeded.
     """
     # Switch to the feature branch
     run_git(["checkout", feature_branch], project_dir, check=True)
-    # Merge the attempt branch (fast-forward if possible)
-    result = run_git(["merge", attempt_branch, "--no-edit"], project_dir)
-    if result.returncode != 0:
-        log(f"  Merge failed: {result.stderr[:200]}")
+    tree = _merge_tree(project_dir, feature_branch, attempt_branch)
+    if tree is False and _rebase_attempt_branch(project_dir, feature_branch, attempt_branch, config):
+        tree = _merge_tree(project_dir, feature_branch, attempt_branch)
+    if tree is False:
+        log(f"  Merge conflict between {attempt_branch} and {feature_branch} (detected in memory)")
         return False
+    if tree is None:
+        # Merge the attempt branch (fast-forward if possible)
+        result = run_git(["merge", attempt_branch, "--no-edit"], project_dir)
+        if result.returncode != 0:
+            log(f"  Merge failed: {result.stderr[:200]}")
+            return False
+    else:
+        target = attempt_branch
+        is_ff = run_git(["merge-base", "--is-ancestor", feature_branch, attempt_branch], project_dir)
+        if is_ff.returncode != 0:
+            commit = run_git(
+                ["commit-tree", tree, "-p", feature_branch, "-p", attempt_branch,
+                 "-m", f"Merge branch '{attempt_branch}' into {feature_branch}"],
+                project_dir,
+            )
+            if commit.returncode != 0:
+                log(f"  Merge failed: {commit.stderr[:200]}")
+                return False
+            target = commit.stdout.strip()
+        result = run_git(["merge", "--ff-only", target], project_dir)
+        if result.returncode != 0:
+            log(f"  Merge failed: {result.stderr[:200]}")
+            return False
     # Delete the attempt branch
     run_git(["branch", "-d", attempt_branch], project_dir, check=True)
     log(f"  Merged {attempt_branch} into {feature_branch}")
@@ -229,13 +718,15 @@ def verify_clean_worktree(project_dir: str) -> tuple[bool, str]:
     return False, summary
 
 
+# Run tracking files the orchestrator writes into the checkout and commits
+# once, after completion — uncommitted while stories are running.
+TRACKING_FILES = ("kit_tools/EXECUTION_LOG.md", "kit_tools/AUDIT_FINDINGS.md")
+
+
 def commit_tracking_files(project_dir: str, feature_name: str) -> None:
     """Commit tracking files (execution log, audit findings) after completion."""
     files_to_commit = []
-    for rel_path in [
-        "kit_tools/EXECUTION_LOG.md",
-        "kit_tools/AUDIT_FINDINGS.md",
-    ]:
+    for rel_path in TRACKING_FILES:
         full_path = os.path.join(project_dir, rel_path)
         if os.path.exists(full_path):
             files_to_commit.append(rel_path)
@@ -276,6 +767,7 @@ def _cleanup_execution_artifacts(project_dir: str) -> None:
     """Remove execution state files after completion."""
     for rel_path in [
         os.path.join("kit_tools", "specs", ".execution-state.json"),
+        os.path.join("kit_tools", "specs", ".execution-state.journal.jsonl"),
         os.path.join("kit_tools", "specs", ".execution-config.json"),
         os.path.join("kit_tools", ".pause_execution"),
         HEALTH_FILE,
@@ -287,6 +779,7 @@ def _cleanup_execution_artifacts(project_dir: str) -> None:
                 os.remove(full)
             except OSError:
                 pass
+    remove_blob_store(project_dir)
 
 
 def _build_pr_body(config: dict, state: dict) -> str:
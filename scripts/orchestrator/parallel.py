@@ -0,0 +1,753 @@
+"""Part of the KitTools orchestrator package (split from the monolithic
+execute_orchestrator.py during the 2.4.0 refactor). See the package-level
+__init__ for the full public API.
+
+Parallel story execution: up to `parallel_stories` attempts run at once, each
+in its own linked git worktree on its own attempt branch. Worker threads only
+run the implementer/verifier sessions; the coordinator thread owns the state
+dict and the main checkout, so merges still go one at a time through
+`merge_attempt_branch`.
+
+Retries of stories whose spec size is listed in `speculative_candidates`
+race several candidate attempts on separate worktrees; the first candidate
+to pass verification is merged and the rest are cancelled.
+"""
+from __future__ import annotations
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from .config import (
+    get_model_config,
+    get_parallel_stories,
+    get_session_memory_limit,
+    get_session_sandbox,
+    get_session_stall_timeout,
+    get_speculative_candidates,
+)
+from .control import interruptible
+from .durations import adaptive_timeout, record_session_duration
+from .events import write_notification
+from .execution_log import log_story_failure
+from .executor import (
+    _collect_attempt_changes,
+    _complete_verified_attempt,
+    _fail_attempt,
+    _read_spec_size,
+    _record_session_usage,
+    _select_impl_model,
+)
+from .git_ops import (
+    commit_tracking_files,
+    create_attempt_worktree,
+    delete_attempt_branch,
+    get_head_commit,
+    get_worktree_root,
+    remove_attempt_worktree,
+)
+from .prompts import (
+    build_implementation_prompt,
+    build_verification_prompt,
+    check_and_trim_prompt,
+    classify_failure,
+)
+from .sessions import (
+    clean_result_files,
+    extract_learnings_from_results,
+    get_size_timeouts,
+    is_session_error,
+    read_implementation_result,
+    read_verification_result,
+    run_claude_session,
+    terminate_active_sessions,
+)
+from .specs import is_story_dropped, list_ready_stories
+from .state import save_state, update_state_story
+from .supervisor import (
+    check_orchestrator_duration,
+    handle_control_action,
+    pause_file_exists,
+    read_control_file,
+    wait_for_pause_removal,
+    write_health_snapshot,
+    write_session_progress,
+)
+from .test_impact import ensure_test_impact_index
+from .tests_metrics import (
+    check_test_mapping_gaps,
+    detect_test_command,
+    make_fail_fast,
+    pre_flight_check,
+    update_test_metrics,
+)
+from .utils import log
+from .verify_cache import get_verify_cache_key, lookup_cached_verdict, store_cached_verdict
+
+
+def _story_state(state: dict, story_id: str, spec_key: str | None) -> dict:
+    """Return the state entry for a story (empty dict if not tracked yet)."""
+    if spec_key is not None:
+        stories = state.get("specs", {}).get(spec_key, {}).get("stories", {})
+    else:
+        stories = state.get("stories", {})
+    return stories.get(story_id, {})
+
+
+def _update_parallel_stats(
+    state: dict, workers: int, wall_base: float, run_started: float,
+    in_flight: list[str], busy_s: float = 0.0, attempts: int = 0,
+) -> None:
+    """Refresh `state["parallel"]` with the measured parallel speedup.
+
+    `busy_s` is the sum of per-attempt session wall-clock — what the same
+    attempts would have cost run back to back. `wall_s` is the elapsed
+    wall-clock of the parallel executor. `speedup = busy_s / wall_s`.
+    """
+    stats = state.setdefault("parallel", {"workers": workers, "attempts": 0, "busy_s": 0.0, "wall_s": 0.0})
+    stats["workers"] = workers
+    stats["attempts"] = stats.get("attempts", 0) + attempts
+    stats["busy_s"] = round(stats.get("busy_s", 0.0) + busy_s, 1)
+    stats["wall_s"] = round(wall_base + (time.monotonic() - run_started), 1)
+    stats["speedup"] = round(stats["busy_s"] / stats["wall_s"], 2) if stats["wall_s"] > 0 else 1.0
+    stats["in_flight"] = in_flight
+
+
+def _run_implementation(job: dict, config: dict) -> dict:
+    """Worker-thread body: run the implementer session in the attempt worktree.
+
+    Touches only the attempt worktree — never the shared state dict or the
+    main checkout — so the coordinator stays the single writer of both.
+    Returns the outcome dict consumed by `_run_verification` and
+    `_handle_attempt_outcome`.
+    """
+    story = job["story"]
+    work_dir = job["work_dir"]
+    started = time.monotonic()
+    outcome = {
+        "impl_output": "",
+        "impl_result": None,
+        "files_changed": "",
+        "diff_stat": "",
+        "diff_content": "",
+        "verify_output": None,
+        "verify_prompt_chars": 0,
+        "verdict": None,
+        "verify_error": "",
+        "impl_resources": {},
+        "verify_resources": {},
+    }
+
+    clean_result_files(work_dir)
+    with interruptible(story["id"], job["cancel"]):
+        outcome["impl_output"] = run_claude_session(
+            job["impl_prompt"], work_dir, timeout=job["impl_timeout"], model=job["impl_model"],
+            label=f"{job['label']} impl", stall_timeout=get_session_stall_timeout(config),
+            on_progress=lambda: write_session_progress(config), cancel=job["cancel"],
+            memory_limit_mb=get_session_memory_limit(config), resources=outcome["impl_resources"],
+            sandbox_limits=get_session_sandbox(config),
+        )
+    if not is_session_error(outcome["impl_output"]):
+        impl_result, impl_error = read_implementation_result(work_dir)
+        if impl_error:
+            log(f"  [{story['id']}] Implementation result: {impl_error}")
+        outcome["impl_result"] = impl_result
+        (outcome["files_changed"], outcome["diff_stat"],
+         outcome["diff_content"]) = _collect_attempt_changes(work_dir, job["base_ref"])
+    outcome["impl_elapsed_s"] = outcome["elapsed_s"] = time.monotonic() - started
+    return outcome
+
+
+def _run_verification(job: dict, config: dict, outcome: dict) -> dict:
+    """Worker-thread body: verify an implemented attempt in its worktree."""
+    story = job["story"]
+    work_dir = job["work_dir"]
+    started = time.monotonic()
+    cache_key = get_verify_cache_key(config, work_dir, story, job["verify_model"])
+    cached_verdict = lookup_cached_verdict(config["project_dir"], cache_key)
+    if cached_verdict:
+        log(f"  Verification cache hit for {job['label']} (attempt {job['attempt']}) — reusing '{cached_verdict['verdict']}' verdict")
+        outcome["verify_cached"] = True
+        outcome["verify_output"] = "Verification result reused from cache"
+        outcome["verdict"], outcome["verify_error"] = cached_verdict, ""
+        return outcome
+    log(f"  Verifying {job['label']} (attempt {job['attempt']})...")
+    verify_prompt = build_verification_prompt(
+        story, config, outcome["files_changed"],
+        diff_stat=outcome["diff_stat"], test_command=job["test_command"], spec_path=job["spec_path"],
+        diff_content=outcome["diff_content"], work_dir=work_dir,
+    )
+    verify_prompt = check_and_trim_prompt(verify_prompt, "verification")
+    outcome["verify_prompt_chars"] = len(verify_prompt)
+    with interruptible(story["id"], job["cancel"]):
+        outcome["verify_output"] = run_claude_session(
+            verify_prompt, work_dir, timeout=job["verify_timeout"], model=job["verify_model"],
+            label=f"{job['label']} verify", stall_timeout=get_session_stall_timeout(config),
+            on_progress=lambda: write_session_progress(config), cancel=job["cancel"],
+            memory_limit_mb=get_session_memory_limit(config), resources=outcome["verify_resources"],
+            sandbox_limits=get_session_sandbox(config),
+        )
+    if not is_session_error(outcome["verify_output"]):
+        outcome["verdict"], outcome["verify_error"] = read_verification_result(work_dir)
+        if outcome["verdict"]:
+            store_cached_verdict(config["project_dir"], cache_key, outcome["verdict"], story["id"])
+    outcome["verify_elapsed_s"] = time.monotonic() - started
+    outcome["elapsed_s"] = outcome.get("elapsed_s", 0.0) + outcome["verify_elapsed_s"]
+    return outcome
+
+
+def _run_attempt_sessions(job: dict, config: dict) -> dict:
+    """Worker-thread body: implement and verify one attempt in its worktree."""
+    outcome = _run_implementation(job, config)
+    if is_session_error(outcome["impl_output"]) or job["cancel"].is_set():
+        return outcome
+    return _run_verification(job, config, outcome)
+
+
+def _attempt_passed(outcome: dict) -> bool:
+    """True if both sessions succeeded and the verifier passed the attempt."""
+    verdict = outcome.get("verdict")
+    return (
+        not is_session_error(outcome["impl_output"])
+        and outcome.get("verify_output") is not None
+        and not is_session_error(outcome["verify_output"])
+        and not outcome.get("verify_error")
+        and bool(verdict) and verdict["verdict"] in ("pass", "pass_with_warnings")
+    )
+
+
+def _run_candidate_sessions(jobs: list[dict], config: dict) -> list[dict]:
+    """Worker-thread body: race the speculative candidates of one attempt.
+
+    Every candidate implements and verifies in its own worktree. The first
+    to pass sets the candidates' shared cancel event, which kills the
+    sessions of the others. Returns outcomes in `jobs` order, each stamped
+    with `finished_at` so the coordinator can tell which passed first.
+    """
+    cancel = jobs[0]["cancel"]
+
+    def race(job: dict) -> dict:
+        outcome = _run_attempt_sessions(job, config)
+        outcome["finished_at"] = time.monotonic()
+        if _attempt_passed(outcome):
+            cancel.set()
+        return outcome
+
+    with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="kit-candidate") as pool:
+        futures = [pool.submit(race, job) for job in jobs]
+    outcomes = []
+    for future in futures:
+        try:
+            outcomes.append(future.result())
+        except Exception as e:  # candidate crashed outside a session
+            outcomes.append({
+                "impl_output": f"SESSION_ERROR: candidate worker crashed: {e}",
+                "verify_output": None,
+                "elapsed_s": 0.0,
+                "finished_at": time.monotonic(),
+            })
+    return outcomes
+
+
+def _start_attempt(
+    story: dict, attempt: int, run: dict, worktree_root: str, cancel: threading.Event,
+    base_ref: str | None = None, candidate: int | None = None,
+) -> dict:
+    """Create the attempt worktree, record the attempt start and build the job.
+
+    The worktree is cut from `base_ref` (default: the feature branch).
+    `candidate` numbers a speculative candidate of the attempt.
+    """
+    config, state, spec_key = run["config"], run["state"], run["spec_key"]
+    project_dir = config["project_dir"]
+
+    if attempt == 1:
+        pre_flight_check(story, config, state, spec_key)
+        save_state(state, config)
+
+    attempt_branch, work_dir = create_attempt_worktree(
+        project_dir, config["branch_name"], story["id"], attempt, worktree_root,
+        base_ref=base_ref, candidate=candidate,
+    )
+    label = story["id"] if candidate is None else f"{story['id']}/c{candidate}"
+    mode = "parallel" if candidate is None else f"candidate {candidate}"
+    log(f"Implementing {story['id']}: {story['title']} (attempt {attempt}, {mode})...")
+    update_state_story(state, story["id"], "in_progress", attempt, spec_key=spec_key)
+    save_state(state, config)
+    write_health_snapshot(config, state, story["id"], attempt, event="attempt_start")
+
+    prompt = build_implementation_prompt(
+        story, config, state, attempt,
+        feature_name=run["feature_name"], spec_path=run["spec_path"], spec_key=spec_key,
+        work_dir=work_dir,
+    )
+    prompt = check_and_trim_prompt(prompt, "implementation")
+    impl_model = _select_impl_model(config, attempt, run["spec_size"])
+    verify_model = get_model_config(config)["verifier"]
+    story_state = _story_state(state, story["id"], spec_key)
+    impl_timeout = adaptive_timeout(
+        config, "implementation", impl_model, run["spec_size"], len(story["criteria"]),
+        run["impl_timeout"], story_state,
+    )
+    verify_timeout = adaptive_timeout(
+        config, "verification", verify_model, run["spec_size"], len(story["criteria"]),
+        run["verify_timeout"], story_state,
+    )
+    log(f"  Session timeout: {impl_timeout}s (implementation, model={impl_model})")
+
+    return {
+        "run": run,
+        "story": story,
+        "attempt": attempt,
+        "label": label,
+        "attempt_branch": attempt_branch,
+        "work_dir": work_dir,
+        "base_ref": get_head_commit(work_dir),
+        "spec_path": run["spec_path"],
+        "impl_prompt": prompt,
+        "impl_model": impl_model,
+        "impl_timeout": impl_timeout,
+        "verify_model": verify_model,
+        "verify_timeout": verify_timeout,
+        "test_command": run["fail_fast_test"],
+        "cancel": cancel,
+    }
+
+
+def _record_attempt_usage(job: dict, outcome: dict) -> None:
+    """Record an attempt's session usage and durations in state (coordinator only)."""
+    run = job["run"]
+    config, state, story = run["config"], run["state"], job["story"]
+    impl_output = outcome["impl_output"]
+    _record_session_usage(
+        state, "implementation", len(job["impl_prompt"]), len(impl_output), outcome.get("impl_resources"),
+    )
+    if "impl_elapsed_s" in outcome:
+        record_session_duration(
+            config, state, "implementation", story, job["impl_model"], run["spec_size"],
+            outcome["impl_elapsed_s"], impl_output, job["impl_timeout"],
+        )
+    verify_output = outcome["verify_output"]
+    if verify_output is not None and not outcome.get("verify_cached"):
+        _record_session_usage(
+            state, "verification", outcome["verify_prompt_chars"], len(verify_output),
+            outcome.get("verify_resources"),
+        )
+        if "verify_elapsed_s" in outcome:
+            record_session_duration(
+                config, state, "verification", story, job["verify_model"], run["spec_size"],
+                outcome["verify_elapsed_s"], verify_output, job["verify_timeout"],
+            )
+    save_state(state, config)
+
+
+def _handle_attempt_outcome(job: dict, outcome: dict) -> None:
+    """Apply a finished attempt to state and the feature branch (coordinator only).
+
+    Mirrors the serial executor's per-attempt branches: permanent session
+    errors stop the run, retryable failures discard the attempt branch with
+    its diff captured, and passing attempts are merged one at a time.
+    """
+    run = job["run"]
+    config, state, spec_key = run["config"], run["state"], run["spec_key"]
+    project_dir = config["project_dir"]
+    story, attempt = job["story"], job["attempt"]
+    attempt_branch, work_dir = job["attempt_branch"], job["work_dir"]
+
+    # The branch outlives the worktree; git refuses to merge or delete a
+    # branch that is still checked out in a linked worktree.
+    remove_attempt_worktree(project_dir, work_dir)
+    _record_attempt_usage(job, outcome)
+
+    if is_story_dropped(_story_state(state, story["id"], spec_key)):
+        log(f"  Discarding attempt {attempt} of {story['id']} — dropped by supervisor")
+        delete_attempt_branch(project_dir, config["branch_name"], attempt_branch)
+        return
+
+    impl_output, verify_output = outcome["impl_output"], outcome["verify_output"]
+    if impl_output.startswith("SESSION_ERROR_PERMANENT:"):
+        f_type = classify_failure(impl_output, None, None)
+        log(f"  Permanent session error [{f_type}]: {impl_output[:200]}")
+        learnings = [f"Permanent error: {impl_output[:200]}"]
+        log_story_failure(story, attempt, config, impl_output[:500], learnings)
+        update_state_story(
+            state, story["id"], "failed", attempt, learnings, impl_output[:500],
+            spec_key=spec_key, failure_type=f_type
+        )
+        state["status"] = "failed"
+        save_state(state, config)
+        write_notification(
+            config, "story_failed",
+            f"Story {story['id']} permanent error",
+            f"{story['id']}: {impl_output[:200]}",
+            severity="critical",
+        )
+        delete_attempt_branch(project_dir, config["branch_name"], attempt_branch)
+        sys.exit(1)
+
+    if impl_output.startswith("SESSION_ERROR:"):
+        f_type = classify_failure(impl_output, None, None)
+        log(f"  Implementation session error for {story['id']} [{f_type}]: {impl_output[:200]}")
+        _fail_attempt(
+            story, attempt, config, state, spec_key, attempt_branch,
+            impl_output[:500], [f"Session error: {impl_output[:200]}"],
+            failure_type=f_type, capture_diff=False, work_dir=work_dir,
+        )
+        return
+
+    impl_result = outcome["impl_result"]
+    check_test_mapping_gaps(outcome["files_changed"], project_dir, run["warned_files"])
+
+    if verify_output is None:
+        # Cancelled (abort, skip/split, shutdown) between the two sessions
+        log(f"  {story['id']} attempt {attempt} cancelled before verification")
+        learnings = extract_learnings_from_results(impl_result, None)
+        learnings.append("Attempt cancelled before verification")
+        _fail_attempt(
+            story, attempt, config, state, spec_key, attempt_branch,
+            "SESSION_ERROR: Cancelled before verification", learnings,
+            failure_type="SESSION_ERROR", capture_diff=False, work_dir=work_dir,
+        )
+        return
+
+    if is_session_error(verify_output):
+        f_type = classify_failure("", verify_output, None)
+        log(f"  Verification session error for {story['id']} [{f_type}]: {verify_output[:200]}")
+        learnings = extract_learnings_from_results(impl_result, None)
+        learnings.append(f"Verify session error: {verify_output[:200]}")
+        _fail_attempt(
+            story, attempt, config, state, spec_key, attempt_branch,
+            verify_output[:500], learnings, failure_type=f_type, work_dir=work_dir,
+        )
+        return
+
+    verdict, verify_error = outcome["verdict"], outcome["verify_error"]
+    if verdict and not outcome.get("verify_cached"):
+        update_test_metrics(project_dir, verdict, story["id"])
+
+    if verify_error:
+        log(f"  Verification result error for {story['id']}: {verify_error}")
+        _fail_attempt(
+            story, attempt, config, state, spec_key, attempt_branch,
+            verify_error, extract_learnings_from_results(impl_result, None), work_dir=work_dir,
+        )
+        return
+
+    if verdict["verdict"] in ("pass", "pass_with_warnings"):
+        if _complete_verified_attempt(
+            story, attempt, config, state, run["spec_path"], run["feature_name"], spec_key,
+            attempt_branch, impl_result, verdict, outcome["files_changed"],
+            run["fail_fast_test"], work_dir=work_dir,
+        ):
+            write_health_snapshot(config, state, story["id"], attempt, event="story_passed")
+        return
+
+    failure_details = verdict.get("recommendations", "Verification failed")
+    f_type = classify_failure("", verify_output, verdict)
+    log(f"  {story['id']} FAILED verification (attempt {attempt}) [{f_type}]")
+    log(f"  Reason: {str(failure_details)[:200]}")
+    _fail_attempt(
+        story, attempt, config, state, spec_key, attempt_branch,
+        str(failure_details), extract_learnings_from_results(impl_result, verdict),
+        failure_type=f_type, work_dir=work_dir,
+    )
+    write_health_snapshot(config, state, story["id"], attempt, event="attempt_failed")
+
+
+def _handle_candidate_outcomes(jobs: list[dict], outcomes: list[dict]) -> None:
+    """Apply a finished race of speculative candidates (coordinator only).
+
+    The candidate that passed first is merged through `_handle_attempt_outcome`;
+    the others are discarded without counting as failures. If none passed,
+    every candidate is handled as a failed attempt, so all their learnings
+    and diffs feed the next retry. Candidates share one attempt number.
+    """
+    run = jobs[0]["run"]
+    config = run["config"]
+    story, attempt = jobs[0]["story"], jobs[0]["attempt"]
+    passed = [(o["finished_at"], i) for i, o in enumerate(outcomes) if _attempt_passed(o)]
+    if not passed:
+        log(f"  No candidate of {story['id']} passed (attempt {attempt})")
+        for job, outcome in zip(jobs, outcomes):
+            _handle_attempt_outcome(job, outcome)
+        return
+
+    winner = min(passed)[1]
+    log(f"  {jobs[winner]['label']} passed first — discarding {len(jobs) - 1} other candidate(s)")
+    for i, (job, outcome) in enumerate(zip(jobs, outcomes)):
+        if i != winner:
+            remove_attempt_worktree(config["project_dir"], job["work_dir"])
+            _record_attempt_usage(job, outcome)
+            delete_attempt_branch(config["project_dir"], config["branch_name"], job["attempt_branch"])
+    _handle_attempt_outcome(jobs[winner], outcomes[winner])
+
+
+def prepare_spec_run(
+    spec_path: str, feature_name: str, config: dict, state: dict,
+    spec_key: str | None = None, depends_on: list[str] | None = None,
+) -> dict:
+    """Build the per-spec context the parallel coordinator schedules from.
+
+    `depends_on` lists the spec keys (epic mode) that must finish — stories
+    merged and the spec finalised — before any story of this spec starts.
+    """
+    test_command = detect_test_command(config["project_dir"])
+    ensure_test_impact_index(config, test_command)
+    impl_timeout, verify_timeout = get_size_timeouts(spec_path)
+    return {
+        "config": config,
+        "state": state,
+        "spec_path": spec_path,
+        "feature_name": feature_name,
+        "spec_key": spec_key,
+        "depends_on": list(depends_on or []),
+        "spec_size": _read_spec_size(spec_path),
+        "impl_timeout": impl_timeout,
+        "verify_timeout": verify_timeout,
+        "test_command": test_command,
+        "fail_fast_test": make_fail_fast(test_command) if test_command else None,
+        "warned_files": set(),
+    }
+
+
+def _stories_state(run: dict) -> dict:
+    """Return the dict whose "stories" key holds this spec's story state."""
+    state = run["state"]
+    return state["specs"][run["spec_key"]] if run["spec_key"] is not None else state
+
+
+def _run_for_control(control: dict, runs: list[dict]) -> dict:
+    """Pick the spec a supervisor control action applies to.
+
+    Uses `control["spec"]` when given, else the first spec that contains
+    `control["story_id"]`, else the first active spec.
+    """
+    for run in runs:
+        if control.get("spec") and control["spec"] == run["spec_key"]:
+            return run
+    story_id = control.get("story_id")
+    if story_id:
+        for run in runs:
+            ready, remaining = list_ready_stories(run["spec_path"], _stories_state(run))
+            if any(s["id"] == story_id for s in remaining):
+                return run
+    return runs[0]
+
+
+def _check_run_controls(config: dict, state: dict, runs: list[dict]) -> None:
+    """Honour the pause file, supervisor control actions and the duration cap.
+
+    Called by the coordinator before each dispatch; exits the process on
+    abort or when the 24h safety net trips.
+    """
+    project_dir = config["project_dir"]
+    if pause_file_exists(project_dir):
+        wait_for_pause_removal(project_dir, config=config)
+
+    control = read_control_file(config)
+    if control:
+        target = _run_for_control(control, runs)
+        result = handle_control_action(
+            control, config, state, target["spec_path"], target["feature_name"],
+            target["spec_key"]
+        )
+        if result == "abort":
+            commit_tracking_files(project_dir, target["feature_name"])
+            sys.exit(1)
+        elif result == "pause":
+            wait_for_pause_removal(project_dir, config=config)
+
+    if check_orchestrator_duration(state):
+        state["status"] = "failed"
+        save_state(state, config)
+        write_notification(
+            config, "duration_limit",
+            "Orchestrator exceeded 24h limit",
+            "Safety net triggered — orchestrator has been running for over 24 hours.",
+            severity="critical",
+        )
+        commit_tracking_files(project_dir, runs[0]["feature_name"])
+        sys.exit(1)
+
+
+def _exit_if_retries_exhausted(story: dict, attempt: int, run: dict) -> None:
+    """Mark the story failed and exit if `attempt` exceeds `max_retries`."""
+    config, state = run["config"], run["state"]
+    max_retries = config.get("max_retries")
+    if max_retries is None or attempt <= max_retries:
+        return
+    log(f"Story {story['id']} exceeded max retries ({max_retries}). Stopping.")
+    state["status"] = "failed"
+    update_state_story(
+        state, story["id"], "failed", attempt - 1,
+        failure=f"Exceeded max retries ({max_retries})",
+        spec_key=run["spec_key"]
+    )
+    save_state(state, config)
+    write_notification(
+        config, "story_failed",
+        f"Story {story['id']} failed",
+        f"{story['id']}: {story['title']} exceeded {max_retries} retries",
+        severity="critical",
+    )
+    commit_tracking_files(config["project_dir"], run["feature_name"])
+    sys.exit(1)
+
+
+def run_parallel_specs(
+    runs: list[dict], config: dict, state: dict,
+    on_spec_start=None, on_spec_complete=None,
+) -> None:
+    """Coordinate parallel story attempts across one or more specs.
+
+    Each story is dispatched as soon as its `Depends on:` prerequisites have
+    merged, and each spec activates once the specs in its `depends_on` have
+    finished, so independent specs of an epic overlap. A retry of a story
+    whose size has `speculative_candidates` configured occupies one slot but
+    races that many candidate attempts. `on_spec_start(run)`
+    and `on_spec_complete(run)` are called on the coordinator thread when a
+    spec activates and when its last story has merged.
+    """
+    project_dir = config["project_dir"]
+    workers = get_parallel_stories(config)
+    worktree_root = get_worktree_root(project_dir, config)
+    log(f"  Parallel execution: up to {workers} stories at once (worktrees in {worktree_root})")
+    for run in runs:
+        if run["test_command"]:
+            log(f"  Detected test command: {run['test_command']}")
+            break
+
+    waiting = list(runs)
+    active: list[dict] = []
+    finished: set = set()
+    in_flight: dict[Future, dict] = {}
+    wall_base = state.get("parallel", {}).get("wall_s", 0.0)
+    run_started = time.monotonic()
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kit-story")
+
+    try:
+        while True:
+            # Pause, control and safety-net checks gate new dispatches only;
+            # attempts already in flight keep running.
+            _check_run_controls(config, state, active or waiting or runs)
+
+            # --- Activate specs whose prerequisite specs have finished ---
+            for run in list(waiting):
+                if all(dep in finished for dep in run["depends_on"]):
+                    waiting.remove(run)
+                    active.append(run)
+                    if on_spec_start:
+                        on_spec_start(run)
+
+            # --- Finish drained specs, then fill free slots with ready stories ---
+            spec_finished = False
+            for run in list(active):
+                running = {
+                    job["story"]["id"] for job in in_flight.values() if job["run"] is run
+                }
+                ready, remaining = list_ready_stories(
+                    run["spec_path"], _stories_state(run), exclude=running
+                )
+                if not remaining and not running:
+                    active.remove(run)
+                    finished.add(run["spec_key"])
+                    if on_spec_complete:
+                        on_spec_complete(run)
+                    spec_finished = True
+                    continue
+                if remaining and not ready and not running:
+                    log(f"  WARNING: no story in {run['spec_key'] or 'spec'} has its dependencies met — falling back to file order")
+                    ready = remaining[:1]
+                for story in ready:
+                    if len(in_flight) >= workers:
+                        break
+                    attempt = _story_state(state, story["id"], run["spec_key"]).get("attempts", 0) + 1
+                    _exit_if_retries_exhausted(story, attempt, run)
+                    candidates = get_speculative_candidates(config, run["spec_size"]) if attempt > 1 else 1
+                    if candidates > 1:
+                        log(f"  Racing {candidates} candidates for retry of size-{run['spec_size']} story {story['id']}")
+                        race_cancel = threading.Event()
+                        jobs = [
+                            _start_attempt(story, attempt, run, worktree_root, race_cancel, candidate=k)
+                            for k in range(1, candidates + 1)
+                        ]
+                        job = dict(jobs[0], candidates=jobs)
+                        in_flight[pool.submit(_run_candidate_sessions, jobs, config)] = job
+                        continue
+                    # Own cancel event, so a supervisor skip interrupts only this story
+                    job = _start_attempt(story, attempt, run, worktree_root, threading.Event())
+                    in_flight[pool.submit(_run_attempt_sessions, job, config)] = job
+            if spec_finished:
+                continue  # Dependent specs may now be able to start
+
+            _update_parallel_stats(
+                state, workers, wall_base, run_started,
+                sorted(job["story"]["id"] for job in in_flight.values()),
+            )
+            save_state(state, config)
+            if not in_flight:
+                if not waiting:
+                    return
+                # Nothing running and nothing activatable — a prerequisite
+                # spec is not part of this run. Start the next one anyway
+                # rather than idling forever.
+                run = waiting[0]
+                log(f"  WARNING: {run['spec_key']} waits on specs that never finished — starting it anyway")
+                run["depends_on"] = []
+                continue
+
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in done:
+                job = in_flight.pop(future)
+                jobs = job.get("candidates", [job])
+                try:
+                    outcomes = future.result() if "candidates" in job else [future.result()]
+                except Exception as e:  # worker crashed outside a session
+                    outcomes = [{
+                        "impl_output": f"SESSION_ERROR: parallel worker crashed: {e}",
+                        "verify_output": None,
+                        "elapsed_s": 0.0,
+                        "finished_at": time.monotonic(),
+                    } for _ in jobs]
+                _update_parallel_stats(
+                    state, workers, wall_base, run_started,
+                    sorted(j["story"]["id"] for j in in_flight.values()),
+                    busy_s=sum(o.get("elapsed_s", 0.0) for o in outcomes), attempts=len(jobs),
+                )
+                if "candidates" in job:
+                    _handle_candidate_outcomes(jobs, outcomes)
+                else:
+                    _handle_attempt_outcome(job, outcomes[0])
+    finally:
+        # Reached with attempts still in flight only on sys.exit / exceptions:
+        # stop the sessions so worker threads return, then drop their worktrees.
+        if in_flight:
+            for job in in_flight.values():
+                job["cancel"].set()
+            killed = terminate_active_sessions()
+            if killed:
+                log(f"  Stopped {killed} in-flight session(s)")
+        pool.shutdown(wait=True)
+        for job in in_flight.values():
+            for candidate in job.get("candidates", [job]):
+                remove_attempt_worktree(project_dir, candidate["work_dir"])
+                delete_attempt_branch(project_dir, config["branch_name"], candidate["attempt_branch"])
+        clean_result_files(project_dir)
+
+
+def execute_spec_stories_parallel(
+    spec_path: str, feature_name: str, config: dict, state: dict,
+    spec_key: str | None = None
+) -> dict:
+    """Execute all stories in a feature spec with up to N concurrent attempts.
+
+    Same contract as `execute_spec_stories`. N comes from
+    `parallel_stories` in `.execution-config.json`. Stories are dispatched
+    in spec order as their dependencies merge; each attempt runs in its own
+    worktree, and verified attempts merge into the feature branch one at a
+    time. A story whose changes conflict with a sibling merged first is
+    retried on a fresh worktree cut from the updated feature branch.
+    """
+    run = prepare_spec_run(spec_path, feature_name, config, state, spec_key)
+    run_parallel_specs([run], config, state)
+    return state
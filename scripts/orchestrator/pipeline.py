@@ -0,0 +1,197 @@
+"""Part of the KitTools orchestrator package (split from the monolithic
+execute_orchestrator.py during the 2.4.0 refactor). See the package-level
+__init__ for the full public API.
+
+Pipelined verification for one-story-at-a-time runs: while story N's attempt
+is being verified, story N+1 is implemented in a second worktree cut from
+N's attempt head. If N does not merge, N+1 is rebased onto the feature
+branch — or discarded without spending a retry when the rebase conflicts.
+"""
+from __future__ import annotations
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from .executor import _collect_attempt_changes
+from .git_ops import (
+    delete_attempt_branch,
+    get_head_commit,
+    get_worktree_root,
+    rebase_attempt_worktree,
+    remove_attempt_worktree,
+)
+from .parallel import (
+    _check_run_controls,
+    _exit_if_retries_exhausted,
+    _handle_attempt_outcome,
+    _run_implementation,
+    _run_verification,
+    _start_attempt,
+    _stories_state,
+    _story_state,
+    _update_parallel_stats,
+    prepare_spec_run,
+)
+from .sessions import clean_result_files, is_session_error, terminate_active_sessions
+from .specs import list_ready_stories
+from .state import save_state
+from .utils import log
+
+
+def _discard_attempt(job: dict, snapshot: dict | None) -> None:
+    """Drop an attempt that never reached verification, restoring its story state.
+
+    The attempt does not count against `max_retries`: it was built on a
+    predecessor that failed, not judged on its own merits.
+    """
+    run = job["run"]
+    config, state = run["config"], run["state"]
+    project_dir = config["project_dir"]
+    remove_attempt_worktree(project_dir, job["work_dir"])
+    delete_attempt_branch(project_dir, config["branch_name"], job["attempt_branch"])
+    stories = _stories_state(run).setdefault("stories", {})
+    if snapshot is None:
+        stories.pop(job["story"]["id"], None)
+    else:
+        stories[job["story"]["id"]] = snapshot
+    save_state(state, config)
+
+
+def _rebase_onto_feature_branch(job: dict, outcome: dict) -> bool:
+    """Move an attempt off a predecessor attempt that did not merge.
+
+    Replays the attempt's own commits onto the feature branch and refreshes
+    the verifier context. Returns False if the rebase conflicted.
+    """
+    config = job["run"]["config"]
+    feature_branch = config["branch_name"]
+    if not rebase_attempt_worktree(job["work_dir"], feature_branch, job["base_ref"]):
+        return False
+    job["base_ref"] = get_head_commit(config["project_dir"])
+    (outcome["files_changed"], outcome["diff_stat"],
+     outcome["diff_content"]) = _collect_attempt_changes(job["work_dir"], job["base_ref"])
+    return True
+
+
+def _future_outcome(future, fallback: dict, key: str) -> dict:
+    """Return the worker's outcome, or `fallback` with a session error under `key`."""
+    try:
+        return future.result()
+    except Exception as e:  # worker crashed outside a session
+        outcome = dict(fallback)
+        outcome[key] = f"SESSION_ERROR: pipeline worker crashed: {e}"
+        outcome.setdefault("verify_output", None)
+        outcome.setdefault("elapsed_s", 0.0)
+        return outcome
+
+
+def execute_spec_stories_pipelined(
+    spec_path: str, feature_name: str, config: dict, state: dict,
+    spec_key: str | None = None
+) -> dict:
+    """Execute all stories in a feature spec, verifying each one while the next is implemented.
+
+    Same contract as `execute_spec_stories`; enabled by `pipeline_verification`
+    in `.execution-config.json`. Merges still happen one at a time in spec
+    order, so at most two sessions run at once.
+    """
+    project_dir = config["project_dir"]
+    feature_branch = config["branch_name"]
+    run = prepare_spec_run(spec_path, feature_name, config, state, spec_key)
+    worktree_root = get_worktree_root(project_dir, config)
+    log(f"  Pipelined verification: worktrees in {worktree_root}")
+    if run["test_command"]:
+        log(f"  Detected test command: {run['test_command']}")
+
+    verifying: tuple[dict, dict] | None = None  # implemented, awaiting verification
+    live: list[dict] = []  # jobs whose worktree still exists
+    wall_base = state.get("parallel", {}).get("wall_s", 0.0)
+    run_started = time.monotonic()
+    pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="kit-pipeline")
+
+    try:
+        while True:
+            _check_run_controls(config, state, [run])
+
+            busy = {verifying[0]["story"]["id"]} if verifying else set()
+            ready, remaining = list_ready_stories(spec_path, _stories_state(run), exclude=busy)
+            if not remaining and not verifying:
+                return state
+            if remaining and not ready and not verifying:
+                log(f"  WARNING: no story in {spec_key or 'spec'} has its dependencies met — falling back to file order")
+                ready = remaining[:1]
+
+            # Start the next implementation on top of the attempt under review
+            job = snapshot = None
+            if ready:
+                story = ready[0]
+                current = _story_state(state, story["id"], spec_key)
+                attempt = current.get("attempts", 0) + 1
+                _exit_if_retries_exhausted(story, attempt, run)
+                snapshot = copy.deepcopy(current) if current else None
+                base_ref = verifying[0]["attempt_branch"] if verifying else None
+                job = _start_attempt(story, attempt, run, worktree_root, threading.Event(), base_ref=base_ref)
+                live.append(job)
+
+            impl_future = pool.submit(_run_implementation, job, config) if job else None
+            verify_future = (
+                pool.submit(_run_verification, verifying[0], config, verifying[1])
+                if verifying else None
+            )
+            _update_parallel_stats(
+                state, 2, wall_base, run_started,
+                [j["story"]["id"] for j in live],
+            )
+            save_state(state, config)
+            wait([f for f in (impl_future, verify_future) if f])
+
+            # Settle the verified attempt first — it decides what the next
+            # attempt's branch is based on.
+            predecessor_merged = True
+            if verifying:
+                prev_job, prev_outcome = verifying
+                verifying = None
+                prev_outcome = _future_outcome(verify_future, prev_outcome, "verify_output")
+                live.remove(prev_job)
+                _update_parallel_stats(
+                    state, 2, wall_base, run_started, [j["story"]["id"] for j in live],
+                    busy_s=prev_outcome.get("elapsed_s", 0.0), attempts=1,
+                )
+                _handle_attempt_outcome(prev_job, prev_outcome)
+                prev_status = _story_state(state, prev_job["story"]["id"], spec_key).get("status")
+                predecessor_merged = prev_status == "completed"
+                if not predecessor_merged and job:
+                    log(f"  {prev_job['story']['id']} did not merge — moving {job['story']['id']} onto {feature_branch}")
+
+            if not job:
+                continue
+            outcome = _future_outcome(impl_future, {"impl_result": None}, "impl_output")
+            if is_session_error(outcome["impl_output"]):
+                live.remove(job)
+                _update_parallel_stats(
+                    state, 2, wall_base, run_started, [j["story"]["id"] for j in live],
+                    busy_s=outcome.get("elapsed_s", 0.0), attempts=1,
+                )
+                _handle_attempt_outcome(job, outcome)
+                continue
+            if not predecessor_merged and not _rebase_onto_feature_branch(job, outcome):
+                log(f"  Rebase of {job['story']['id']} conflicted — discarding attempt {job['attempt']} (not counted)")
+                live.remove(job)
+                _discard_attempt(job, snapshot)
+                continue
+            verifying = (job, outcome)
+    finally:
+        # Reached with live attempts only on sys.exit / exceptions: stop the
+        # sessions so worker threads return, then drop their worktrees.
+        if live:
+            for job in live:
+                job["cancel"].set()
+            killed = terminate_active_sessions()
+            if killed:
+                log(f"  Stopped {killed} in-flight session(s)")
+        pool.shutdown(wait=True)
+        for job in live:
+            remove_attempt_worktree(project_dir, job["work_dir"])
+            delete_attempt_branch(project_dir, feature_branch, job["attempt_branch"])
+        clean_result_files(project_dir)
@@ -0,0 +1,157 @@
+"""Part of the KitTools orchestrator package (split from the monolithic
+execute_orchestrator.py during the 2.4.0 refactor). See the package-level
+__init__ for the full public API.
+
+Process-tree sampling from `/proc` (Linux). Reading `/proc/<pid>/stat` is a
+few microseconds per process, so health snapshots can list every
+descendant of the orchestrator — claude sessions and whatever they spawn
+(pytest, node, language servers) — with CPU time and RSS, without forking
+`pgrep` or `ps`. Children are found through `/proc/<pid>/task/*/children`
+when the kernel provides it, otherwise through one scan of `/proc/*/stat`.
+`sample_process_tree` rolls a session's tree up into the totals the
+session watcher tracks peaks of.
+"""
+from __future__ import annotations
+import os
+
+PROC_ROOT = "/proc"
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def proc_available() -> bool:
+    """True if this system exposes a Linux-style /proc."""
+    return os.path.exists(os.path.join(PROC_ROOT, "self", "stat"))
+
+
+def read_process(pid: int) -> dict | None:
+    """Sample one process from /proc/<pid>/stat, or None if it is gone.
+
+    Returns `pid`, `ppid`, `pgid`, `name`, `state`, `cpu_s` (user + system
+    CPU seconds), `children_cpu_s` (CPU seconds of children it has reaped)
+    and `rss_mb`.
+    """
+    try:
+        with open(os.path.join(PROC_ROOT, str(pid), "stat"), "rb") as f:
+            raw = f.read().decode("utf-8", errors="replace")
+    except OSError:
+        return None
+    # comm may contain spaces and parentheses; it ends at the last ')'
+    name_start, name_end = raw.find("("), raw.rfind(")")
+    fields = raw[name_end + 2:].split()
+    try:
+        return {
+            "pid": pid,
+            "ppid": int(fields[1]),
+            "pgid": int(fields[2]),
+            "name": raw[name_start + 1:name_end],
+            "state": fields[0],
+            "cpu_s": round((int(fields[11]) + int(fields[12])) / _CLK_TCK, 2),
+            "children_cpu_s": round((int(fields[13]) + int(fields[14])) / _CLK_TCK, 2),
+            "rss_mb": round(int(fields[21]) * _PAGE_SIZE / (1024 * 1024), 1),
+        }
+    except (IndexError, ValueError):
+        return None
+
+
+def count_open_fds(pid: int) -> int | None:
+    """Number of open file descriptors of `pid`, or None if unreadable."""
+    try:
+        return len(os.listdir(os.path.join(PROC_ROOT, str(pid), "fd")))
+    except OSError:
+        return None
+
+
+def _children_from_task_files(pid: int) -> list[int] | None:
+    """Children listed in /proc/<pid>/task/*/children, or None if unsupported."""
+    task_dir = os.path.join(PROC_ROOT, str(pid), "task")
+    try:
+        tids = os.listdir(task_dir)
+    except OSError:
+        return []
+    children: list[int] = []
+    for tid in tids:
+        try:
+            with open(os.path.join(task_dir, tid, "children"), "rb") as f:
+                children.extend(int(c) for c in f.read().split())
+        except FileNotFoundError:
+            return None  # Kernel built without CONFIG_PROC_CHILDREN
+        except (OSError, ValueError):
+            continue
+    return children
+
+
+def _scan_processes() -> dict[int, dict]:
+    """Sample every process on the system, keyed by pid."""
+    processes = {}
+    try:
+        entries = os.listdir(PROC_ROOT)
+    except OSError:
+        return processes
+    for entry in entries:
+        if entry.isdigit():
+            info = read_process(int(entry))
+            if info:
+                processes[info["pid"]] = info
+    return processes
+
+
+def process_tree(root_pid: int, include_root: bool = False) -> list[dict]:
+    """Sample every live descendant of `root_pid` (breadth-first order).
+
+    Each entry is a `read_process` dict plus `depth` (1 = direct child;
+    the root itself is depth 0 when `include_root`). Returns [] when /proc
+    is unavailable.
+    """
+    if not proc_available():
+        return []
+    tree: list[dict] = []
+    root = read_process(root_pid) if include_root else None
+    if root:
+        tree.append(dict(root, depth=0))
+    if _children_from_task_files(root_pid) is None:
+        processes = _scan_processes()
+        by_parent: dict[int, list[int]] = {}
+        for info in processes.values():
+            by_parent.setdefault(info["ppid"], []).append(info["pid"])
+        frontier = [(root_pid, 0)]
+        while frontier:
+            pid, depth = frontier.pop(0)
+            for child in sorted(by_parent.get(pid, [])):
+                tree.append(dict(processes[child], depth=depth + 1))
+                frontier.append((child, depth + 1))
+        return tree
+    frontier = [(root_pid, 0)]
+    seen = {root_pid}
+    while frontier:
+        pid, depth = frontier.pop(0)
+        for child in sorted(_children_from_task_files(pid) or []):
+            if child in seen:
+                continue
+            seen.add(child)
+            info = read_process(child)
+            if info:
+                tree.append(dict(info, depth=depth + 1))
+                frontier.append((child, depth + 1))
+    return tree
+
+
+def sample_process_tree(root_pid: int) -> dict | None:
+    """Resource totals for `root_pid` and all its descendants, or None without /proc.
+
+    Returns `processes`, `rss_mb` (sum of resident sets), `fds` (open file
+    descriptors) and `cpu_s`: CPU seconds of every live process plus what
+    each has collected from reaped children, so work done by short-lived
+    test runners is still counted once they exit.
+    """
+    if not proc_available():
+        return None
+    tree = process_tree(root_pid, include_root=True)
+    totals = {"processes": len(tree), "rss_mb": 0.0, "cpu_s": 0.0, "fds": 0}
+    for info in tree:
+        totals["rss_mb"] += info["rss_mb"]
+        totals["cpu_s"] += info["cpu_s"] + info["children_cpu_s"]
+        totals["fds"] += count_open_fds(info["pid"]) or 0
+    totals["rss_mb"] = round(totals["rss_mb"], 1)
+    totals["cpu_s"] = round(totals["cpu_s"], 2)
+    return totals
@@ -7,6 +7,8 @@ import os
 import re
 
 from .sessions import IMPL_RESULT_FILE, VERIFY_RESULT_FILE
+from .state import load_attempt_diff
+from .test_impact import get_test_impact_enabled
 from .tests_metrics import detect_related_tests
 from .utils import (
     _assert_prompt_fully_substituted,
@@ -335,7 +337,7 @@ def inject_persistent_learnings(project_dir: str, prior_learnings: list[str]) ->
 def build_implementation_prompt(
     story: dict, config: dict, state: dict, attempt: int,
     feature_name: str | None = None, spec_path: str | None = None,
-    spec_key: str | None = None
+    spec_key: str | None = None, work_dir: str | None = None
 ) -> str:
     """Interpolate the story-implementer template with context.
 
@@ -343,6 +345,8 @@ def build_implementation_prompt(
         feature_name: Override for config["feature_name"] (used in epic mode).
         spec_path: Override for config["spec_path"] (used in epic mode).
         spec_key: If set, look up story state in state["specs"][spec_key] (epic mode).
+        work_dir: Checkout the session runs in (an attempt worktree in
+            parallel mode). Defaults to config["project_dir"].
     """
     template = strip_frontmatter(config["implementer_template"])
     context = config.get("project_context", {})
@@ -366,7 +370,7 @@ def build_implementation_prompt(
         else:
             stories_dict = state.get("stories", {})
         story_state = stories_dict.get(story["id"], {})
-        previous_diff = story_state.get("last_attempt_diff", "")
+        previous_diff = load_attempt_diff(story_state, config["project_dir"])
     previous_diff_text = previous_diff if previous_diff else "No previous attempt."
 
     # Interpolate template
@@ -390,7 +394,7 @@ def build_implementation_prompt(
     prompt = prompt.replace("{{RETRY_CONTEXT}}", retry_context or "First attempt — no retry context.")
     prompt = prompt.replace("{{PREVIOUS_ATTEMPT_DIFF}}", previous_diff_text)
     # Result file path for the agent to write to
-    result_path = os.path.join(config["project_dir"], IMPL_RESULT_FILE)
+    result_path = os.path.join(work_dir or config["project_dir"], IMPL_RESULT_FILE)
     prompt = prompt.replace("{{RESULT_FILE_PATH}}", result_path)
 
     # Add autonomous-mode instructions
@@ -407,7 +411,7 @@ def build_implementation_prompt(
 def build_verification_prompt(
     story: dict, config: dict, files_changed_from_git: str,
     diff_stat: str = "", test_command: str | None = None, spec_path: str = "",
-    diff_content: str = ""
+    diff_content: str = "", work_dir: str | None = None
 ) -> str:
     """Interpolate the story-verifier template with git-sourced context.
 
@@ -418,6 +422,8 @@ def build_verification_prompt(
         test_command: Auto-detected test command (fail-fast), or None.
         spec_path: Path to the feature spec file for cross-reference.
         diff_content: Inline diff content (truncated if over DIFF_CONTENT_MAX).
+        work_dir: Checkout the session runs in (an attempt worktree in
+            parallel mode). Defaults to config["project_dir"].
     """
     template = strip_frontmatter(config["verifier_template"])
     context = config.get("project_context", {})
@@ -425,7 +431,8 @@ def build_verification_prompt(
     # Derive targeted test commands from changed files (T0=explicit, T1=heuristic)
     changed_files = [f.strip() for f in files_changed_from_git.split("\n") if f.strip()]
     test_tiers = detect_related_tests(
-        changed_files, config["project_dir"], test_command
+        changed_files, work_dir or config["project_dir"], test_command,
+        impact_dir=config["project_dir"] if get_test_impact_enabled(config) else None,
     )
     t0_cmd = test_tiers["t0"]
     t1_cmd = test_tiers["t1"]
@@ -496,7 +503,7 @@ def build_verification_prompt(
     prompt = prompt.replace("{{SPEC_PATH}}", spec_path or "Not available")
     prompt = prompt.replace("{{TEST_COMMAND}}", test_section)
     # Result file path for the agent to write to
-    result_path = os.path.join(config["project_dir"], VERIFY_RESULT_FILE)
+    result_path = os.path.join(work_dir or config["project_dir"], VERIFY_RESULT_FILE)
     prompt = prompt.replace("{{RESULT_FILE_PATH}}", result_path)
 
     _assert_prompt_fully_substituted(prompt, "build_verification_prompt")
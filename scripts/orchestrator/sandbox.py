@@ -0,0 +1,438 @@
+"""Part of the KitTools orchestrator package (split from the monolithic
+execute_orchestrator.py during the 2.4.0 refactor). See the package-level
+__init__ for the full public API.
+
+Per-subprocess resource sandboxes (Linux cgroup v2). With `session_sandbox`
+configured, every claude session and regression pytest run gets its own
+cgroup under `kit-tools-<orchestrator pid>/`, with an optional CPU quota
+(`cpu.max`), memory ceiling (`memory.max`) and process cap (`pids.max`).
+Killing writes `cgroup.kill`, which also reaches processes that left the
+process group with `setsid`.
+
+Sandboxes are only created where the orchestrator already has a delegated
+cgroup: `session_sandbox.cgroup_parent`, or its own cgroup when systemd
+marked it delegated (`Delegate=yes`) or `/proc/self/cgroup` shows it at the
+root of its cgroup namespace. Nothing outside `kit-tools-<pid>/` is
+modified and the orchestrator never moves itself.
+
+Limits need their controller enabled in the parent's
+`cgroup.subtree_control`. The orchestrator's own cgroup holds its process,
+so the no-internal-process rule keeps controllers out of it: CPU quota and
+process caps therefore require `cgroup_parent`, and `check_sandbox_limits`
+rejects them at startup otherwise. The memory ceiling falls back to
+`RLIMIT_DATA` per process (`prlimit`).
+"""
+from __future__ import annotations
+import atexit
+import os
+import re
+import signal
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .utils import log
+
+CGROUP_PROC_MOUNTS = "/proc/self/mounts"
+CGROUP_PROC_SELF = "/proc/self/cgroup"
+SANDBOX_CONTROLLERS = ("cpu", "memory", "pids")
+CPU_MAX_PERIOD_US = 100_000  # cpu.max period; the quota is cpu_quota × this
+SANDBOX_KILL_GRACE = 0.5  # seconds between SIGTERM and cgroup.kill
+SANDBOX_RELEASE_TIMEOUT = 5  # seconds to wait for a killed cgroup to empty
+
+# session_sandbox limit -> (controller, interface file, value formatter)
+_LIMIT_FILES = {
+    "cpu_quota": ("cpu", "cpu.max", lambda v: f"{max(1000, int(v * CPU_MAX_PERIOD_US))} {CPU_MAX_PERIOD_US}"),
+    "memory_max_mb": ("memory", "memory.max", lambda v: str(v * 1024 * 1024)),
+    "pids_max": ("pids", "pids.max", str),
+}
+
+# The sandbox root, set up on first use: {"path", "controllers"}, or
+# {"path": None, "reason"} when cgroup sandboxes are unavailable.
+_BASE: dict = {}
+_BASE_LOCK = threading.Lock()
+_SANDBOX_SEQ = 0
+_WARNED: set[str] = set()
+
+
+def _warn_once(message: str) -> None:
+    if message not in _WARNED:
+        _WARNED.add(message)
+        log(f"  WARNING: {message}")
+
+
+def _read(path: str) -> str:
+    with open(path, "r") as f:
+        return f.read()
+
+
+def _write(path: str, text: str) -> None:
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def _cgroup2_mount() -> str | None:
+    """Mount point of the cgroup v2 hierarchy (unified or hybrid), or None."""
+    try:
+        with open(CGROUP_PROC_MOUNTS, "r") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) > 2 and fields[2] == "cgroup2":
+                    return fields[1]
+    except OSError:
+        pass
+    return None
+
+
+def _own_cgroup_relpath() -> str | None:
+    """The orchestrator's cgroup v2 path as seen from its cgroup namespace, or None."""
+    try:
+        with open(CGROUP_PROC_SELF, "r") as f:
+            for line in f:
+                if line.startswith("0::"):
+                    return line[3:].strip()
+    except OSError:
+        pass
+    return None
+
+
+def _own_cgroup() -> str | None:
+    """Absolute path of the orchestrator's cgroup v2 directory, or None."""
+    mount = _cgroup2_mount()
+    relpath = _own_cgroup_relpath()
+    if mount is None or relpath is None:
+        return None
+    return os.path.join(mount, relpath.lstrip("/"))
+
+
+def _is_delegated(cgroup: str) -> bool:
+    """True if the orchestrator may create child cgroups under its own `cgroup`.
+
+    That is the case at the root of its cgroup namespace (`0::/` in
+    `/proc/self/cgroup`, e.g. a container) and for cgroups systemd delegated
+    (`Delegate=yes` sets a `trusted.delegate` or `user.delegate` xattr).
+    """
+    if _own_cgroup_relpath() == "/":
+        return True
+    for attr in ("trusted.delegate", "user.delegate"):
+        try:
+            if os.getxattr(cgroup, attr).strip() == b"1":
+                return True
+        except (OSError, AttributeError):
+            continue
+    return False
+
+
+def _remove_stale_bases(parent: str) -> None:
+    """Remove empty sandbox roots left behind by orchestrators that died."""
+    try:
+        entries = os.listdir(parent)
+    except OSError:
+        return
+    for entry in entries:
+        match = re.fullmatch(r"kit-tools-(\d+)", entry)
+        if not match or os.path.exists(f"/proc/{match.group(1)}"):
+            continue  # Not ours, or its orchestrator is still running
+        stale = os.path.join(parent, entry)
+        for child in os.listdir(stale) if os.path.isdir(stale) else []:
+            try:
+                os.rmdir(os.path.join(stale, child))  # Fails (kept) while still populated
+            except OSError:
+                pass
+        try:
+            os.rmdir(stale)
+        except OSError:
+            pass
+
+
+def _setup_base(cgroup_parent: str | None) -> dict:
+    """Create the sandbox root under a delegated cgroup and enable its controllers."""
+    if cgroup_parent:
+        parent = os.path.abspath(cgroup_parent)
+        if not os.path.exists(os.path.join(parent, "cgroup.procs")):
+            return {"path": None, "reason": f"cgroup_parent {parent} is not a cgroup v2 directory"}
+    else:
+        parent = _own_cgroup()
+        if parent is None or not os.path.isdir(parent):
+            return {"path": None, "reason": "no cgroup v2 hierarchy"}
+        if not _is_delegated(parent):
+            return {
+                "path": None,
+                "reason": f"{parent} is not delegated; run under `systemd-run --scope -p Delegate=yes` "
+                          f"or set session_sandbox.cgroup_parent",
+            }
+    _remove_stale_bases(parent)
+    base = os.path.join(parent, f"kit-tools-{os.getpid()}")
+    try:
+        os.mkdir(base)
+    except OSError as e:
+        return {"path": None, "reason": f"cannot create {base}: {e.strerror}"}
+    state = {"path": base, "controllers": set()}
+    try:
+        available = set(_read(os.path.join(base, "cgroup.controllers")).split())
+    except OSError:
+        available = set()
+    for controller in SANDBOX_CONTROLLERS:
+        if controller not in available:
+            continue
+        try:
+            _write(os.path.join(base, "cgroup.subtree_control"), f"+{controller}")
+            state["controllers"].add(controller)
+        except OSError as e:
+            _warn_once(f"could not enable the {controller} controller for session sandboxes: {e.strerror}")
+    atexit.register(_teardown_base)
+    return state
+
+
+def _sandbox_base(cgroup_parent: str | None) -> dict:
+    with _BASE_LOCK:
+        if not _BASE:
+            _BASE.update(_setup_base(cgroup_parent))
+        return _BASE
+
+
+def _teardown_base() -> None:
+    """Remove leftover sandboxes and the sandbox root."""
+    with _BASE_LOCK:
+        base = _BASE.get("path")
+        if not base:
+            return
+        try:
+            children = [e for e in os.listdir(base) if os.path.isdir(os.path.join(base, e))]
+        except OSError:
+            children = []
+        for child in children:
+            _release_cgroup(os.path.join(base, child))
+        try:
+            os.rmdir(base)
+        except OSError:
+            pass
+        _BASE.clear()
+        _BASE.update(path=None, reason="torn down")
+
+
+def _rlimit_fallback_available() -> bool:
+    return hasattr(resource, "prlimit") and hasattr(resource, "RLIMIT_DATA")
+
+
+def _controller_list(keys: list[str]) -> str:
+    names = [_LIMIT_FILES[k][0] for k in keys]
+    return f"the {'/'.join(names)} controller{'s' if len(names) > 1 else ''}"
+
+
+def check_sandbox_limits(limits: dict | None) -> str | None:
+    """Return why configured `session_sandbox` limits cannot be enforced, or None.
+
+    Called once at startup so an unenforceable limit stops the run instead
+    of being logged and ignored: `cpu_quota` and `pids_max` need
+    `cgroup_parent` with their controllers enabled, `memory_max_mb` needs
+    the memory controller there or the `RLIMIT_DATA` fallback.
+    """
+    if not limits:
+        return None
+    wanted = [k for k in _LIMIT_FILES if limits.get(k) is not None]
+    if not wanted:
+        return None
+    needs_cgroup = [k for k in wanted if k != "memory_max_mb" or not _rlimit_fallback_available()]
+    if needs_cgroup and not limits.get("cgroup_parent"):
+        return (
+            f"session_sandbox {', '.join(needs_cgroup)} requires session_sandbox.cgroup_parent "
+            f"(a delegated cgroup with {_controller_list(needs_cgroup)} enabled in its cgroup.subtree_control)"
+        )
+    base = _sandbox_base(limits.get("cgroup_parent"))
+    if needs_cgroup and not base["path"]:
+        return f"session_sandbox {', '.join(needs_cgroup)} cannot be enforced: {base.get('reason')}"
+    missing = [k for k in needs_cgroup if _LIMIT_FILES[k][0] not in base["controllers"]]
+    if missing:
+        return (
+            f"session_sandbox {', '.join(missing)} cannot be enforced: enable "
+            f"{_controller_list(missing)} in {os.path.dirname(base['path'])}/cgroup.subtree_control"
+        )
+    return None
+
+
+def create_sandbox(name: str, limits: dict) -> dict:
+    """Prepare a sandbox for one subprocess.
+
+    `limits` is `get_session_sandbox(config)`: `cpu_quota` (CPUs),
+    `memory_max_mb` and `pids_max`, each None for no limit, and
+    `cgroup_parent` (None to use the orchestrator's own cgroup when it is
+    delegated). Returns a dict with `cgroup` (path, or None without a
+    delegated cgroup) and `rlimits` (fallback `{resource: bytes}` applied
+    with `prlimit`). Pass it to `enter_sandbox`
+    right after spawning and to `release_sandbox` once the subprocess is gone.
+    """
+    global _SANDBOX_SEQ
+    sandbox: dict = {"name": name, "cgroup": None, "rlimits": {}}
+    base = _sandbox_base(limits.get("cgroup_parent"))
+    unapplied = {k for k in _LIMIT_FILES if limits.get(k) is not None}
+    if base["path"]:
+        with _BASE_LOCK:
+            _SANDBOX_SEQ += 1
+            seq = _SANDBOX_SEQ
+        path = os.path.join(base["path"], f"{re.sub(r'[^A-Za-z0-9_.-]+', '-', name)}-{seq}")
+        try:
+            os.mkdir(path)
+            sandbox["cgroup"] = path
+        except OSError as e:
+            _warn_once(f"could not create cgroup sandbox {path}: {e.strerror}")
+        if sandbox["cgroup"]:
+            for key in sorted(unapplied):
+                controller, filename, fmt = _LIMIT_FILES[key]
+                if controller not in base["controllers"]:
+                    continue
+                try:
+                    _write(os.path.join(path, filename), fmt(limits[key]))
+                    unapplied.discard(key)
+                except OSError as e:
+                    _warn_once(f"could not set {filename} on session sandboxes: {e.strerror}")
+    else:
+        _warn_once(f"cgroup sandboxes unavailable ({base.get('reason')}) — using setrlimit fallback")
+    if "memory_max_mb" in unapplied and _rlimit_fallback_available():
+        sandbox["rlimits"][resource.RLIMIT_DATA] = limits["memory_max_mb"] * 1024 * 1024
+        unapplied.discard("memory_max_mb")
+    if unapplied:
+        _warn_once(
+            f"session_sandbox {', '.join(sorted(unapplied))} not enforced — "
+            f"requires session_sandbox.cgroup_parent with the {'/'.join(SANDBOX_CONTROLLERS)} controllers"
+        )
+    return sandbox
+
+
+def enter_sandbox(sandbox: dict | None, pid: int) -> None:
+    """Move a just-spawned subprocess into its sandbox (called by the parent).
+
+    Done from the parent right after spawn rather than in a `preexec_fn`,
+    which is unsafe in the threaded orchestrator. The child has only just
+    exec'd, so in practice it has not forked yet; anything it did spawn
+    before the move stays in its process group, which `kill_sandbox`
+    signals as well.
+    """
+    if not sandbox:
+        return
+    if sandbox["cgroup"]:
+        try:
+            _write(os.path.join(sandbox["cgroup"], "cgroup.procs"), str(pid))
+        except OSError as e:
+            _warn_once(f"could not move subprocesses into their cgroup sandbox: {e.strerror}")
+    for res, limit in sandbox["rlimits"].items():
+        try:
+            _, hard = resource.prlimit(pid, res)
+            if hard != resource.RLIM_INFINITY:
+                limit = min(limit, hard)
+            resource.prlimit(pid, res, (limit, hard))
+        except (OSError, ValueError) as e:
+            _warn_once(f"could not apply the setrlimit fallback to subprocesses: {e}")
+
+
+def _cgroup_pids(path: str) -> list[int]:
+    try:
+        return [int(p) for p in _read(os.path.join(path, "cgroup.procs")).split()]
+    except (OSError, ValueError):
+        return []
+
+
+def _signal_cgroup(path: str, sig: int) -> None:
+    for pid in _cgroup_pids(path):
+        try:
+            os.kill(pid, sig)
+        except OSError:
+            pass
+
+
+def _kill_cgroup(path: str) -> None:
+    """SIGKILL everything in a cgroup (`cgroup.kill`, or per-pid on kernels before 5.14)."""
+    try:
+        _write(os.path.join(path, "cgroup.kill"), "1")
+    except OSError:
+        _signal_cgroup(path, signal.SIGKILL)
+
+
+def kill_sandbox(sandbox: dict, pgid: int) -> None:
+    """Kill a sandboxed subprocess tree: SIGTERM, grace period, then `cgroup.kill`.
+
+    The process group is signalled too, in case the child could not join
+    its cgroup (or the sandbox has no cgroup, or was already released).
+    """
+    path = sandbox.get("cgroup")
+    alive = bool(path and _cgroup_pids(path))
+    if alive:
+        _signal_cgroup(path, signal.SIGTERM)
+    try:
+        os.killpg(pgid, signal.SIGTERM)
+        alive = True
+    except OSError:
+        pass
+    if not alive:
+        return  # Already gone
+    time.sleep(SANDBOX_KILL_GRACE)
+    if path:
+        _kill_cgroup(path)
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except OSError:
+        pass
+
+
+def _cgroup_stats(path: str) -> dict:
+    """Peak memory, peak pids, CPU time and OOM kills recorded by the kernel."""
+    stats: dict = {}
+    try:
+        stats["memory_peak_mb"] = round(int(_read(os.path.join(path, "memory.peak"))) / (1024 * 1024), 1)
+    except (OSError, ValueError):
+        pass
+    try:
+        stats["pids_peak"] = int(_read(os.path.join(path, "pids.peak")))
+    except (OSError, ValueError):
+        pass
+    try:
+        for line in _read(os.path.join(path, "cpu.stat")).splitlines():
+            key, _, value = line.partition(" ")
+            if key == "usage_usec":
+                stats["cpu_s"] = round(int(value) / 1_000_000, 2)
+    except (OSError, ValueError):
+        pass
+    try:
+        for line in _read(os.path.join(path, "memory.events")).splitlines():
+            key, _, value = line.partition(" ")
+            if key == "oom_kill":
+                stats["oom_kills"] = int(value)
+    except (OSError, ValueError):
+        pass
+    return stats
+
+
+def _release_cgroup(path: str) -> dict:
+    stats = _cgroup_stats(path)
+    if _cgroup_pids(path):
+        _kill_cgroup(path)
+    deadline = time.monotonic() + SANDBOX_RELEASE_TIMEOUT
+    while True:
+        try:
+            os.rmdir(path)
+            break
+        except FileNotFoundError:
+            break
+        except OSError:  # EBUSY until the killed processes are reaped
+            if time.monotonic() >= deadline:
+                log(f"  WARNING: sandbox {path} still has processes — leaving it behind")
+                break
+            time.sleep(0.05)
+    return stats
+
+
+def release_sandbox(sandbox: dict | None) -> dict:
+    """Kill whatever is left in a sandbox and remove its cgroup.
+
+    Returns the kernel's accounting for it (`memory_peak_mb`, `pids_peak`,
+    `cpu_s`, `oom_kills`, where the controllers provide them), or {}.
+    """
+    if not sandbox or not sandbox["cgroup"]:
+        return {}
+    stats = _release_cgroup(sandbox["cgroup"])
+    sandbox["cgroup"] = None
+    return stats
@@ -0,0 +1,124 @@
+"""Part of the KitTools orchestrator package (split from the monolithic
+execute_orchestrator.py during the 2.4.0 refactor). See the package-level
+__init__ for the full public API.
+
+Dependency DAG helpers for story and spec scheduling. Pure functions over
+`{node: [prerequisite, ...]}` dicts — no file or git access — so both the
+serial and parallel executors (and `run_epic`) can share them.
+"""
+from __future__ import annotations
+import re
+
+from .utils import log
+
+# `Depends on: US-001, US-004` (optionally bold) inside a story section.
+STORY_DEPENDS_PATTERN = re.compile(
+    r"^\s*(?:\*\*)?Depends on:?(?:\*\*)?:?\s*(.+)$", re.IGNORECASE | re.MULTILINE
+)
+_STORY_ID_PATTERN = re.compile(r"US-\d+")
+
+
+def parse_story_depends_on(story_content: str) -> list[str]:
+    """Return the story IDs listed on `Depends on:` lines in a story section."""
+    deps: list[str] = []
+    for match in STORY_DEPENDS_PATTERN.finditer(story_content):
+        for dep in _STORY_ID_PATTERN.findall(match.group(1)):
+            if dep not in deps:
+                deps.append(dep)
+    return deps
+
+
+def find_dependency_cycle(dag: dict[str, list[str]]) -> list[str]:
+    """Return the nodes of one dependency cycle, or `[]` if the DAG is acyclic."""
+    visiting: set[str] = set()
+    done: set[str] = set()
+    stack: list[str] = []
+
+    def visit(node: str) -> list[str]:
+        visiting.add(node)
+        stack.append(node)
+        for dep in dag.get(node, []):
+            if dep in visiting:
+                return stack[stack.index(dep):]
+            if dep not in done:
+                cycle = visit(dep)
+                if cycle:
+                    return cycle
+        visiting.discard(node)
+        stack.pop()
+        done.add(node)
+        return []
+
+    for node in dag:
+        if node not in done:
+            cycle = visit(node)
+            if cycle:
+                return cycle
+    return []
+
+
+def build_dag(edges: dict[str, list[str]], label: str = "story") -> dict[str, list[str]]:
+    """Normalise a prerequisite map into a schedulable DAG.
+
+    Drops prerequisites that are not nodes themselves (typos, stories that
+    were split away, specs already archived) and self-references. Cycles
+    are broken by removing the edges between cycle members, with a warning —
+    those nodes then fall back to file order instead of deadlocking the run.
+    """
+    dag = {
+        node: [d for d in deps if d in edges and d != node]
+        for node, deps in edges.items()
+    }
+    while True:
+        cycle = find_dependency_cycle(dag)
+        if not cycle:
+            return dag
+        log(f"  WARNING: {label} dependency cycle {' -> '.join(cycle + cycle[:1])} — ignoring those edges")
+        members = set(cycle)
+        for node in cycle:
+            dag[node] = [d for d in dag[node] if d not in members]
+
+
+def build_story_dag(stories: list[dict]) -> dict[str, list[str]]:
+    """Build the story DAG for one spec from each story's `depends_on` list."""
+    return build_dag({s["id"]: list(s.get("depends_on", [])) for s in stories})
+
+
+def ready_nodes(dag: dict[str, list[str]], pending: list[str], settled: set[str]) -> list[str]:
+    """Return the pending nodes (in the given order) whose prerequisites are all settled."""
+    return [n for n in pending if all(d in settled for d in dag.get(n, []))]
+
+
+def critical_path(dag: dict[str, list[str]], weights: dict[str, float] | None = None) -> list[str]:
+    """Return the heaviest prerequisite chain in the DAG (root first).
+
+    `weights` maps node → estimated cost; missing nodes weigh 1. With unit
+    weights this is the longest chain of stories that must run back to back
+    no matter how many workers are available.
+    """
+    weights = weights or {}
+    best: dict[str, tuple[float, list[str]]] = {}
+
+    def heaviest(node: str) -> tuple[float, list[str]]:
+        if node not in best:
+            cost = weights.get(node, 1.0)
+            chains = [heaviest(dep) for dep in dag.get(node, [])]
+            if chains:
+                dep_cost, dep_path = max(chains, key=lambda c: c[0])
+                best[node] = (dep_cost + cost, dep_path + [node])
+            else:
+                best[node] = (cost, [node])
+        return best[node]
+
+    path: list[str] = []
+    top = 0.0
+    for node in dag:
+        cost, chain = heaviest(node)
+        if cost > top:
+            top, path = cost, chain
+    return path
+
+
+def has_dependencies(dag: dict[str, list[str]]) -> bool:
+    """True if any node in the DAG has at least one prerequisite."""
+    return any(dag.values())
@@ -1,16 +1,27 @@
 """Part of the KitTools orchestrator package (split from the monolithic
 execute_orchestrator.py during the 2.4.0 refactor). See the package-level
-__init__ for the full public API."""
+__init__ for the full public API.
+
+Every claude session and test-runner subprocess is driven by one shared
+event loop (the session engine) on a background thread. The blocking
+wrappers submit coroutines to it, so worker threads only wait on a future;
+concurrent sessions are capped by an `asyncio.Semaphore` of
+`set_max_sessions()` slots.
+"""
 from __future__ import annotations
+import asyncio
 import json
 import os
 import re
 import signal
-import subprocess
+import threading
 import time
+from collections import deque
 
+from .procfs import sample_process_tree
+from .sandbox import create_sandbox, enter_sandbox, kill_sandbox, release_sandbox
 from .specs import parse_spec_frontmatter
-from .utils import log
+from .utils import log, now_iso
 
 SESSION_TIMEOUT = 900  # 15 minutes per claude session
 IMPL_SESSION_TIMEOUT = 900  # implementation sessions
@@ -20,6 +31,55 @@ NETWORK_MAX_RETRIES = 3
 PERMANENT_ERROR_KEYWORDS = ["context", "too long", "token limit", "input.*too.*large", "maximum.*context"]
 IMPL_RESULT_FILE = os.path.join("kit_tools", ".story-impl-result.json")
 VERIFY_RESULT_FILE = os.path.join("kit_tools", ".story-verify-result.json")
+SESSION_POLL_INTERVAL = 1  # seconds between timeout/stall checks
+SESSION_SAMPLE_INTERVAL = 2  # seconds between /proc resource samples of a session's tree
+SESSION_PROGRESS_INTERVAL = 5  # min seconds between on_progress callbacks
+SESSION_OUTPUT_MAX = 200_000  # chars of session text kept (tail)
+SESSION_STDERR_MAX = 64_000  # chars of stderr kept (tail)
+SESSION_LINE_MAX = 8 * 1024 * 1024  # bytes; longer stream-json lines are dropped
+SESSION_STOP_WAIT = 15  # seconds an interrupted caller waits for its subprocess tree to be killed
+
+# Process-group IDs of `claude -p` sessions currently running, mapped to
+# their live progress dicts. With parallel story execution several sessions
+# run at once on worker threads; the coordinator needs a way to tear all of
+# them down on abort or fatal errors, and the health snapshot reports them.
+_ACTIVE_SESSIONS: dict[int, dict] = {}
+_ACTIVE_SESSIONS_LOCK = threading.Lock()
+
+# The session engine: one event loop on a daemon thread, started on first
+# use, and the semaphore capping concurrent claude sessions on it.
+_ENGINE_LOOP: asyncio.AbstractEventLoop | None = None
+_ENGINE_LOCK = threading.Lock()
+_MAX_SESSIONS: int | None = None  # None = uncapped
+_SESSION_SLOTS: asyncio.Semaphore | None = None
+
+
+class _OutputTail:
+    """Keep only the last `limit` characters of text appended to it."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.chunks: deque[str] = deque()
+        self.size = 0
+        self.dropped = 0
+
+    def append(self, text: str) -> None:
+        self.chunks.append(text)
+        self.size += len(text)
+        while self.size > self.limit and len(self.chunks) > 1:
+            removed = self.chunks.popleft()
+            self.size -= len(removed)
+            self.dropped += len(removed)
+        if self.size > self.limit:
+            self.dropped += self.size - self.limit
+            self.chunks[0] = self.chunks[0][self.size - self.limit:]
+            self.size = self.limit
+
+    def text(self) -> str:
+        body = "".join(self.chunks)
+        if self.dropped:
+            return f"[... {self.dropped} earlier chars dropped ...]\n{body}"
+        return body
 
 
 def _is_permanent_error(stderr_text: str) -> bool:
@@ -72,84 +132,553 @@ def _kill_process_group(pgid: int) -> None:
         pass  # Terminated during grace period
 
 
-def run_claude_session(
+def _kill_session_tree(pgid: int, sandbox: dict | None = None) -> None:
+    """Kill a subprocess tree: through its cgroup sandbox when it has one
+    (which also reaches children that called `setsid`), else its process group."""
+    if sandbox:
+        kill_sandbox(sandbox, pgid)
+    else:
+        _kill_process_group(pgid)
+
+
+def terminate_active_sessions() -> int:
+    """Kill the process tree of every running claude session.
+
+    Used by the parallel executor before it exits so worker threads blocked
+    on a session return promptly instead of holding the process open
+    for the rest of their session timeout. Returns the number of sessions
+    signalled.
+    """
+    with _ACTIVE_SESSIONS_LOCK:
+        sessions = [(pgid, p["_sandbox"]) for pgid, p in _ACTIVE_SESSIONS.items()]
+    for pgid, sandbox in sessions:
+        _kill_session_tree(pgid, sandbox)
+    return len(sessions)
+
+
+def _engine_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared session event loop, starting its thread on first use."""
+    global _ENGINE_LOOP
+    with _ENGINE_LOCK:
+        if _ENGINE_LOOP is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="kit-session-engine", daemon=True).start()
+            _ENGINE_LOOP = loop
+        return _ENGINE_LOOP
+
+
+def run_on_engine(coro):
+    """Run a coroutine on the session engine and block until it finishes.
+
+    Safe to call from any thread except the engine's own. If the waiting
+    thread is interrupted (e.g. KeyboardInterrupt), the coroutine is
+    cancelled, which kills any subprocess tree it started.
+    """
+    loop = _engine_loop()
+    if threading.current_thread().name == "kit-session-engine":
+        coro.close()
+        raise RuntimeError("run_on_engine called from the session engine thread — await the coroutine instead")
+    finished = threading.Event()
+
+    async def tracked():
+        try:
+            return await coro
+        finally:
+            finished.set()
+
+    future = asyncio.run_coroutine_threadsafe(tracked(), loop)
+    try:
+        return future.result()
+    except BaseException:
+        if future.cancel():
+            finished.wait(SESSION_STOP_WAIT)  # let the task kill its subprocess tree
+        raise
+
+
+def set_max_sessions(limit: int | None) -> None:
+    """Cap how many claude sessions run at once (`get_max_sessions`); None removes the cap.
+
+    Takes effect for sessions that have not started waiting for a slot yet.
+    """
+    global _MAX_SESSIONS, _SESSION_SLOTS
+    with _ENGINE_LOCK:
+        _MAX_SESSIONS = limit if limit and limit > 0 else None
+        _SESSION_SLOTS = None
+
+
+def _session_slots() -> asyncio.Semaphore | None:
+    """The engine's session semaphore (created on the engine loop), or None if uncapped."""
+    global _SESSION_SLOTS
+    with _ENGINE_LOCK:
+        if _MAX_SESSIONS is not None and _SESSION_SLOTS is None:
+            _SESSION_SLOTS = asyncio.Semaphore(_MAX_SESSIONS)
+        return _SESSION_SLOTS
+
+
+async def _acquire_session_slot(
+    slots: asyncio.Semaphore, label: str, cancel: threading.Event | None,
+) -> bool:
+    """Wait for a session slot; False if `cancel` was set first (no slot held)."""
+    if not slots.locked():
+        await slots.acquire()
+        return True
+    log(f"  {label}: waiting for a session slot ({_MAX_SESSIONS} running)")
+    acquire = asyncio.ensure_future(slots.acquire())
+    acquired = False
+    try:
+        while True:
+            done, _ = await asyncio.wait({acquire}, timeout=SESSION_POLL_INTERVAL)
+            if done:
+                acquired = True
+                return True
+            if cancel is not None and cancel.is_set():
+                return False
+    finally:
+        if not acquired:
+            if acquire.done() and not acquire.cancelled():
+                slots.release()
+            else:
+                acquire.cancel()
+
+
+def get_session_progress() -> list[dict]:
+    """Return a snapshot of every running session's progress (for health files)."""
+    now = time.monotonic()
+    with _ACTIVE_SESSIONS_LOCK:
+        sessions = [dict(p) for p in _ACTIVE_SESSIONS.values()]
+    for p in sessions:
+        started, last = p.pop("_started"), p.pop("_last_activity")
+        p.pop("_sandbox")
+        p["elapsed_s"] = round(now - started, 1)
+        p["idle_s"] = round(now - last, 1)
+    return sessions
+
+
+def _apply_stream_line(line: str, progress: dict, output: _OutputTail, result: dict) -> bool:
+    """Fold one `--output-format stream-json` line into the session's progress.
+
+    Caller holds `_ACTIVE_SESSIONS_LOCK`. Keeps only a bounded tail of
+    assistant text in `output` and stores the final `result` event's text in
+    `result["text"]`. Lines that are not JSON events are kept as plain
+    output, so older CLIs still work. Returns True for events worth
+    reporting (tool calls and the final result).
+    """
+    progress["_last_activity"] = time.monotonic()
+    progress["events"] += 1
+    progress["output_chars"] += len(line)
+    try:
+        event = json.loads(line)
+    except ValueError:
+        event = None
+    if not isinstance(event, dict):
+        output.append(line)
+        return False
+    notify = False
+    if event.get("type") == "assistant":
+        progress["turns"] += 1
+        for block in event.get("message", {}).get("content", []) or []:
+            if not isinstance(block, dict):
+                continue
+            if block.get("type") == "tool_use":
+                progress["tool_calls"] += 1
+                progress["last_tool"] = block.get("name")
+                notify = True
+            elif block.get("type") == "text":
+                output.append(str(block.get("text", "")) + "\n")
+    elif event.get("type") == "result":
+        text = str(event.get("result", ""))
+        result["text"] = text[-SESSION_OUTPUT_MAX:]
+        result["is_error"] = bool(event.get("is_error"))
+        notify = True
+    return notify
+
+
+async def _read_lines(stream, progress: dict | None = None):
+    """Yield decoded lines from an asyncio stream until EOF.
+
+    Lines longer than SESSION_LINE_MAX are dropped by the stream reader and
+    reported as a placeholder, so one oversized event cannot grow memory.
+    Bytes read are added to `progress["output_bytes"]` when given.
+    """
+    while True:
+        try:
+            raw = await stream.readline()
+        except ValueError:  # line exceeded the stream limit; its data is discarded
+            yield f"[oversized line dropped (> {SESSION_LINE_MAX} bytes)]\n"
+            continue
+        if not raw:
+            return
+        if progress is not None:
+            progress["output_bytes"] += len(raw)
+        yield raw.decode("utf-8", errors="replace")
+
+
+async def _read_stream_events(
+    stream, progress: dict, output: _OutputTail, result: dict, on_progress=None,
+) -> None:
+    """Reader task: apply every stream-json line and report progress (throttled)."""
+    last_notified = 0.0
+    async for line in _read_lines(stream, progress):
+        with _ACTIVE_SESSIONS_LOCK:
+            notify = _apply_stream_line(line, progress, output, result)
+        now = time.monotonic()
+        if on_progress and notify and now - last_notified >= SESSION_PROGRESS_INTERVAL:
+            last_notified = now
+            try:
+                await asyncio.to_thread(on_progress)  # keep file I/O off the shared loop
+            except Exception as e:  # progress reporting must never kill a session
+                log(f"  WARNING: session progress callback failed: {e}")
+
+
+async def _read_bounded(stream, output: _OutputTail) -> None:
+    """Reader task: drain a pipe into a bounded tail."""
+    async for line in _read_lines(stream):
+        output.append(line)
+
+
+async def _stop_process(proc: asyncio.subprocess.Process, sandbox: dict | None = None) -> None:
+    """Kill a subprocess's whole tree and reap it (bounded wait)."""
+    # Kill the entire tree (claude + all children like pytest, node, etc.)
+    await asyncio.to_thread(_kill_session_tree, proc.pid, sandbox)
+    try:
+        proc.kill()
+    except OSError:
+        pass
+    # Bound the final wait — if SIGKILL didn't take (zombie,
+    # uninterruptible sleep, permissions), we prefer a leaked PID
+    # over a hung orchestrator.
+    try:
+        await asyncio.wait_for(proc.wait(), timeout=10)
+    except asyncio.TimeoutError:
+        log(f"  WARNING: subprocess {proc.pid} did not exit after SIGKILL — continuing with process leaked")
+
+
+def _sample_session_resources(pid: int, progress: dict) -> dict | None:
+    """Sample the session's process tree and fold it into `progress["resources"]`.
+
+    Keeps the current totals alongside per-session peaks (`peak_rss_mb`,
+    `peak_fds`, `peak_processes`); `cpu_s` never goes backwards, so CPU
+    used by processes that exited without being reaped into the tree is
+    not lost. Returns the updated resources, or None without /proc.
+    """
+    sample = sample_process_tree(pid)
+    if sample is None:
+        return None
+    with _ACTIVE_SESSIONS_LOCK:
+        previous = progress.get("resources") or {}
+        resources = {
+            **sample,
+            "cpu_s": max(sample["cpu_s"], previous.get("cpu_s", 0.0)),
+            "peak_rss_mb": max(sample["rss_mb"], previous.get("peak_rss_mb", 0.0)),
+            "peak_fds": max(sample["fds"], previous.get("peak_fds", 0)),
+            "peak_processes": max(sample["processes"], previous.get("peak_processes", 0)),
+            "samples": previous.get("samples", 0) + 1,
+        }
+        progress["resources"] = resources
+    return resources
+
+
+async def _watch_session(
+    proc: asyncio.subprocess.Process, progress: dict, started: float,
+    timeout: int, stall_timeout: int | None, cancel: threading.Event | None = None,
+    memory_limit_mb: int | None = None,
+) -> str | None:
+    """Wait for the session to exit; return a timeout/stall/cancel/memory error if it must be stopped."""
+    last_sample = 0.0
+    while True:
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=SESSION_POLL_INTERVAL)
+            return None
+        except asyncio.TimeoutError:
+            pass
+        if cancel is not None and cancel.is_set():
+            return "SESSION_ERROR: Cancelled"
+        now = time.monotonic()
+        if now - last_sample >= SESSION_SAMPLE_INTERVAL:
+            last_sample = now
+            resources = await asyncio.to_thread(_sample_session_resources, proc.pid, progress)
+            if memory_limit_mb and resources and resources["rss_mb"] > memory_limit_mb:
+                with _ACTIVE_SESSIONS_LOCK:
+                    resources["memory_limit_exceeded"] = True
+                return (
+                    f"SESSION_ERROR: Memory limit exceeded — session processes using "
+                    f"{resources['rss_mb']:.0f} MB (limit {memory_limit_mb} MB)"
+                )
+        with _ACTIVE_SESSIONS_LOCK:
+            idle = now - progress["_last_activity"]
+        if now - started >= timeout:
+            return f"SESSION_ERROR: Timed out after {timeout}s"
+        if stall_timeout and idle >= stall_timeout:
+            return (
+                f"SESSION_ERROR: Timed out after {int(now - started)}s — stalled, "
+                f"no session activity for {int(idle)}s"
+            )
+
+
+async def run_claude_session_async(
     prompt: str, project_dir: str, timeout: int = SESSION_TIMEOUT,
-    model: str | None = None,
+    model: str | None = None, label: str = "session",
+    stall_timeout: int | None = None, on_progress=None,
+    cancel: threading.Event | None = None,
+    memory_limit_mb: int | None = None,
+    resources: dict | None = None,
+    sandbox_limits: dict | None = None,
 ) -> str:
-    """Execute a claude -p session and capture output.
-
-    Retries up to NETWORK_MAX_RETRIES times for network errors.
-    Returns the session stdout on success, or a SESSION_ERROR/SESSION_ERROR_PERMANENT
-    string on failure.
+    """Execute a claude -p session on the running event loop, streaming its output.
+
+    Runs with `--output-format stream-json` and consumes events as they
+    arrive, so progress is visible while the session runs and memory stays
+    bounded regardless of output size. Retries up to NETWORK_MAX_RETRIES
+    times for network errors. Cancelling the task kills the session's whole
+    process group before re-raising. Waits for a session slot first when
+    `set_max_sessions` capped concurrency; a `cancel` set while waiting
+    returns "SESSION_ERROR: Cancelled" without starting the session.
+    Returns the session's final result text on success, or a
+    SESSION_ERROR/SESSION_ERROR_PERMANENT string on failure.
 
     Args:
         model: Optional model alias ("sonnet", "opus") or full model ID,
             passed via `--model`. `None` uses the claude CLI default.
+        label: Name for this session in health snapshots (e.g. "US-003 impl").
+        stall_timeout: Kill the session early if it emits no event for this
+            many seconds. `None` waits out the full `timeout`.
+        on_progress: Called (no arguments, at most every
+            SESSION_PROGRESS_INTERVAL seconds, on a worker thread) after
+            tool calls.
+        cancel: Optional event; once set, the session is killed within
+            SESSION_POLL_INTERVAL and "SESSION_ERROR: Cancelled" is returned.
+        memory_limit_mb: Kill the session once the combined RSS of its
+            process tree exceeds this many MB (checked every
+            SESSION_SAMPLE_INTERVAL). `None` or 0 disables the ceiling.
+        resources: Optional dict, filled with the session's final resource
+            sample and peaks (see `_sample_session_resources`) when it ends,
+            plus the kernel's `cgroup` accounting when sandboxed.
+        sandbox_limits: Run the session in its own cgroup sandbox with these
+            limits (`get_session_sandbox`); killed via `cgroup.kill`. `None`
+            runs it unconfined in its own process group.
     """
+    slots = _session_slots()
+    if slots is not None and not await _acquire_session_slot(slots, label, cancel):
+        return "SESSION_ERROR: Cancelled"
+    try:
+        return await _run_claude_session(
+            prompt, project_dir, timeout, model, label, stall_timeout, on_progress,
+            cancel, memory_limit_mb, resources, sandbox_limits,
+        )
+    finally:
+        if slots is not None:
+            slots.release()
+
+
+async def _run_claude_session(
+    prompt: str, project_dir: str, timeout: int, model: str | None, label: str,
+    stall_timeout: int | None, on_progress, cancel: threading.Event | None,
+    memory_limit_mb: int | None, resources: dict | None, sandbox_limits: dict | None,
+) -> str:
+    """Body of `run_claude_session_async`, once the session holds its slot."""
     clean_env = {k: v for k, v in os.environ.items() if k != "CLAUDECODE"}
 
-    cmd = ["claude", "-p", prompt, "--dangerously-skip-permissions"]
+    cmd = [
+        "claude", "-p", prompt, "--dangerously-skip-permissions",
+        "--output-format", "stream-json", "--verbose",
+    ]
     if model:
         cmd.extend(["--model", model])
 
     for attempt in range(1, NETWORK_MAX_RETRIES + 1):
+        sandbox = (
+            await asyncio.to_thread(create_sandbox, label, sandbox_limits)
+            if sandbox_limits is not None else None
+        )
         try:
-            proc = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
                 cwd=project_dir,
                 env=clean_env,
                 start_new_session=True,
+                limit=SESSION_LINE_MAX,
             )
-
-            try:
-                stdout, stderr_out = proc.communicate(timeout=timeout)
-            except subprocess.TimeoutExpired:
-                # Kill the entire process group (claude + all children like pytest, node, etc.)
-                _kill_process_group(proc.pid)
-                try:
-                    proc.kill()
-                except OSError:
-                    pass
-                # Bound the final wait — if SIGKILL didn't take (zombie,
-                # uninterruptible sleep, permissions), we prefer a leaked PID
-                # over a hung orchestrator.
-                try:
-                    proc.wait(timeout=10)
-                except subprocess.TimeoutExpired:
-                    log(f"  WARNING: subprocess {proc.pid} did not exit after SIGKILL — continuing with process leaked")
-                return f"SESSION_ERROR: Timed out after {timeout}s"
-
-            # Session finished — kill any orphaned children in the process group
-            _kill_process_group(proc.pid)
-
-            if proc.returncode == 0:
-                return stdout
-
-            stderr = stderr_out.strip()
-            is_network = any(kw in stderr.lower() for kw in ("network", "connection", "timeout", "econnrefused"))
-
-            # Retry network errors (unless this is the last attempt)
-            if is_network and attempt < NETWORK_MAX_RETRIES:
-                log(f"  Network error (attempt {attempt}/{NETWORK_MAX_RETRIES}), retrying in {NETWORK_RETRY_WAIT}s...")
-                time.sleep(NETWORK_RETRY_WAIT)
-                continue
-
-            # Final network attempt or non-network error — return error
-            if is_network:
-                return f"SESSION_ERROR: Network error after {NETWORK_MAX_RETRIES} attempts\n{stderr}"
-            prefix = "SESSION_ERROR_PERMANENT" if _is_permanent_error(stderr) else "SESSION_ERROR"
-            return f"{prefix}: Exit code {proc.returncode}\n{stderr}\n{stdout}"
-
         except FileNotFoundError:
+            await asyncio.to_thread(release_sandbox, sandbox)
             return "SESSION_ERROR_PERMANENT: 'claude' command not found. Ensure Claude CLI is installed and in PATH."
+        enter_sandbox(sandbox, proc.pid)
+
+        started = time.monotonic()
+        progress = {
+            "label": label,
+            "pid": proc.pid,
+            "model": model,
+            "started_at": now_iso(),
+            "events": 0,
+            "turns": 0,
+            "tool_calls": 0,
+            "last_tool": None,
+            "output_chars": 0,
+            "output_bytes": 0,
+            "resources": None,
+            "_started": started,
+            "_last_activity": started,
+            "_sandbox": sandbox,
+        }
+        output = _OutputTail(SESSION_OUTPUT_MAX)
+        stderr_tail = _OutputTail(SESSION_STDERR_MAX)
+        result: dict = {}
+        with _ACTIVE_SESSIONS_LOCK:
+            _ACTIVE_SESSIONS[proc.pid] = progress
+        readers = [
+            asyncio.create_task(_read_stream_events(proc.stdout, progress, output, result, on_progress)),
+            asyncio.create_task(_read_bounded(proc.stderr, stderr_tail)),
+        ]
+        try:
+            stop_reason = await _watch_session(
+                proc, progress, started, timeout, stall_timeout, cancel, memory_limit_mb,
+            )
+            if stop_reason:
+                await _stop_process(proc, sandbox)
+                log(f"  {label}: {stop_reason[len('SESSION_ERROR: '):]}")
+                return stop_reason
+            # Session finished — kill any orphaned children in its tree
+            # (they may hold the pipes open and block the reader tasks)
+            await asyncio.to_thread(_kill_session_tree, proc.pid, sandbox)
+            await asyncio.wait(readers, timeout=10)
+        except asyncio.CancelledError:
+            await asyncio.shield(_stop_process(proc, sandbox))
+            raise
+        finally:
+            for reader in readers:
+                reader.cancel()
+            with _ACTIVE_SESSIONS_LOCK:
+                _ACTIVE_SESSIONS.pop(proc.pid, None)
+                if resources is not None and progress["resources"]:
+                    resources.update(progress["resources"])
+            cgroup_stats = await asyncio.shield(asyncio.to_thread(release_sandbox, sandbox))
+            if resources is not None and cgroup_stats:
+                resources["cgroup"] = cgroup_stats
+
+        stdout = result["text"] if "text" in result else output.text()
+        if proc.returncode == 0 and not result.get("is_error"):
+            return stdout
+
+        stderr = stderr_tail.text().strip()
+        is_network = any(kw in stderr.lower() for kw in ("network", "connection", "timeout", "econnrefused"))
+
+        # Retry network errors (unless this is the last attempt)
+        if is_network and attempt < NETWORK_MAX_RETRIES:
+            log(f"  Network error (attempt {attempt}/{NETWORK_MAX_RETRIES}), retrying in {NETWORK_RETRY_WAIT}s...")
+            await asyncio.sleep(NETWORK_RETRY_WAIT)
+            continue
+
+        # Final network attempt or non-network error — return error
+        if is_network:
+            return f"SESSION_ERROR: Network error after {NETWORK_MAX_RETRIES} attempts\n{stderr}"
+        prefix = "SESSION_ERROR_PERMANENT" if _is_permanent_error(stderr) else "SESSION_ERROR"
+        return f"{prefix}: Exit code {proc.returncode}\n{stderr}\n{stdout}"
 
     # Should not reach here, but safety net
     return "SESSION_ERROR: All retries exhausted"
 
 
+async def _wait_for_exit(proc: asyncio.subprocess.Process, timeout: float) -> None:
+    """Wait until the process itself exits; raise asyncio.TimeoutError after `timeout`.
+
+    `Process.wait()` only returns once the pipes close too, which a child
+    that escaped the process group can hold off indefinitely, so this polls
+    `returncode` like `_watch_session` does.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise asyncio.TimeoutError
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=min(SESSION_POLL_INTERVAL, remaining))
+            return
+        except asyncio.TimeoutError:
+            if proc.returncode is not None:
+                return
+
+
+async def run_command_async(
+    cmd: list[str], cwd: str, timeout: int,
+    sandbox_limits: dict | None = None,
+) -> tuple[int | None, str, str]:
+    """Run a non-session subprocess (e.g. a test runner) in its own process group.
+
+    Returns `(returncode, stdout, stderr)`; `returncode` is None when the
+    command timed out and was killed. The process tree is always killed
+    afterwards, since test runners may leave children behind. With
+    `sandbox_limits` it runs in its own cgroup sandbox, like sessions.
+    """
+    sandbox = (
+        await asyncio.to_thread(create_sandbox, os.path.basename(cmd[0]), sandbox_limits)
+        if sandbox_limits is not None else None
+    )
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, cwd=cwd,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+        enter_sandbox(sandbox, proc.pid)
+        io = asyncio.ensure_future(proc.communicate())
+        try:
+            await _wait_for_exit(proc, timeout)
+        except asyncio.TimeoutError:
+            io.cancel()
+            await _stop_process(proc, sandbox)
+            return None, "", ""
+        except asyncio.CancelledError:
+            io.cancel()
+            await asyncio.shield(_stop_process(proc, sandbox))
+            raise
+        # Kill leftover children first — they may hold the pipes open
+        await asyncio.to_thread(_kill_session_tree, proc.pid, sandbox)
+        try:
+            stdout, stderr = await asyncio.wait_for(io, timeout=10)
+        except asyncio.TimeoutError:
+            log(f"  WARNING: output pipes of {cmd[0]} still held open by an escaped child — output dropped")
+            stdout = stderr = b""
+    finally:
+        await asyncio.shield(asyncio.to_thread(release_sandbox, sandbox))
+    return (
+        proc.returncode,
+        stdout.decode("utf-8", errors="replace"),
+        stderr.decode("utf-8", errors="replace"),
+    )
+
+
+def run_command(
+    cmd: list[str], cwd: str, timeout: int, sandbox_limits: dict | None = None,
+) -> tuple[int | None, str, str]:
+    """Blocking wrapper around `run_command_async` (runs on the session engine)."""
+    return run_on_engine(run_command_async(cmd, cwd, timeout, sandbox_limits=sandbox_limits))
+
+
+def run_claude_session(
+    prompt: str, project_dir: str, timeout: int = SESSION_TIMEOUT,
+    model: str | None = None, label: str = "session",
+    stall_timeout: int | None = None, on_progress=None,
+    cancel: threading.Event | None = None,
+    memory_limit_mb: int | None = None,
+    resources: dict | None = None,
+    sandbox_limits: dict | None = None,
+) -> str:
+    """Execute a claude -p session and wait for its output.
+
+    Blocking wrapper around `run_claude_session_async` that runs it on the
+    shared session engine, so it is safe to call from worker threads. Same
+    arguments and return contract.
+    """
+    return run_on_engine(run_claude_session_async(
+        prompt, project_dir, timeout=timeout, model=model, label=label,
+        stall_timeout=stall_timeout, on_progress=on_progress, cancel=cancel,
+        memory_limit_mb=memory_limit_mb, resources=resources,
+        sandbox_limits=sandbox_limits,
+    ))
+
+
 def get_impl_result_path(project_dir: str) -> str:
     """Return absolute path to the implementation result file."""
     return os.path.join(project_dir, IMPL_RESULT_FILE)
@@ -2,27 +2,49 @@
 execute_orchestrator.py during the 2.4.0 refactor). See the package-level
 __init__ for the full public API."""
 from __future__ import annotations
+import hashlib
 import os
 import re
+import threading
 from datetime import datetime, timezone
 
 import yaml
 
+from .scheduler import build_dag, build_story_dag, parse_story_depends_on, ready_nodes
 from .utils import log, run_git
 
-def parse_spec_frontmatter(spec_path: str) -> dict:
-    """Parse YAML frontmatter from a feature spec markdown file using PyYAML."""
-    with open(spec_path, "r") as f:
-        content = f.read()
-    match = re.match(r'^---\s*\n(.*?)\n---', content, re.DOTALL)
+# Compiled once — these run for every story on every (re-)parse.
+_FRONTMATTER_PATTERN = re.compile(r'^---\s*\n(.*?)\n---', re.DOTALL)
+_STORY_HEADER_PATTERN = re.compile(r"^### (US-\d+):\s*(.+?)$", re.MULTILINE)
+_SECTION_HEADER_PATTERN = re.compile(r"^## ", re.MULTILINE)
+_DESCRIPTION_PATTERN = re.compile(r"\*\*Description:\*\*\s*(.+?)(?=\n\*\*|\n###|\Z)", re.DOTALL)
+_HINTS_PATTERN = re.compile(
+    r"\*\*Implementation Hints:\*\*\s*\n(.+?)(?=\n\*\*Acceptance Criteria:\*\*|\n###|\Z)", re.DOTALL
+)
+_CRITERION_PATTERN = re.compile(r"^- \[[ x]\] (.+)$", re.MULTILINE)
+_UNCHECKED_PATTERN = re.compile(r"^- \[ \] ", re.MULTILINE)
+_CHECKED_PATTERN = re.compile(r"^- \[x\] ", re.MULTILINE)
+
+# One index per spec path; guarded because parallel workers may build prompts.
+_SPEC_INDEXES: dict[str, "SpecIndex"] = {}
+_SPEC_INDEX_LOCK = threading.RLock()
+
+
+def _parse_frontmatter_text(content: str) -> tuple[dict, int]:
+    """Parse the YAML frontmatter block of spec text.
+
+    Returns `(frontmatter, end_offset)`; `end_offset` is 0 when there is no
+    frontmatter block.
+    """
+    match = _FRONTMATTER_PATTERN.match(content)
     if not match:
-        return {}
+        return {}, 0
     try:
         frontmatter = yaml.safe_load(match.group(1))
     except yaml.YAMLError:
-        return {}
+        return {}, match.end()
     if not isinstance(frontmatter, dict):
-        return {}
+        return {}, match.end()
     # Normalize values:
     # - Exclude None (callers expect missing keys, not None values)
     # - Convert date objects to ISO strings (PyYAML auto-parses YYYY-MM-DD as datetime.date)
@@ -34,76 +56,184 @@ def parse_spec_frontmatter(spec_path: str) -> dict:
             result[k] = v.isoformat()
         else:
             result[k] = v
-    return result
-
-
-def parse_stories_from_spec(spec_path: str) -> list[dict]:
-    """Parse user stories from a feature spec markdown file.
-
-    Returns a list of dicts with keys: id, title, description, criteria, criteria_text
+    return result, match.end()
+
+
+def _parse_story_section(story_id: str, story_title: str, story_content: str) -> dict:
+    """Build the story dict for one `### US-NNN:` section body."""
+    # Extract description
+    desc_match = _DESCRIPTION_PATTERN.search(story_content)
+    description = desc_match.group(1).strip() if desc_match else ""
+
+    # Extract implementation hints (between **Implementation Hints:** and **Acceptance Criteria:**)
+    hints_match = _HINTS_PATTERN.search(story_content)
+    hints = hints_match.group(1).strip() if hints_match else ""
+
+    # Extract acceptance criteria
+    criteria = [m.group(1).strip() for m in _CRITERION_PATTERN.finditer(story_content)]
+
+    # Check if all criteria are already completed
+    unchecked = _UNCHECKED_PATTERN.findall(story_content)
+    checked = _CHECKED_PATTERN.findall(story_content)
+
+    return {
+        "id": story_id,
+        "title": story_title,
+        "description": description,
+        "hints": hints,
+        "criteria": criteria,
+        "criteria_text": "\n".join(
+            f"- [ ] {c}" for c in criteria
+        ),
+        "completed": len(unchecked) == 0 and len(checked) > 0,
+        "depends_on": parse_story_depends_on(story_content),
+    }
+
+
+class SpecIndex:
+    """Parsed view of one feature spec, re-parsed only when the file changes.
+
+    Holds the spec text, its frontmatter and a story table with the
+    `(header_start, section_end)` offset of every story section. `refresh()`
+    compares the file's mtime and size, then its content hash, before
+    re-parsing. Writers go through `apply_edit`, which patches the text and
+    re-parses only the story sections the edit touches. `story_dag()` keeps
+    the dependency DAG until the stories or their `Depends on:` lines change.
     """
-    with open(spec_path, "r") as f:
-        content = f.read()
-
-    stories = []
-    # Match story headers like: ### US-001: Story Title
-    story_pattern = re.compile(
-        r"^### (US-\d+):\s*(.+?)$", re.MULTILINE
-    )
-
-    matches = list(story_pattern.finditer(content))
-    for i, match in enumerate(matches):
-        story_id = match.group(1)
-        story_title = match.group(2).strip()
-
-        # Extract content between this story header and the next (or next ## section)
-        start = match.end()
-        if i + 1 < len(matches):
-            end = matches[i + 1].start()
-        else:
-            # Find the next ## header (not ###)
-            next_section = re.search(r"^## ", content[start:], re.MULTILINE)
-            end = start + next_section.start() if next_section else len(content)
 
-        story_content = content[start:end]
+    def __init__(self, spec_path: str):
+        self.path = spec_path
+        self.content = ""
+        self.frontmatter: dict = {}
+        self.stories: list[dict] = []
+        self.spans: list[tuple[int, int]] = []
+        self._frontmatter_end = 0
+        self._stat: tuple[int, int] | None = None
+        self._hash: str | None = None
+        self._dag: dict[str, list[str]] = {}
+        self._dag_key: tuple | None = None
+
+    def refresh(self) -> "SpecIndex":
+        """Re-read the file if its mtime/size changed and re-parse if its hash did.
+
+        Raises OSError if the spec cannot be read, like a plain `open()`.
+        """
+        st = os.stat(self.path)
+        if (st.st_mtime_ns, st.st_size) == self._stat:
+            return self
+        with open(self.path, "r") as f:
+            content = f.read()
+        self._stat = (st.st_mtime_ns, st.st_size)
+        digest = hashlib.sha256(content.encode()).hexdigest()
+        if digest == self._hash:
+            return self
+        self._hash = digest
+        self.content = content
+        self.frontmatter, self._frontmatter_end = _parse_frontmatter_text(content)
+        self.stories, self.spans = self._scan(0, len(content), tail=True)
+        return self
+
+    def _scan(self, lo: int, hi: int, tail: bool) -> tuple[list[dict], list[tuple[int, int]]]:
+        """Parse the story sections whose headers start in `content[lo:hi]`.
+
+        Each section runs to the next story header; with `tail`, the last one
+        runs to the next `## ` header (or end of file) instead of `hi`.
+        """
+        content = self.content
+        headers = list(_STORY_HEADER_PATTERN.finditer(content, lo, hi))
+        stories, spans = [], []
+        for i, match in enumerate(headers):
+            start = match.end()
+            if i + 1 < len(headers):
+                end = headers[i + 1].start()
+            elif tail:
+                # Find the next ## header (not ###)
+                next_section = _SECTION_HEADER_PATTERN.search(content, start)
+                end = next_section.start() if next_section else len(content)
+            else:
+                end = hi
+            stories.append(_parse_story_section(match.group(1), match.group(2).strip(), content[start:end]))
+            spans.append((match.start(), end))
+        return stories, spans
+
+    def apply_edit(self, start: int, end: int, replacement: str) -> None:
+        """Replace `content[start:end]`, write the spec and patch the index in place.
+
+        Stories ending before the edit are kept, stories after it are only
+        shifted, and the sections in between (plus the one just before the
+        edit) are re-parsed.
+        """
+        delta = len(replacement) - (end - start)
+        self.content = self.content[:start] + replacement + self.content[end:]
+        with open(self.path, "w") as f:
+            f.write(self.content)
+        st = os.stat(self.path)
+        self._stat = (st.st_mtime_ns, st.st_size)
+        self._hash = hashlib.sha256(self.content.encode()).hexdigest()
+        if start < self._frontmatter_end:
+            self.frontmatter, self._frontmatter_end = _parse_frontmatter_text(self.content)
+
+        spans = self.spans
+        keep = 0  # leading stories whose section ends before the edit
+        while keep < len(spans) and spans[keep][1] <= start:
+            keep += 1
+        after = keep  # first story whose header (and the newline before it) is past the edit
+        while after < len(spans) and spans[after][0] <= end:
+            after += 1
+        if keep:
+            keep -= 1  # where the preceding section ends depends on what follows it
+        lo = min(start, spans[keep][0]) if keep < len(spans) else start
+        hi = spans[after][0] + delta if after < len(spans) else len(self.content)
+        middle, middle_spans = self._scan(lo, hi, tail=after == len(spans))
+        self.stories = self.stories[:keep] + middle + self.stories[after:]
+        self.spans = spans[:keep] + middle_spans + [(h + delta, e + delta) for h, e in spans[after:]]
+
+    def story_dag(self) -> dict[str, list[str]]:
+        """Return `build_story_dag(self.stories)`, rebuilt only when dependencies change.
+
+        Checkbox edits leave it alone, so a dependency cycle is warned about
+        once rather than on every scheduling pass; a split that adds stories
+        rebuilds it.
+        """
+        key = tuple((s["id"], tuple(s.get("depends_on", []))) for s in self.stories)
+        if key != self._dag_key:
+            self._dag = build_story_dag(self.stories)
+            self._dag_key = key
+        return self._dag
+
+    def find_span(self, story_id: str) -> tuple[int, int] | None:
+        """Return the `(header_start, section_end)` offsets of a story, or None."""
+        for story, span in zip(self.stories, self.spans):
+            if story["id"] == story_id:
+                return span
+        return None
+
+
+def get_spec_index(spec_path: str) -> SpecIndex:
+    """Return the up-to-date SpecIndex for a spec (one instance per path)."""
+    key = os.path.abspath(spec_path)
+    with _SPEC_INDEX_LOCK:
+        index = _SPEC_INDEXES.get(key)
+        if index is None:
+            index = _SPEC_INDEXES[key] = SpecIndex(spec_path)
+        return index.refresh()
 
-        # Extract description
-        desc_match = re.search(
-            r"\*\*Description:\*\*\s*(.+?)(?=\n\*\*|\n###|\Z)",
-            story_content, re.DOTALL
-        )
-        description = desc_match.group(1).strip() if desc_match else ""
-
-        # Extract implementation hints (between **Implementation Hints:** and **Acceptance Criteria:**)
-        hints_match = re.search(
-            r"\*\*Implementation Hints:\*\*\s*\n(.+?)(?=\n\*\*Acceptance Criteria:\*\*|\n###|\Z)",
-            story_content, re.DOTALL
-        )
-        hints = hints_match.group(1).strip() if hints_match else ""
 
-        # Extract acceptance criteria
-        criteria = []
-        criteria_pattern = re.compile(r"^- \[[ x]\] (.+)$", re.MULTILINE)
-        for crit_match in criteria_pattern.finditer(story_content):
-            criteria.append(crit_match.group(1).strip())
+def parse_spec_frontmatter(spec_path: str) -> dict:
+    """Parse YAML frontmatter from a feature spec markdown file using PyYAML."""
+    with _SPEC_INDEX_LOCK:
+        return dict(get_spec_index(spec_path).frontmatter)
 
-        # Check if all criteria are already completed
-        unchecked = re.findall(r"^- \[ \] ", story_content, re.MULTILINE)
-        checked = re.findall(r"^- \[x\] ", story_content, re.MULTILINE)
 
-        stories.append({
-            "id": story_id,
-            "title": story_title,
-            "description": description,
-            "hints": hints,
-            "criteria": criteria,
-            "criteria_text": "\n".join(
-                f"- [ ] {c}" for c in criteria
-            ),
-            "completed": len(unchecked) == 0 and len(checked) > 0,
-        })
+def parse_stories_from_spec(spec_path: str) -> list[dict]:
+    """Parse user stories from a feature spec markdown file.
 
-    return stories
+    Returns a list of dicts with keys: id, title, description, hints, criteria,
+    criteria_text, completed, depends_on. Served from the spec's SpecIndex, so
+    repeated calls only re-parse after the file changes.
+    """
+    with _SPEC_INDEX_LOCK:
+        return [dict(s) for s in get_spec_index(spec_path).stories]
 
 
 def update_spec_checkboxes(spec_path: str, story_id: str) -> bool:
@@ -114,32 +244,42 @@ def update_spec_checkboxes(spec_path: str, story_id: str) -> bool:
 
     Returns True if any checkboxes were updated.
     """
-    with open(spec_path, "r") as f:
-        content = f.read()
-
-    # Find the story section: ### {story_id}: ...
-    # Section ends at the next ### header or end of file
-    pattern = re.compile(
-        rf"(### {re.escape(story_id)}:.*?)(?=\n### |\Z)",
-        re.DOTALL,
-    )
-    match = pattern.search(content)
-    if not match:
-        return False
+    with _SPEC_INDEX_LOCK:
+        index = get_spec_index(spec_path)
+
+        # Find the story section: ### {story_id}: ...
+        # Section ends at the next ### header or end of file
+        pattern = re.compile(
+            rf"(### {re.escape(story_id)}:.*?)(?=\n### |\Z)",
+            re.DOTALL,
+        )
+        match = pattern.search(index.content)
+        if not match:
+            return False
 
-    section = match.group(1)
-    updated_section = re.sub(r"^- \[ \] ", "- [x] ", section, flags=re.MULTILINE)
-    if updated_section == section:
-        return False  # Nothing to update
+        section = match.group(1)
+        updated_section = _UNCHECKED_PATTERN.sub("- [x] ", section)
+        if updated_section == section:
+            return False  # Nothing to update
 
-    content = content[:match.start()] + updated_section + content[match.end():]
-    with open(spec_path, "w") as f:
-        f.write(content)
+        index.apply_edit(match.start(), match.end(), updated_section)
     return True
 
 
-def find_next_uncompleted_story(spec_path: str, stories_state: dict) -> dict | None:
-    """Find the first story with uncompleted acceptance criteria.
+def is_story_dropped(story_state: dict) -> bool:
+    """True if the supervisor skipped or split this story (never retried)."""
+    return str(story_state.get("failure_type", "")).startswith("SUPERVISOR_")
+
+
+def _story_is_done(story: dict, stories_state: dict) -> bool:
+    """Completed per the spec checkboxes (source of truth) or the state JSON."""
+    if story["completed"]:
+        return True
+    return stories_state.get("stories", {}).get(story["id"], {}).get("status") == "completed"
+
+
+def list_uncompleted_stories(spec_path: str, stories_state: dict) -> list[dict]:
+    """Return every story with uncompleted acceptance criteria, in spec order.
 
     Args:
         spec_path: Path to the feature spec file.
@@ -147,17 +287,75 @@ def find_next_uncompleted_story(spec_path: str, stories_state: dict) -> dict | N
                        For single mode: the top-level state.
                        For epic mode: state["specs"][spec_key].
     """
-    stories = parse_stories_from_spec(spec_path)
-    for story in stories:
-        # Check feature spec checkboxes first (source of truth)
-        if story["completed"]:
-            continue
-        # Cross-reference with state JSON
-        story_state = stories_state.get("stories", {}).get(story["id"], {})
-        if story_state.get("status") == "completed":
-            continue
-        return story
-    return None
+    return [s for s in parse_stories_from_spec(spec_path) if not _story_is_done(s, stories_state)]
+
+
+def list_ready_stories(
+    spec_path: str, stories_state: dict, exclude: set[str] | None = None
+) -> tuple[list[dict], list[dict]]:
+    """Split the spec's schedulable stories into `(ready, remaining)`.
+
+    `remaining` is every uncompleted story not dropped by the supervisor and
+    not in `exclude` (e.g. attempts already in flight); `ready` is the subset,
+    in spec order, whose `Depends on:` prerequisites are all completed or
+    dropped. Same argument contract as `list_uncompleted_stories`.
+    """
+    exclude = exclude or set()
+    with _SPEC_INDEX_LOCK:
+        index = get_spec_index(spec_path)
+        stories = [dict(s) for s in index.stories]
+        dag = index.story_dag()
+    state_stories = stories_state.get("stories", {})
+    settled = {
+        s["id"] for s in stories
+        if _story_is_done(s, stories_state) or is_story_dropped(state_stories.get(s["id"], {}))
+    }
+    remaining = [s for s in stories if s["id"] not in settled and s["id"] not in exclude]
+    ready_ids = set(ready_nodes(dag, [s["id"] for s in remaining], settled))
+    return [s for s in remaining if s["id"] in ready_ids], remaining
+
+
+def find_next_uncompleted_story(spec_path: str, stories_state: dict) -> dict | None:
+    """Find the first uncompleted story whose dependencies are met.
+
+    Stories without `Depends on:` lines are returned in file order, exactly as
+    before. If every uncompleted story is still waiting on a prerequisite
+    (e.g. the prerequisite was skipped without being dropped), falls back to
+    the first uncompleted story rather than stalling. See
+    `list_uncompleted_stories` for the argument contract. Stories the
+    supervisor skipped or split are never returned.
+    """
+    ready, remaining = list_ready_stories(spec_path, stories_state)
+    if not remaining:
+        return None
+    if ready:
+        return ready[0]
+    log(f"  WARNING: no story in {os.path.basename(spec_path)} has its dependencies met — falling back to file order")
+    return remaining[0]
+
+
+def _dependency_filenames(dep: str) -> list[str]:
+    """Spec filenames a frontmatter `depends_on` entry may refer to."""
+    # feature-{dep}.md, or prd-{dep}.md for backwards compat
+    return [f"feature-{dep}.md", f"prd-{dep}.md", f"{dep}.md"]
+
+
+def build_spec_dag(spec_paths: list[str]) -> dict[str, list[str]]:
+    """Build the dependency DAG between an epic's specs, keyed by basename.
+
+    Frontmatter `depends_on` entries that name another spec in the list become
+    edges; entries outside the list are left to `check_dependencies_archived`.
+    """
+    keys = {os.path.basename(p) for p in spec_paths}
+    edges: dict[str, list[str]] = {}
+    for spec_path in spec_paths:
+        deps = parse_spec_frontmatter(spec_path).get("depends_on", []) or []
+        if isinstance(deps, str):
+            deps = [deps]
+        edges[os.path.basename(spec_path)] = [
+            name for dep in deps for name in _dependency_filenames(str(dep)) if name in keys
+        ]
+    return build_dag(edges, label="spec")
 
 
 def check_dependencies_archived(project_dir: str, spec_path: str) -> tuple[bool, list[str]]:
@@ -169,9 +367,7 @@ def check_dependencies_archived(project_dir: str, spec_path: str) -> tuple[bool,
     archive_dir = os.path.join(project_dir, "kit_tools", "specs", "archive")
     missing = []
     for dep in deps:
-        # Check for feature-{dep}.md or prd-{dep}.md in archive (backwards compat)
-        candidates = [f"feature-{dep}.md", f"prd-{dep}.md", f"{dep}.md"]
-        found = any(os.path.exists(os.path.join(archive_dir, c)) for c in candidates)
+        found = any(os.path.exists(os.path.join(archive_dir, c)) for c in _dependency_filenames(dep))
         if not found:
             missing.append(dep)
     return len(missing) == 0, missing
@@ -218,6 +414,8 @@ def archive_spec(project_dir: str, spec_path: str, feature_name: str) -> None:
 
     # Remove original only after archive write succeeds
     os.remove(spec_path)
+    with _SPEC_INDEX_LOCK:
+        _SPEC_INDEXES.pop(os.path.abspath(spec_path), None)
 
     # Stage changes
     rel_dest = os.path.relpath(dest, project_dir)
@@ -2,11 +2,24 @@
 execute_orchestrator.py during the 2.4.0 refactor). See the package-level
 __init__ for the full public API."""
 from __future__ import annotations
+import atexit
+import copy
 import json
 import os
-from .utils import _atomic_json_write, now_iso
+import threading
+import time
+from .blobs import delete_blob, get_blob, put_blob
+from .utils import _atomic_json_write, log, now_iso
 
 STATE_SCHEMA_VERSION = 1
+STATE_JOURNAL_COMPACT_RECORDS = 200  # journal records before folding into the snapshot
+STATE_JOURNAL_COMPACT_INTERVAL = 60  # seconds between compactions at most
+_STATE_DIFF_DEPTH = 6  # deepest dict level diffed key by key (epic story fields are 5)
+
+# Journal bookkeeping per state path: the live state dict, a copy of what
+# is persisted (snapshot + journal), the snapshot generation and counters.
+_STATE_JOURNALS: dict[str, dict] = {}
+_STATE_JOURNAL_LOCK = threading.RLock()
 _REQUIRED_STATE_FIELDS_COMMON = {"status", "branch", "mode", "started_at", "updated_at", "sessions"}
 _REQUIRED_STATE_FIELDS_SINGLE = _REQUIRED_STATE_FIELDS_COMMON | {"spec", "stories"}
 _REQUIRED_STATE_FIELDS_EPIC = _REQUIRED_STATE_FIELDS_COMMON | {"epic", "specs"}
@@ -70,7 +83,7 @@ def load_or_create_state(config: dict) -> tuple[dict, bool]:
     """Read or create .execution-state.json for single mode. Returns (state, is_rerun)."""
     state_path = get_state_path(config)
     if os.path.exists(state_path):
-        state = _read_state_file(state_path)
+        state = _replay_state_journal(_read_state_file(state_path), config)
         _validate_state(state, "single", state_path)
         # If resuming a completed/failed run, reset status
         if state.get("status") in ("completed", "failed"):
@@ -96,7 +109,7 @@ def load_or_create_epic_state(config: dict) -> tuple[dict, bool]:
     """Read or create .execution-state.json for epic mode. Returns (state, is_rerun)."""
     state_path = get_state_path(config)
     if os.path.exists(state_path):
-        state = _read_state_file(state_path)
+        state = _replay_state_journal(_read_state_file(state_path), config)
         _validate_state(state, "epic", state_path)
         if state.get("status") in ("completed", "failed"):
             state["status"] = "running"
@@ -125,11 +138,173 @@ def save_state(state: dict, config: dict) -> None:
     mid-write crashes from corrupting the state file and losing story
     completion records. Also stamps the current schema version on every save
     so legacy state gets upgraded transparently.
+
+    With `state_journal` enabled, only the changes since the previous save are
+    appended (fsync'd) to the state journal; the snapshot is rewritten every
+    STATE_JOURNAL_COMPACT_RECORDS records or STATE_JOURNAL_COMPACT_INTERVAL
+    seconds, and on exit.
     """
     state["updated_at"] = now_iso()
     state["schema_version"] = STATE_SCHEMA_VERSION
     state_path = get_state_path(config)
-    _atomic_json_write(state_path, state)
+    if not config.get("state_journal"):
+        _atomic_json_write(state_path, state)
+        return
+
+    with _STATE_JOURNAL_LOCK:
+        journal = _STATE_JOURNALS.get(state_path)
+        if journal is None or journal["state"] is not state:
+            journal = _STATE_JOURNALS[state_path] = {
+                "state": state,
+                "persisted": None,
+                "generation": state.get("journal_generation", 0),
+                "records": 0,
+                "compacted_at": 0.0,
+                "journal_path": get_state_journal_path(config),
+                "state_path": state_path,
+            }
+            if len(_STATE_JOURNALS) == 1:
+                atexit.register(_compact_all_state_journals)
+            _compact_state_journal(journal, initial=True)
+            return
+
+        ops: list = []
+        _diff_state(journal["persisted"], state, [], ops)
+        if not ops:
+            return
+        _append_journal_record(journal["journal_path"], {"ops": ops})
+        _apply_state_ops(journal["persisted"], copy.deepcopy(ops))
+        journal["records"] += 1
+        if (journal["records"] >= STATE_JOURNAL_COMPACT_RECORDS
+                or time.monotonic() - journal["compacted_at"] >= STATE_JOURNAL_COMPACT_INTERVAL):
+            _compact_state_journal(journal)
+
+
+def get_state_journal_path(config: dict) -> str:
+    """Return path to the state journal (`state_journal` mode) in the project."""
+    return os.path.join(config["project_dir"], "kit_tools", "specs", ".execution-state.journal.jsonl")
+
+
+def _diff_state(old, new, path: list, ops: list, depth: int = 0) -> None:
+    """Append `["set", path, value]` / `["del", path]` ops turning `old` into `new`.
+
+    Dicts are compared key by key down to _STATE_DIFF_DEPTH levels; anything
+    else (lists, strings, deeper dicts) is replaced whole when it differs.
+    """
+    if depth < _STATE_DIFF_DEPTH and isinstance(old, dict) and isinstance(new, dict):
+        for key, value in new.items():
+            if key not in old:
+                ops.append(["set", path + [key], value])
+            elif old[key] != value:
+                _diff_state(old[key], value, path + [key], ops, depth + 1)
+        for key in old:
+            if key not in new:
+                ops.append(["del", path + [key]])
+        return
+    ops.append(["set", path, new])
+
+
+def _apply_state_ops(state: dict, ops: list) -> None:
+    """Apply journal ops to `state` in order (intermediate dicts are created)."""
+    for op in ops:
+        *parents, last = op[1]
+        target = state
+        for key in parents:
+            if not isinstance(target.get(key), dict):
+                target[key] = {}
+            target = target[key]
+        if op[0] == "set":
+            target[last] = op[2]
+        else:
+            target.pop(last, None)
+
+
+def _append_journal_record(journal_path: str, record: dict) -> None:
+    """Append one JSON line to the journal and fsync it."""
+    with open(journal_path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _compact_state_journal(journal: dict, initial: bool = False) -> None:
+    """Fold the journal into a new snapshot generation and restart the journal.
+
+    The snapshot is written first; a journal whose header generation does not
+    match the snapshot is ignored on replay, so a crash between the two
+    writes loses nothing. Skipped when nothing was journaled since the last
+    compaction, or when the journal file was removed (run cleaned up).
+    """
+    if not initial and (journal["records"] == 0 or not os.path.exists(journal["journal_path"])):
+        return
+    state = journal["state"] if initial else journal["persisted"]
+    journal["generation"] += 1
+    state["journal_generation"] = journal["generation"]
+    journal["state"]["journal_generation"] = journal["generation"]
+    _atomic_json_write(journal["state_path"], state)
+    # Header line naming the snapshot generation; records follow as JSONL
+    with open(journal["journal_path"], "w") as f:
+        f.write(json.dumps({"generation": journal["generation"]}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    if initial:
+        journal["persisted"] = copy.deepcopy(state)
+    journal["records"] = 0
+    journal["compacted_at"] = time.monotonic()
+
+
+def compact_state_journal(config: dict) -> None:
+    """Write the snapshot now if `state_journal` has pending records (e.g. before exit)."""
+    with _STATE_JOURNAL_LOCK:
+        journal = _STATE_JOURNALS.get(get_state_path(config))
+        if journal is not None:
+            _compact_state_journal(journal)
+
+
+def _compact_all_state_journals() -> None:
+    """atexit hook: fold every open journal into its snapshot."""
+    with _STATE_JOURNAL_LOCK:
+        for journal in _STATE_JOURNALS.values():
+            try:
+                _compact_state_journal(journal)
+            except OSError:
+                pass
+
+
+def _replay_state_journal(state, config: dict):
+    """Apply a leftover state journal to a freshly read snapshot.
+
+    Only records written against this snapshot's generation are replayed; a
+    torn final line (crash mid-append) is dropped. The replayed state is
+    written back as the snapshot and the journal removed, so a run without
+    `state_journal` never sees stale records.
+    """
+    journal_path = get_state_journal_path(config)
+    if not isinstance(state, dict) or not os.path.exists(journal_path):
+        return state
+    replayed = 0
+    try:
+        with open(journal_path, "r") as f:
+            lines = f.read().splitlines()
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except ValueError:
+            header = {}  # torn header — the snapshot was written first and is complete
+        if isinstance(header, dict) and header.get("generation") == state.get("journal_generation"):
+            for line in lines[1:]:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # torn write — everything after it is lost anyway
+                _apply_state_ops(state, record.get("ops", []))
+                replayed += 1
+        if replayed:
+            log(f"  Replayed {replayed} state journal record(s)")
+            _atomic_json_write(get_state_path(config), state)
+        os.remove(journal_path)
+    except (OSError, TypeError, AttributeError) as e:
+        raise StateCorrupt(f"Could not replay state journal {journal_path}: {e}") from e
+    return state
 
 
 def get_state_path(config: dict) -> str:
@@ -181,11 +356,51 @@ def update_state_story(
     stories_dict[story_id] = entry
 
 
-def _store_attempt_diff(state: dict, story_id: str, diff: str, spec_key: str | None) -> None:
-    """Store last_attempt_diff in the correct location (single or epic mode)."""
+def _story_entry(state: dict, story_id: str, spec_key: str | None) -> dict:
+    """Return (creating if needed) a story's state entry in single or epic mode."""
     if spec_key is not None:
-        state["specs"][spec_key].setdefault("stories", {}).setdefault(story_id, {})["last_attempt_diff"] = diff
-    else:
-        state.setdefault("stories", {}).setdefault(story_id, {})["last_attempt_diff"] = diff
+        return state["specs"][spec_key].setdefault("stories", {}).setdefault(story_id, {})
+    return state.setdefault("stories", {}).setdefault(story_id, {})
+
+
+def _diff_blob_in_use(state: dict, sha: str) -> bool:
+    """True if any story in the state still references the diff blob `sha`."""
+    story_dicts = [state.get("stories", {})] + [
+        spec.get("stories", {}) for spec in state.get("specs", {}).values()
+    ]
+    return any(
+        entry.get("last_attempt_diff_blob") == sha
+        for stories in story_dicts for entry in stories.values()
+    )
+
+
+def _store_attempt_diff(
+    state: dict, story_id: str, diff: str, spec_key: str | None, project_dir: str
+) -> None:
+    """Store the last attempt's diff as a blob, keeping its hash in the story state.
+
+    The previous diff blob of the story is deleted unless another story
+    references the same content.
+    """
+    entry = _story_entry(state, story_id, spec_key)
+    previous = entry.get("last_attempt_diff_blob")
+    entry.pop("last_attempt_diff", None)  # inline diff from older state files
+    entry["last_attempt_diff_blob"] = put_blob(project_dir, diff)
+    if previous and previous != entry["last_attempt_diff_blob"] and not _diff_blob_in_use(state, previous):
+        delete_blob(project_dir, previous)
+
+
+def _drop_attempt_diff(state: dict, story_id: str, spec_key: str | None, project_dir: str) -> None:
+    """Forget a completed story's last attempt diff and garbage-collect its blob."""
+    entry = _story_entry(state, story_id, spec_key)
+    entry.pop("last_attempt_diff", None)
+    sha = entry.pop("last_attempt_diff_blob", None)
+    if sha and not _diff_blob_in_use(state, sha):
+        delete_blob(project_dir, sha)
 
 
+def load_attempt_diff(story_state: dict, project_dir: str) -> str:
+    """Return a story's last attempt diff (blob, or inline from older state files)."""
+    if story_state.get("last_attempt_diff_blob"):
+        return get_blob(project_dir, story_state["last_attempt_diff_blob"])
+    return story_state.get("last_attempt_diff", "")
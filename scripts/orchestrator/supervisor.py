@@ -2,26 +2,43 @@
 execute_orchestrator.py during the 2.4.0 refactor). See the package-level
 __init__ for the full public API."""
 from __future__ import annotations
+import atexit
 import json
 import os
 import platform
 import re
 import resource
 import subprocess
+import threading
 import time
 from datetime import datetime, timezone
 
-from .events import write_notification
+from .config import get_heartbeat_interval
+from .control import (
+    CONTROL_FILE,
+    PAUSE_FILE,
+    control_generation,
+    pop_submitted_control,
+    wait_for_control_change,
+)
+from .control_socket import get_control_socket_path
+from .events import publish_event, write_notification
+from .procfs import proc_available, process_tree
+from .sessions import get_session_progress
+from .specs import get_spec_index
 from .state import save_state, update_state_story
 from .utils import _atomic_json_write, log, now_iso, run_git
 
-PAUSE_POLL_INTERVAL = 10  # seconds between pause file checks
+PAUSE_POLL_INTERVAL = 10  # max seconds between pause file checks (the control watcher wakes sooner)
 PAUSE_MAX_WAIT = 86400  # 24 hours max pause
 PAUSE_LOG_INTERVAL = 60  # log reminder every minute
 HEALTH_FILE = os.path.join("kit_tools", "specs", ".execution-health.json")
-CONTROL_FILE = os.path.join("kit_tools", "specs", ".execution-control.json")
 MAX_ORCHESTRATOR_DURATION = 86400  # 24 hours — safety net
 
+# Session reader threads refresh the health file's "sessions" key while the
+# coordinator writes full snapshots; serialise the read-modify-write.
+_HEALTH_LOCK = threading.Lock()
+
 
 def get_health_path(config: dict) -> str:
     """Return absolute path to the health snapshot file."""
@@ -45,8 +62,22 @@ def _get_memory_usage_mb() -> float:
         return -1.0
 
 
-def _get_child_pids() -> list[int]:
-    """Get PIDs of child processes. Best-effort — returns empty on failure."""
+def _get_process_tree() -> list[dict]:
+    """Sample every descendant of the orchestrator (pid, ppid, name, depth, CPU, RSS)."""
+    return [
+        {k: p[k] for k in ("pid", "ppid", "name", "depth", "cpu_s", "rss_mb")}
+        for p in process_tree(os.getpid())
+    ]
+
+
+def _get_child_pids(tree: list[dict] | None = None) -> list[int]:
+    """Get PIDs of child processes. Best-effort — returns empty on failure.
+
+    Read from /proc (or from an already-sampled `tree`); forks `pgrep`
+    only where /proc is unavailable.
+    """
+    if tree is not None or proc_available():
+        return [p["pid"] for p in (tree if tree is not None else _get_process_tree()) if p["depth"] == 1]
     try:
         result = subprocess.run(
             ["pgrep", "-P", str(os.getpid())],
@@ -71,52 +102,144 @@ def write_health_snapshot(
     The supervisor (OG Claude session) reads this file to assess orchestrator health.
     """
     path = get_health_path(config)
-    try:
-        # Load existing to preserve history fields
-        existing = {}
-        if os.path.exists(path):
-            try:
-                with open(path, "r") as f:
-                    existing = json.load(f)
-            except (json.JSONDecodeError, OSError):
-                pass
+    with _HEALTH_LOCK:
+        try:
+            # Load existing to preserve history fields
+            existing = {}
+            if os.path.exists(path):
+                try:
+                    with open(path, "r") as f:
+                        existing = json.load(f)
+                except (json.JSONDecodeError, OSError):
+                    pass
+
+            # Count consecutive failures on current story
+            consecutive_failures = 0
+            if current_story_id and state:
+                stories = state.get("stories", {})
+                if state.get("specs"):
+                    # Epic mode — find the right spec's stories
+                    for sk, sv in state.get("specs", {}).items():
+                        if current_story_id in sv.get("stories", {}):
+                            stories = sv["stories"]
+                            break
+                story_state = stories.get(current_story_id, {})
+                if story_state.get("status") in ("retrying", "failed"):
+                    consecutive_failures = story_state.get("attempts", 0)
+
+            tree = _get_process_tree()
+
+            snapshot = {
+                "heartbeat": now_iso(),
+                "orchestrator_pid": os.getpid(),
+                "child_pids": _get_child_pids(tree),
+                "process_tree": tree,
+                "memory_mb": round(_get_memory_usage_mb(), 1),
+                "event": event,
+                "current_story_id": current_story_id,
+                "current_attempt": current_attempt,
+                "consecutive_failures": consecutive_failures,
+                "status": state.get("status", "unknown") if state else "unknown",
+                "started_at": state.get("started_at", "") if state else "",
+                "stories_completed": _count_completed_stories(state),
+                "stories_total": _count_total_stories(state),
+                "parallel": state.get("parallel") if state else None,
+                "sessions": get_session_progress(),
+                "session_resources": state.get("session_resources") if state else None,
+                "last_control_action": existing.get("last_control_action"),
+                "last_control_at": existing.get("last_control_at"),
+                "control_socket": get_control_socket_path(),
+            }
 
-        # Count consecutive failures on current story
-        consecutive_failures = 0
-        if current_story_id and state:
-            stories = state.get("stories", {})
-            if state.get("specs"):
-                # Epic mode — find the right spec's stories
-                for sk, sv in state.get("specs", {}).items():
-                    if current_story_id in sv.get("stories", {}):
-                        stories = sv["stories"]
-                        break
-            story_state = stories.get(current_story_id, {})
-            if story_state.get("status") in ("retrying", "failed"):
-                consecutive_failures = story_state.get("attempts", 0)
-
-        child_pids = _get_child_pids()
-
-        snapshot = {
-            "heartbeat": now_iso(),
-            "orchestrator_pid": os.getpid(),
-            "child_pids": child_pids,
-            "memory_mb": round(_get_memory_usage_mb(), 1),
-            "event": event,
-            "current_story_id": current_story_id,
-            "current_attempt": current_attempt,
-            "consecutive_failures": consecutive_failures,
-            "status": state.get("status", "unknown") if state else "unknown",
-            "started_at": state.get("started_at", "") if state else "",
-            "stories_completed": _count_completed_stories(state),
-            "stories_total": _count_total_stories(state),
-            "last_control_action": existing.get("last_control_action"),
-            "last_control_at": existing.get("last_control_at"),
-        }
-
-        _atomic_json_write(path, snapshot)
-    except OSError as e:
-        log(f"  WARNING: Failed to write health snapshot: {e}")
+            _atomic_json_write(path, snapshot)
+            publish_event("health", snapshot)
+        except OSError as e:
+            log(f"  WARNING: Failed to write health snapshot: {e}")
+
+
+def write_session_progress(config: dict) -> None:
+    """Refresh only the live `sessions` progress in the health snapshot.
+
+    Safe to call from session reader threads: touches the health file, never
+    the state dict. No-op until the first full snapshot exists.
+    """
+    path = get_health_path(config)
+    with _HEALTH_LOCK:
+        try:
+            with open(path, "r") as f:
+                snapshot = json.load(f)
+            snapshot["sessions"] = get_session_progress()
+            snapshot["sessions_updated_at"] = now_iso()
+            _atomic_json_write(path, snapshot)
+        except (json.JSONDecodeError, OSError):
+            pass
+
+
+def write_heartbeat(config: dict) -> None:
+    """Refresh the live fields of the health snapshot (heartbeat thread).
+
+    Updates `heartbeat`, `process_tree`, `child_pids`, `memory_mb` and
+    `sessions`, keeping the last lifecycle `event` and the story fields
+    written by the coordinator. Never touches the state dict, so it is safe
+    off the coordinator thread. No-op until the first full snapshot exists.
+    """
+    path = get_health_path(config)
+    tree = _get_process_tree()
+    with _HEALTH_LOCK:
+        try:
+            with open(path, "r") as f:
+                snapshot = json.load(f)
+            snapshot.update({
+                "heartbeat": now_iso(),
+                "child_pids": _get_child_pids(tree),
+                "process_tree": tree,
+                "memory_mb": round(_get_memory_usage_mb(), 1),
+                "sessions": get_session_progress(),
+            })
+            _atomic_json_write(path, snapshot)
+        except (json.JSONDecodeError, OSError):
+            return
+    publish_event("health", snapshot)
+
+
+_HEARTBEAT: dict = {}
+_HEARTBEAT_LOCK = threading.Lock()
+
+
+def start_heartbeat(config: dict) -> None:
+    """Write a heartbeat every `heartbeat_interval` seconds while sessions run.
+
+    Between sessions the coordinator's own lifecycle snapshots keep the
+    file current, so idle ticks write nothing.
+    """
+    interval = get_heartbeat_interval(config)
+    if not interval:
+        return
+    with _HEARTBEAT_LOCK:
+        if _HEARTBEAT:
+            return
+        stop = threading.Event()
+
+        def beat() -> None:
+            while not stop.wait(interval):
+                if get_session_progress():
+                    write_heartbeat(config)
+
+        thread = threading.Thread(target=beat, name="kit-heartbeat", daemon=True)
+        _HEARTBEAT.update(stop=stop, thread=thread)
+        thread.start()
+
+
+def stop_heartbeat() -> None:
+    """Stop the heartbeat thread, if running."""
+    with _HEARTBEAT_LOCK:
+        stop, thread = _HEARTBEAT.pop("stop", None), _HEARTBEAT.pop("thread", None)
+    if stop is not None:
+        stop.set()
+        thread.join(timeout=5)
+
+
+atexit.register(stop_heartbeat)
 
 
 def _count_completed_stories(state: dict | None) -> int:
@@ -149,12 +272,35 @@ def _count_total_stories(state: dict | None) -> int:
     return count
 
 
+def _record_control_action(config: dict, control: dict) -> None:
+    """Note a received control action in the health snapshot and the event stream."""
+    received_at = now_iso()
+    publish_event("control", {"last_control_action": control.get("action"), "last_control_at": received_at})
+    health_path = get_health_path(config)
+    if os.path.exists(health_path):
+        with _HEALTH_LOCK:
+            try:
+                with open(health_path, "r") as f:
+                    health = json.load(f)
+                health["last_control_action"] = control.get("action")
+                health["last_control_at"] = received_at
+                _atomic_json_write(health_path, health)
+            except (json.JSONDecodeError, OSError):
+                pass
+
+
 def read_control_file(config: dict) -> dict | None:
-    """Read and consume the supervisor control file.
+    """Read and consume the next supervisor control action.
 
-    Returns the control action dict if present, or None.
+    Actions submitted over the control socket come first, then the control
+    file. Returns the control action dict if present, or None.
     The control file is deleted after reading to prevent re-processing.
     """
+    control = pop_submitted_control()
+    if control is not None:
+        log(f"  Supervisor control action received (socket): {control.get('action', 'unknown')}")
+        _record_control_action(config, control)
+        return control
     path = get_control_path(config)
     if not os.path.exists(path):
         return None
@@ -164,19 +310,7 @@ def read_control_file(config: dict) -> dict | None:
         # Consume: delete the file so we don't re-process
         os.remove(path)
         log(f"  Supervisor control action received: {control.get('action', 'unknown')}")
-
-        # Record in health snapshot
-        health_path = get_health_path(config)
-        if os.path.exists(health_path):
-            try:
-                with open(health_path, "r") as f:
-                    health = json.load(f)
-                health["last_control_action"] = control.get("action")
-                health["last_control_at"] = now_iso()
-                _atomic_json_write(health_path, health)
-            except (json.JSONDecodeError, OSError):
-                pass
-
+        _record_control_action(config, control)
         return control
     except (json.JSONDecodeError, OSError) as e:
         log(f"  WARNING: Failed to read control file: {e}")
@@ -214,7 +348,7 @@ def handle_control_action(
             severity="warning",
         )
         # Create pause file so the orchestrator's existing pause logic kicks in
-        pause_path = os.path.join(config["project_dir"], "kit_tools", ".pause_execution")
+        pause_path = os.path.join(config["project_dir"], PAUSE_FILE)
         try:
             with open(pause_path, "w") as f:
                 f.write(f"Supervisor pause: {reason}\n")
@@ -318,15 +452,14 @@ def _handle_split_story(
         return "continue"
 
     try:
-        with open(spec_path, "r") as f:
-            spec_content = f.read()
+        index = get_spec_index(spec_path)
 
         # Find the original story section (### US-XXX: Title)
         story_pattern = re.compile(
             rf"(### {re.escape(story_id)}:.*?)(?=\n### US-|\n## |\Z)",
             re.DOTALL
         )
-        match = story_pattern.search(spec_content)
+        match = story_pattern.search(index.content)
         if not match:
             log(f"  WARNING: Could not find {story_id} section in spec file")
             return "continue"
@@ -348,10 +481,7 @@ def _handle_split_story(
                 replacement += f"\n**Implementation Hints:**\n{ns['hints']}\n"
             replacement += "\n"
 
-        spec_content = spec_content[:match.start()] + replacement + spec_content[match.end():]
-
-        with open(spec_path, "w") as f:
-            f.write(spec_content)
+        index.apply_edit(match.start(), match.end(), replacement)
 
         log(f"  Updated spec file: {spec_path}")
 
@@ -407,17 +537,22 @@ def check_orchestrator_duration(state: dict) -> bool:
 
 def pause_file_exists(project_dir: str) -> bool:
     """Check for kit_tools/.pause_execution file."""
-    return os.path.exists(os.path.join(project_dir, "kit_tools", ".pause_execution"))
+    return os.path.exists(os.path.join(project_dir, PAUSE_FILE))
 
 
 def wait_for_pause_removal(project_dir: str, config: dict | None = None) -> None:
-    """Poll until the pause file is removed, with timeout."""
+    """Wait until the pause file is removed, with timeout.
+
+    Wakes as soon as the control watcher sees the pause file change, and
+    re-checks at least every PAUSE_POLL_INTERVAL seconds regardless.
+    """
     log("Paused. Remove kit_tools/.pause_execution to resume.")
-    elapsed = 0
+    started = time.monotonic()
     last_reminder = 0
+    generation = control_generation()
     while pause_file_exists(project_dir):
-        time.sleep(PAUSE_POLL_INTERVAL)
-        elapsed += PAUSE_POLL_INTERVAL
+        generation = wait_for_control_change(generation, PAUSE_POLL_INTERVAL)
+        elapsed = int(time.monotonic() - started)
         if elapsed - last_reminder >= PAUSE_LOG_INTERVAL:
             log(f"  Still paused ({elapsed}s elapsed). Remove kit_tools/.pause_execution to resume.")
             last_reminder = elapsed
@@ -430,9 +565,8 @@ def wait_for_pause_removal(project_dir: str, config: dict | None = None) -> None
                     f"Auto-resumed after {PAUSE_MAX_WAIT}s pause.",
                     severity="warning",
                 )
-            pause_path = os.path.join(project_dir, "kit_tools", ".pause_execution")
             try:
-                os.remove(pause_path)
+                os.remove(os.path.join(project_dir, PAUSE_FILE))
             except OSError:
                 pass
             break
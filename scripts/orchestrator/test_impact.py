@@ -0,0 +1,339 @@
+"""Part of the KitTools orchestrator package (split from the monolithic
+execute_orchestrator.py during the 2.4.0 refactor). See the package-level
+__init__ for the full public API.
+
+Test-impact index built from coverage.py per-test contexts (pytest-cov's
+`--cov-context=test`). `kit_tools/testing/test-impact.json` maps each
+source line range to the pytest node IDs that execute it, at a recorded
+commit. Changed lines are found by diffing that commit against the
+checkout, so T0 test selection and regression checks run exactly the tests
+that touch the change. After each passing story the index is updated
+incrementally: line ranges are shifted through the diff and only the
+impacted or new tests are re-run under coverage.
+"""
+from __future__ import annotations
+import json
+import os
+import re
+import shutil
+import tempfile
+
+from .git_ops import get_head_commit
+from .sessions import run_command
+from .utils import _atomic_json_write, log, now_iso, run_git
+
+TEST_IMPACT_FILE = os.path.join("kit_tools", "testing", "test-impact.json")
+TEST_IMPACT_TIMEOUT = 1800  # seconds for a coverage run
+IMPORT_CONTEXT = ""  # coverage context of lines run at import/collection time
+
+_HUNK_PATTERN = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_TEST_FILE_PATTERN = re.compile(r"(^|/)(test_[^/]*|[^/]*_test)\.py$")
+
+
+def get_test_impact_enabled(config: dict) -> bool:
+    """Return True when `test_impact` is set in the config."""
+    return config.get("test_impact") is True
+
+
+def get_test_impact_path(project_dir: str) -> str:
+    """Return absolute path to the test-impact index."""
+    return os.path.join(project_dir, TEST_IMPACT_FILE)
+
+
+def load_test_impact(project_dir: str) -> dict | None:
+    """Load the test-impact index, or None if missing or unreadable."""
+    path = get_test_impact_path(project_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            index = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        log("  WARNING: test-impact.json corrupted — ignoring it")
+        return None
+    if not isinstance(index, dict) or not isinstance(index.get("files"), dict) or not index.get("commit"):
+        return None
+    return index
+
+
+def save_test_impact(project_dir: str, index: dict) -> None:
+    """Write the test-impact index. Best-effort — swallows errors."""
+    try:
+        index["meta"]["updated_at"] = now_iso()
+        _atomic_json_write(get_test_impact_path(project_dir), index)
+    except OSError as e:
+        log(f"  WARNING: Failed to write test-impact index: {e}")
+
+
+def _to_ranges(lines) -> list[list[int]]:
+    """Collapse line numbers into sorted inclusive `[start, end]` ranges."""
+    ranges: list[list[int]] = []
+    for line in sorted(set(lines)):
+        if ranges and line == ranges[-1][1] + 1:
+            ranges[-1][1] = line
+        else:
+            ranges.append([line, line])
+    return ranges
+
+
+def _run_coverage(project_dir: str, test_args: list[str]) -> dict[str, dict[str, list[int]]] | None:
+    """Run pytest under coverage with per-test contexts.
+
+    Returns `{source file: {node id or IMPORT_CONTEXT: [lines]}}`, or None
+    when coverage/pytest-cov is unavailable or the run timed out. Failing
+    tests still contribute their coverage.
+    """
+    scratch = tempfile.mkdtemp(prefix="kit-impact-")
+    rcfile = os.path.join(scratch, "coveragerc")
+    report = os.path.join(scratch, "coverage.json")
+    try:
+        with open(rcfile, "w") as f:
+            f.write(f"[run]\ndata_file = {os.path.join(scratch, '.coverage')}\n")
+        cmd = [
+            "python3", "-m", "pytest", *test_args, "-q", "-p", "no:cacheprovider",
+            f"--cov={project_dir}", f"--cov-config={rcfile}", "--cov-context=test", "--cov-report=",
+        ]
+        returncode, stdout, stderr_out = run_command(cmd, project_dir, TEST_IMPACT_TIMEOUT)
+        if returncode is None:
+            log(f"  WARNING: Test-impact coverage run timed out after {TEST_IMPACT_TIMEOUT}s")
+            return None
+        if returncode not in (0, 1):
+            log(f"  WARNING: Test-impact coverage run failed (exit {returncode}): "
+                f"{(stderr_out or stdout).strip()[-200:]}")
+            return None
+        returncode, stdout, stderr_out = run_command(
+            ["python3", "-m", "coverage", "json", "--show-contexts", f"--rcfile={rcfile}", "-o", report],
+            project_dir, 300,
+        )
+        if returncode != 0:
+            log(f"  WARNING: coverage json export failed: {(stderr_out or stdout).strip()[-200:]}")
+            return None
+        with open(report, "r") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        log(f"  WARNING: Test-impact coverage run error: {e}")
+        return None
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    coverage: dict[str, dict[str, list[int]]] = {}
+    for path, info in data.get("files", {}).items():
+        if os.path.isabs(path):
+            path = os.path.relpath(path, project_dir)
+        per_test = coverage.setdefault(path.replace(os.sep, "/"), {})
+        for line, contexts in (info.get("contexts") or {}).items():
+            for context in contexts:
+                # pytest-cov contexts are "<node id>|setup", "|run" or "|teardown"
+                test_id = context.rsplit("|", 1)[0] if "|" in context else context
+                per_test.setdefault(test_id, []).append(int(line))
+    return coverage
+
+
+def build_test_impact_index(project_dir: str) -> dict | None:
+    """Run the whole pytest suite under coverage and write a fresh index."""
+    commit = get_head_commit(project_dir)
+    if not commit:
+        return None
+    log("  Building test-impact index (full test run under coverage)...")
+    coverage = _run_coverage(project_dir, [])
+    if coverage is None:
+        return None
+    index = {
+        "meta": {"created_at": now_iso(), "updated_at": now_iso(), "source": "coverage.py contexts"},
+        "commit": commit,
+        "files": {
+            path: {test_id: _to_ranges(lines) for test_id, lines in per_test.items()}
+            for path, per_test in coverage.items()
+        },
+    }
+    save_test_impact(project_dir, index)
+    tests = {t for per_test in coverage.values() for t in per_test if t != IMPORT_CONTEXT}
+    log(f"  Test-impact index: {len(tests)} tests over {len(coverage)} files")
+    return index
+
+
+def ensure_test_impact_index(config: dict, test_command: str | None) -> None:
+    """Build the index once when `test_impact` is enabled and none exists yet."""
+    if not get_test_impact_enabled(config) or not test_command or "pytest" not in test_command:
+        return
+    project_dir = config["project_dir"]
+    if load_test_impact(project_dir) is None:
+        build_test_impact_index(project_dir)
+
+
+def _diff_hunks(work_dir: str, base: str, files: list[str] | None = None) -> dict[str, list[tuple[int, int, int, int]]]:
+    """Return `{path: [(old_start, old_count, new_start, new_count)]}` for `base` → HEAD.
+
+    Paths are the pre-change names, since they key into an index built at
+    `base`. Returns {} when `base` is unknown to git.
+    """
+    args = ["diff", "-U0", "--no-color", "--no-ext-diff", "--no-renames", f"{base}..HEAD"]
+    if files:
+        args += ["--"] + files
+    result = run_git(args, work_dir)
+    if result.returncode != 0:
+        return {}
+    hunks: dict[str, list[tuple[int, int, int, int]]] = {}
+    old_path = new_path = None
+    for line in result.stdout.splitlines():
+        if line.startswith("--- "):
+            old_path = None if line == "--- /dev/null" else line[6:]
+        elif line.startswith("+++ "):
+            new_path = None if line == "+++ /dev/null" else line[6:]
+            hunks.setdefault(old_path or new_path, [])
+        else:
+            match = _HUNK_PATTERN.match(line)
+            if match:
+                old_start, old_count, new_start, new_count = match.groups()
+                hunks[old_path or new_path].append((
+                    int(old_start), 1 if old_count is None else int(old_count),
+                    int(new_start), 1 if new_count is None else int(new_count),
+                ))
+    return hunks
+
+
+def _touched_lines(hunks: list[tuple[int, int, int, int]]) -> set[int]:
+    """Old-side lines a change touches; a pure insertion touches its neighbours."""
+    touched: set[int] = set()
+    for old_start, old_count, _, _ in hunks:
+        if old_count:
+            touched.update(range(old_start, old_start + old_count))
+        else:
+            touched.update((old_start, old_start + 1))
+    return touched
+
+
+def _in_ranges(ranges: list[list[int]], lines: set[int]) -> bool:
+    return any(start <= line <= end for start, end in ranges for line in lines)
+
+
+def select_impacted_tests(
+    project_dir: str, work_dir: str | None = None, changed_files: list[str] | None = None,
+) -> tuple[list[str], list[str]] | None:
+    """Pick the tests that execute lines changed between the index commit and HEAD.
+
+    `project_dir` holds the index; the diff is taken in `work_dir` (defaults
+    to `project_dir`), optionally limited to `changed_files`. A change to an
+    import-time line (module level, decorators, signatures) selects every
+    test that runs any line of that file. Changed or added test files are
+    always selected whole, so a story's new tests run first.
+
+    Returns `(node_ids, uncovered)` where `uncovered` lists changed files no
+    selected test covers (new files, non-Python files, or edits to lines no
+    test executes) so callers can fall back to other matching. Returns None
+    without a usable index.
+    """
+    index = load_test_impact(project_dir)
+    if index is None:
+        return None
+    hunks = _diff_hunks(work_dir or project_dir, index["commit"], changed_files)
+    if not hunks and run_git(["cat-file", "-e", f"{index['commit']}^{{commit}}"], work_dir or project_dir).returncode != 0:
+        return None  # index commit no longer exists (history rewritten)
+    selected: set[str] = set()
+    uncovered: list[str] = []
+    test_files = {
+        path for path in hunks
+        if _TEST_FILE_PATTERN.search(path) and os.path.exists(os.path.join(work_dir or project_dir, path))
+    }
+    for path, file_hunks in hunks.items():
+        per_test = index["files"].get(path, {})
+        touched = _touched_lines(file_hunks)
+        import_time = _in_ranges(per_test.get(IMPORT_CONTEXT, []), touched)
+        hits = {
+            test_id for test_id, ranges in per_test.items()
+            if test_id != IMPORT_CONTEXT and (import_time or _in_ranges(ranges, touched))
+        }
+        if not hits and path not in test_files:
+            uncovered.append(path)
+        selected |= hits
+    # Whole changed test files replace their individual node IDs
+    selected = {t for t in selected if t.split("::", 1)[0] not in test_files} | test_files
+    return sorted(selected), sorted(uncovered)
+
+
+def _remap_ranges(ranges: list[list[int]], hunks: list[tuple[int, int, int, int]]) -> list[list[int]]:
+    """Shift old-side line ranges to new-side numbers; changed lines are dropped."""
+    ordered = sorted(hunks)
+    mapped = []
+    for start, end in ranges:
+        for line in range(start, end + 1):
+            offset = 0
+            for old_start, old_count, _, new_count in ordered:
+                if old_count == 0:
+                    if line > old_start:
+                        offset += new_count
+                elif line >= old_start + old_count:
+                    offset += new_count - old_count
+                elif line >= old_start:
+                    offset = None
+                    break
+                else:
+                    break
+            if offset is not None:
+                mapped.append(line + offset)
+    return _to_ranges(mapped)
+
+
+def update_test_impact_index(config: dict) -> None:
+    """Bring the index from its recorded commit up to the feature branch HEAD.
+
+    Line ranges of untouched code are shifted through the diff; tests that
+    ran changed lines, and test files added or edited since, are re-run
+    under coverage and their entries replaced. No-op unless `test_impact`
+    is enabled and an index exists.
+    """
+    if not get_test_impact_enabled(config):
+        return
+    project_dir = config["project_dir"]
+    index = load_test_impact(project_dir)
+    if index is None:
+        return
+    head = get_head_commit(project_dir)
+    if not head or head == index["commit"]:
+        return
+    picked = select_impacted_tests(project_dir)
+    if picked is None:
+        # Index commit unreachable — rebuild from scratch
+        build_test_impact_index(project_dir)
+        return
+    impacted = set(picked[0])
+    hunks = _diff_hunks(project_dir, index["commit"])
+    changed_tests = [
+        path for path in hunks
+        if _TEST_FILE_PATTERN.search(path) and os.path.exists(os.path.join(project_dir, path))
+    ]
+
+    files: dict[str, dict[str, list[list[int]]]] = {}
+    for path, per_test in index["files"].items():
+        if path in hunks and not os.path.exists(os.path.join(project_dir, path)):
+            continue  # deleted
+        kept = {}
+        for test_id, ranges in per_test.items():
+            if test_id in impacted or test_id.split("::", 1)[0] in changed_tests:
+                continue  # re-measured below
+            ranges = _remap_ranges(ranges, hunks[path]) if path in hunks else ranges
+            if ranges:
+                kept[test_id] = ranges
+        if kept:
+            files[path] = kept
+
+    rerun = sorted(
+        {t for t in impacted if t.split("::", 1)[0] not in changed_tests
+         and os.path.exists(os.path.join(project_dir, t.split("::", 1)[0]))}
+        | set(changed_tests)
+    )
+    if rerun:
+        coverage = _run_coverage(project_dir, rerun)
+        if coverage is None:
+            return  # leave the old index in place; it is still consistent at its commit
+        for path, per_test in coverage.items():
+            target = files.setdefault(path, {})
+            for test_id, lines in per_test.items():
+                if test_id == IMPORT_CONTEXT:
+                    lines = lines + [n for r in target.get(IMPORT_CONTEXT, []) for n in range(r[0], r[1] + 1)]
+                target[test_id] = _to_ranges(lines)
+
+    index["files"] = files
+    index["commit"] = head
+    save_test_impact(project_dir, index)
+    log(f"  Test-impact index updated to {head[:8]} ({len(rerun)} tests/files re-measured)")
@@ -2,22 +2,31 @@
 execute_orchestrator.py during the 2.4.0 refactor). See the package-level
 __init__ for the full public API."""
 from __future__ import annotations
+import asyncio
+import fnmatch
 import json
 import os
 import re
-import subprocess
+import shlex
+import threading
+import time
 
 import yaml
 
-from .sessions import _kill_process_group
+from .git_ops import get_git_repo
+from .sessions import run_command, run_command_async, run_on_engine
 from .state import update_state_story
+from .test_impact import select_impacted_tests
 
-from .utils import _atomic_json_write, log, now_iso
+from .utils import _atomic_json_write, log, now_iso, run_git
 
 HEURISTIC_MATCH_CAP = 3  # max heuristic test file matches before skipping
 DIR_SCOPE_MATCH_CAP = 5  # max directory-scoped heuristic matches
 REGRESSION_TEST_FILE_CAP = 30  # max test files for regression check
 REGRESSION_TIMEOUT = 120  # seconds for regression subprocess
+REGRESSION_WORKERS = max(1, min(4, os.cpu_count() or 1))  # concurrent regression shards
+REGRESSION_SHARD_MAX = 16  # above this many test files, files are packed into shards
+REGRESSION_NODE_ID_CAP = 500  # above this, impacted node IDs are run as whole files
 TEST_METRICS_FILE = os.path.join("kit_tools", "testing", "test-metrics.json")
 
 
@@ -104,12 +113,16 @@ def update_test_metrics(project_dir: str, verify_result: dict | None, story_id:
 
 
 def update_test_metrics_from_regression(
-    project_dir: str, test_files: list[str], passed: bool, story_id: str
+    project_dir: str, test_files: list[str], passed: bool, story_id: str,
+    duration_s: float | None = None, timed_out: bool = False,
 ) -> None:
     """Record regression check results in test metrics.
 
     Unlike verifier results, regression checks are run by the orchestrator
-    directly so we know exactly which files were tested.
+    directly so we know exactly which files were tested. `duration_s` is
+    the wall-clock of a single-file shard (recorded only then, so it can
+    feed longest-first scheduling); `timed_out` marks a shard killed at the
+    timeout.
     """
     if not test_files:
         return
@@ -136,13 +149,91 @@ def update_test_metrics_from_regression(
         else:
             t["failures"] += 1
             t["last_failure"] = now
+        if timed_out:
+            t["timeouts"] = t.get("timeouts", 0) + 1
+        if duration_s is not None and len(test_files) == 1:
+            t["total_duration_s"] = round(t.get("total_duration_s", 0.0) + duration_s, 2)
         t["last_run"] = now
         t["last_story_id"] = story_id
 
     save_test_metrics(project_dir, metrics)
 
 
+# Files the project profile is derived from, relative to the project dir
+_PROFILE_FILES = (
+    "package.json", "pyproject.toml", "pytest.ini", "Makefile",
+    os.path.join("kit_tools", "testing", "TESTING_GUIDE.md"),
+)
+PROJECT_PROFILE_MAX = 16  # checkouts kept (main checkout plus recent attempt worktrees)
+# realpath -> (stamp of _PROFILE_FILES, profile); rebuilt when any stamp changes
+_PROJECT_PROFILES: dict[str, tuple[tuple, dict]] = {}
+_PROJECT_PROFILES_LOCK = threading.Lock()
+
+
+def _profile_stamp(project_dir: str) -> tuple:
+    stamp = []
+    for name in _PROFILE_FILES:
+        try:
+            st = os.stat(os.path.join(project_dir, name))
+            stamp.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def get_project_profile(project_dir: str) -> dict:
+    """Return the cached test profile of a checkout.
+
+    Holds `test_command` (see `detect_test_command`), `test_mapping` (see
+    `parse_test_mapping`) and `mapping_rules`: `(source pattern, compiled
+    regex, [test patterns])` per mapping entry. Rebuilt automatically when
+    the mtime or size of any file it was derived from (package.json,
+    pyproject.toml, pytest.ini, Makefile, TESTING_GUIDE.md) changes.
+    """
+    key = os.path.realpath(project_dir)
+    stamp = _profile_stamp(project_dir)
+    with _PROJECT_PROFILES_LOCK:
+        cached = _PROJECT_PROFILES.get(key)
+        if cached and cached[0] == stamp:
+            return cached[1]
+    mapping = _parse_test_mapping_uncached(project_dir)
+    profile = {
+        "test_command": _detect_test_command_uncached(project_dir),
+        "test_mapping": mapping,
+        "mapping_rules": [
+            (pattern, re.compile(fnmatch.translate(pattern)), [t for t in tests.split() if t])
+            for pattern, tests in mapping.items()
+        ],
+    }
+    with _PROJECT_PROFILES_LOCK:
+        _PROJECT_PROFILES.pop(key, None)
+        while len(_PROJECT_PROFILES) >= PROJECT_PROFILE_MAX:
+            del _PROJECT_PROFILES[next(iter(_PROJECT_PROFILES))]
+        _PROJECT_PROFILES[key] = (stamp, profile)
+    return profile
+
+
 def parse_test_mapping(project_dir: str) -> dict[str, str]:
+    """Return test_mapping from TESTING_GUIDE.md (source glob -> test patterns).
+
+    Cached per checkout (see `get_project_profile`); the caller gets a copy.
+    """
+    return dict(get_project_profile(project_dir)["test_mapping"])
+
+
+def _mapped_tests(src_file: str, rules: list) -> list[str] | None:
+    """Test patterns mapped to `src_file`, or None when no mapping pattern matches.
+
+    An empty list means the file is mapped, but to no tests (config-only files).
+    """
+    tests = None
+    for _, regex, test_patterns in rules:
+        if regex.match(src_file):
+            tests = (tests or []) + test_patterns
+    return tests
+
+
+def _parse_test_mapping_uncached(project_dir: str) -> dict[str, str]:
     """Parse test_mapping from TESTING_GUIDE.md if available.
 
     Looks for a YAML code block under a '## Test Mapping' or 'test_mapping:' section.
@@ -201,25 +292,148 @@ def _filter_source_files(changed_files: list[str]) -> list[str]:
     return source_files
 
 
+# Per-checkout file index from `git ls-files`: realpath -> {"head", "files",
+# "by_name"}. Built once and brought forward from `git diff --name-only` when
+# HEAD moves, so heuristic lookups never walk the tree (node_modules, .venv).
+_FILE_INDEXES: dict[str, dict] = {}
+_FILE_INDEXES_LOCK = threading.Lock()
+_XDIST_AVAILABLE: dict[str, bool] = {}  # project dir -> pytest-xdist importable
+FILE_INDEX_MAX = 8  # checkouts kept (main checkout plus recent attempt worktrees)
+
+
+def _index_add(index: dict, path: str) -> None:
+    if path not in index["files"]:
+        index["files"].add(path)
+        index["by_name"].setdefault(os.path.basename(path), set()).add(path)
+
+
+def _index_discard(index: dict, path: str) -> None:
+    if path in index["files"]:
+        index["files"].discard(path)
+        index["by_name"].get(os.path.basename(path), set()).discard(path)
+
+
+def get_file_index(project_dir: str) -> dict | None:
+    """Return the file index for the checkout at `project_dir`, or None outside git.
+
+    Lists tracked plus untracked-but-not-ignored files (`git ls-files
+    --cached --others --exclude-standard`), so `.gitignore`d trees are never
+    visited. When HEAD has moved since the last call, only the paths in
+    `git diff --name-only <old>..HEAD` are re-checked.
+    """
+    key = os.path.realpath(project_dir)
+    head = get_git_repo(project_dir).head_commit()
+    with _FILE_INDEXES_LOCK:
+        index = _FILE_INDEXES.get(key)
+        if index is not None and index["head"] != head:
+            diff = run_git(["diff", "--name-only", "-z", f"{index['head']}..{head}"], project_dir)
+            if diff.returncode != 0:
+                index = None
+            else:
+                for path in filter(None, diff.stdout.split("\0")):
+                    if os.path.isfile(os.path.join(project_dir, path)):
+                        _index_add(index, path)
+                    else:
+                        _index_discard(index, path)
+                index["head"] = head
+        if index is None:
+            listed = run_git(["ls-files", "-z", "--cached", "--others", "--exclude-standard"], project_dir)
+            if listed.returncode != 0:
+                return None
+            index = {"head": head, "files": set(), "by_name": {}}
+            for path in filter(None, listed.stdout.split("\0")):
+                _index_add(index, path)
+            _FILE_INDEXES.pop(key, None)
+            while len(_FILE_INDEXES) >= FILE_INDEX_MAX:
+                del _FILE_INDEXES[next(iter(_FILE_INDEXES))]
+        _FILE_INDEXES[key] = index
+        return index
+
+
+def _find_files_named(project_dir: str, basename: str, extra: list[str] | None = None) -> list[str]:
+    """Return project-relative paths whose basename is `basename`.
+
+    Uses the file index (plus `extra` paths, e.g. uncommitted changed files
+    of the attempt); falls back to a recursive glob outside git.
+    """
+    index = get_file_index(project_dir)
+    if index is None:
+        import glob as glob_mod
+        matches = glob_mod.glob(os.path.join(project_dir, "**", basename), recursive=True)
+        return [os.path.relpath(m, project_dir) for m in matches]
+    found = set(index["by_name"].get(basename, ()))
+    found.update(
+        p for p in extra or []
+        if os.path.basename(p) == basename and os.path.isfile(os.path.join(project_dir, p))
+    )
+    return sorted(found)
+
+
+def _glob_to_regex(pattern: str) -> re.Pattern:
+    """Compile a recursive glob (`glob.glob(..., recursive=True)` semantics) to a regex."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end]
+            out.append("[^" + body[1:] + "]" if body.startswith("!") else "[" + body + "]")
+            i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
 def _resolve_test_files(patterns: set[str], project_dir: str) -> list[str]:
-    """Resolve a set of test file paths/globs to existing files."""
+    """Resolve a set of test file paths/globs to existing files.
+
+    Globs are matched against the file index rather than walking the tree.
+    """
     import glob as glob_mod
+    index = None
     existing = []
     for t in patterns:
         if "*" in t or "?" in t:
-            matches = glob_mod.glob(os.path.join(project_dir, t), recursive=True)
-            if matches:
+            index = index or get_file_index(project_dir)
+            if index is None:
+                if glob_mod.glob(os.path.join(project_dir, t), recursive=True):
+                    existing.append(t)
+                continue
+            regex = _glob_to_regex(t)
+            if any(regex.match(p) for p in index["files"]):
                 existing.append(t)
         elif os.path.exists(os.path.join(project_dir, t)):
             existing.append(t)
     return existing
 
 
-def _build_test_command(test_files: list[str], test_command: str) -> str | None:
-    """Build a targeted test command for the given test files and runner."""
+def _build_test_command(
+    test_files: list[str], test_command: str, project_dir: str | None = None
+) -> str | None:
+    """Build a targeted test command for the given test files and runner.
+
+    With `project_dir`, files are ordered failure-first from test-metrics
+    history (see `order_tests_failure_first`) so the fail-fast flag stops
+    early; otherwise they are sorted by name.
+    """
     if not test_files:
         return None
-    test_files_str = " ".join(sorted(test_files))
+    ordered = order_tests_failure_first(project_dir, test_files) if project_dir else sorted(test_files)
+    # Node IDs ("file.py::test[param]") are quoted; file globs stay for the shell
+    test_files_str = " ".join(shlex.quote(t) if "::" in t else t for t in ordered)
     if "pytest" in test_command:
         return f"python3 -m pytest {test_files_str} -x"
     elif test_command == "npm test" or "jest" in test_command:
@@ -230,7 +444,8 @@ def _build_test_command(test_files: list[str], test_command: str) -> str | None:
 
 
 def detect_related_tests(
-    changed_files: list[str], project_dir: str, test_command: str | None
+    changed_files: list[str], project_dir: str, test_command: str | None,
+    impact_dir: str | None = None,
 ) -> dict[str, str | None]:
     """Derive targeted test commands from changed files with tiered matching.
 
@@ -240,8 +455,12 @@ def detect_related_tests(
 
     Strategy:
     1. Check TESTING_GUIDE.md for explicit test_mapping → T0
-    2. Heuristic: directory-scoped first, then global fallback → T1
-    3. Apply match caps: HEURISTIC_MATCH_CAP (global), DIR_SCOPE_MATCH_CAP (dir-scoped)
+    2. With `impact_dir` (the project dir holding a test-impact index), add
+       the tests that execute the changed lines, plus changed test files →
+       T0; heuristics then only look at files whose changed lines no test
+       executes
+    3. Heuristic: directory-scoped first, then global fallback → T1
+    4. Apply match caps: HEURISTIC_MATCH_CAP (global), DIR_SCOPE_MATCH_CAP (dir-scoped)
     """
     result: dict[str, str | None] = {"t0": None, "t1": None}
     if not changed_files or not test_command:
@@ -251,20 +470,21 @@ def detect_related_tests(
     if not source_files:
         return result
 
-    import fnmatch as fnmatch_mod
-    import glob as glob_mod
-
     # --- T0: Explicit test_mapping ---
-    test_mapping = parse_test_mapping(project_dir)
+    rules = get_project_profile(project_dir)["mapping_rules"]
     t0_tests: set[str] = set()
 
-    if test_mapping:
-        for src_file in source_files:
-            for pattern, test_pattern in test_mapping.items():
-                if fnmatch_mod.fnmatch(src_file, pattern):
-                    for tp in test_pattern.split():
-                        if tp:  # skip empty mappings (config-only files mapped to "")
-                            t0_tests.add(tp)
+    for src_file in source_files:
+        # Empty mappings (config-only files mapped to "") add nothing
+        t0_tests.update(_mapped_tests(src_file, rules) or [])
+
+    # --- T0: Tests that run the changed lines (test-impact index) ---
+    t0_impacted: list[str] = []
+    if impact_dir and "pytest" in test_command:
+        impact = select_impacted_tests(impact_dir, project_dir, changed_files)
+        if impact is not None:
+            t0_impacted, uncovered = impact
+            source_files = [f for f in source_files if f in uncovered]
 
     # --- T1: Heuristic matching (directory-scoped first, then global) ---
     t1_dir_tests: set[str] = set()
@@ -296,10 +516,8 @@ def detect_related_tests(
 
             # Global fallback only if no directory-scoped match found
             if not found_dir_match:
-                for pattern in [f"**/test_{name_no_ext}.py", f"**/{name_no_ext}_test.py"]:
-                    matches = glob_mod.glob(os.path.join(project_dir, pattern), recursive=True)
-                    for m in matches:
-                        rel = os.path.relpath(m, project_dir)
+                for name in [f"test_{name_no_ext}.py", f"{name_no_ext}_test.py"]:
+                    for rel in _find_files_named(project_dir, name, changed_files):
                         if rel not in t0_tests:
                             t1_global_tests.add(rel)
 
@@ -317,10 +535,7 @@ def detect_related_tests(
 
             if not found_dir_match:
                 for test_ext in (".test", ".spec"):
-                    pattern = f"**/{name_no_ext}{test_ext}{ext}"
-                    matches = glob_mod.glob(os.path.join(project_dir, pattern), recursive=True)
-                    for m in matches:
-                        rel = os.path.relpath(m, project_dir)
+                    for rel in _find_files_named(project_dir, f"{name_no_ext}{test_ext}{ext}", changed_files):
                         if rel not in t0_tests:
                             t1_global_tests.add(rel)
 
@@ -341,11 +556,13 @@ def detect_related_tests(
     t1_tests = t1_dir_tests | t1_global_tests
 
     # Resolve to existing files and build commands
-    t0_existing = _resolve_test_files(t0_tests, project_dir)
+    t0_existing = _resolve_test_files(t0_tests, project_dir) + [
+        t for t in t0_impacted if t.split("::", 1)[0] not in t0_tests
+    ]
     t1_existing = _resolve_test_files(t1_tests, project_dir)
 
-    result["t0"] = _build_test_command(t0_existing, test_command)
-    result["t1"] = _build_test_command(t1_existing, test_command)
+    result["t0"] = _build_test_command(t0_existing, test_command, project_dir)
+    result["t1"] = _build_test_command(t1_existing, test_command, project_dir)
 
     return result
 
@@ -376,16 +593,15 @@ def pre_flight_check(story: dict, config: dict, state: dict, spec_key: str | Non
 
     # Check 2: Test mapping gaps for referenced file paths in criteria
     project_dir = config["project_dir"]
-    test_mapping = parse_test_mapping(project_dir)
-    if test_mapping:
-        import fnmatch as fnmatch_mod
+    rules = get_project_profile(project_dir)["mapping_rules"]
+    if rules:
         # Extract file paths mentioned in acceptance criteria text
         criteria_text = story.get("criteria_text", "")
         # Simple heuristic: look for path-like strings (containing / and a file extension)
         path_pattern = re.compile(r'[\w./]+/[\w.]+\.\w+')
         referenced_files = path_pattern.findall(criteria_text)
         for ref_file in referenced_files:
-            covered = any(fnmatch_mod.fnmatch(ref_file, p) for p in test_mapping)
+            covered = _mapped_tests(ref_file, rules) is not None
             if not covered:
                 msg = f"Pre-flight: {ref_file} referenced in criteria lacks test_mapping entry"
                 warnings.append(msg)
@@ -418,11 +634,10 @@ def check_test_mapping_gaps(
     if not os.path.exists(testing_guide):
         return []  # No TESTING_GUIDE.md — skip silently
 
-    test_mapping = parse_test_mapping(project_dir)
-    if not test_mapping:
+    rules = get_project_profile(project_dir)["mapping_rules"]
+    if not rules:
         return []
 
-    import fnmatch as fnmatch_mod
     warnings = []
     source_files = _filter_source_files(
         [f.strip() for f in changed_files_str.split("\n") if f.strip()]
@@ -432,10 +647,7 @@ def check_test_mapping_gaps(
         if src_file in warned_files:
             continue  # Already warned in a prior story
         # Check if any mapping pattern covers this file
-        covered = any(
-            fnmatch_mod.fnmatch(src_file, pattern)
-            for pattern in test_mapping
-        )
+        covered = _mapped_tests(src_file, rules) is not None
         if not covered:
             msg = f"Add test_mapping entry for {src_file} in TESTING_GUIDE.md"
             warnings.append(msg)
@@ -447,17 +659,37 @@ def check_test_mapping_gaps(
 
 def run_regression_check(
     project_dir: str, state: dict, current_story_id: str,
-    test_command: str | None, spec_key: str | None = None
+    test_command: str | None, spec_key: str | None = None,
+    use_impact_index: bool = False, sandbox_limits: dict | None = None,
 ) -> tuple[bool, str]:
     """Run regression tests from prior completed stories after a merge.
 
     Returns (passed, message). If passed is False, the merge should be reverted.
     Uses direct subprocess — not a Claude session.
     Records results in test-metrics.json for observability.
+
+    With `use_impact_index` and a test-impact index on disk, runs every test
+    that executes a line changed since the index commit (the pre-merge
+    feature head) instead of the capped test_mapping selection.
+
+    With `sandbox_limits` (`get_session_sandbox`), each pytest subprocess
+    runs in its own cgroup sandbox, like claude sessions.
     """
     if not test_command or "pytest" not in test_command:
         return True, "Skipped — no pytest command detected"
 
+    impact = select_impacted_tests(project_dir) if use_impact_index else None
+    if impact is not None:
+        impacted = impact[0]
+        if not impacted:
+            return True, "Skipped — no tests run the changed lines"
+        if len(impacted) > REGRESSION_NODE_ID_CAP:
+            # Keep the command line short; whole files still cover every selected test
+            impacted = sorted({t.split("::", 1)[0] for t in impacted})
+        return _run_regression_tests(
+            project_dir, impacted, current_story_id, "from the test-impact index", sandbox_limits,
+        )
+
     # Gather files_changed from prior completed stories
     if spec_key is not None:
         stories_dict = state.get("specs", {}).get(spec_key, {}).get("stories", {})
@@ -482,19 +714,14 @@ def run_regression_check(
         return True, "Skipped — no prior stories with files_changed"
 
     # Resolve test files through global test_mapping
-    import fnmatch as fnmatch_mod
-    test_mapping = parse_test_mapping(project_dir)
-    if not test_mapping:
+    rules = get_project_profile(project_dir)["mapping_rules"]
+    if not rules:
         return True, "Skipped — no test_mapping available"
 
     regression_tests: set[str] = set()
     source_files = _filter_source_files(prior_files)
     for src_file in source_files:
-        for pattern, test_pattern in test_mapping.items():
-            if fnmatch_mod.fnmatch(src_file, pattern):
-                for tp in test_pattern.split():
-                    if tp:
-                        regression_tests.add(tp)
+        regression_tests.update(_mapped_tests(src_file, rules) or [])
 
     # Resolve to existing files
     existing = _resolve_test_files(regression_tests, project_dir)
@@ -506,49 +733,229 @@ def run_regression_check(
         existing = sorted(existing)[:REGRESSION_TEST_FILE_CAP]
         log(f"  Regression: capped at {REGRESSION_TEST_FILE_CAP} test files")
 
-    test_files = sorted(existing)
-    cmd = ["python3", "-m", "pytest"] + test_files + ["-x", "-q", "--tb=short"]
-    log(f"  Regression check: {len(existing)} test files from {story_count} prior stories")
+    return _run_regression_tests(
+        project_dir, sorted(existing), current_story_id, f"from {story_count} prior stories", sandbox_limits,
+    )
 
-    try:
-        proc = subprocess.Popen(
-            cmd, cwd=project_dir,
-            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-            text=True, start_new_session=True,
-        )
+
+def _has_xdist(project_dir: str) -> bool:
+    """Return True if pytest-xdist is importable by the project's python3."""
+    if project_dir not in _XDIST_AVAILABLE:
         try:
-            stdout, stderr_out = proc.communicate(timeout=REGRESSION_TIMEOUT)
-        except subprocess.TimeoutExpired:
-            _kill_process_group(proc.pid)
-            try:
-                proc.kill()
-            except OSError:
-                pass
-            # Bound the final wait (see run_claude_session for rationale).
-            try:
-                proc.wait(timeout=10)
-            except subprocess.TimeoutExpired:
-                log(f"  WARNING: regression subprocess {proc.pid} did not exit after SIGKILL — continuing with process leaked")
-            log(f"  WARNING: Regression check timed out after {REGRESSION_TIMEOUT}s — skipping")
-            update_test_metrics_from_regression(project_dir, test_files, False, current_story_id)
-            return True, f"Timed out after {REGRESSION_TIMEOUT}s — skipped (best-effort)"
+            returncode, _, _ = run_command(["python3", "-c", "import xdist"], project_dir, 30)
+        except OSError:
+            returncode = None
+        _XDIST_AVAILABLE[project_dir] = returncode == 0
+    return _XDIST_AVAILABLE[project_dir]
 
-        # Always clean up the process group (pytest may leave child processes)
-        _kill_process_group(proc.pid)
 
-        passed = proc.returncode == 0
-        update_test_metrics_from_regression(project_dir, test_files, passed, current_story_id)
+def _estimate_durations(project_dir: str, test_files: list[str]) -> dict[str, float]:
+    """Expected seconds per test file (node IDs by their file) from test-metrics.json.
 
-        if passed:
-            return True, f"Passed ({len(existing)} test files)"
-        # Tests failed — regression detected
-        output_lines = (stdout + stderr_out).strip().split("\n")
-        partial = "\n".join(output_lines[:50])
-        return False, f"REGRESSION: tests failed\n{partial}"
+    Files without a recorded duration get the median of the known ones (or 1s).
+    """
+    tests = load_test_metrics(project_dir).get("tests", {})
+    known = {}
+    for path in {t.split("::", 1)[0] for t in test_files}:
+        entry = tests.get(path) or {}
+        total, runs = entry.get("total_duration_s") or 0.0, entry.get("runs") or 0
+        if total > 0 and runs > 0:
+            known[path] = total / runs
+    fallback = sorted(known.values())[len(known) // 2] if known else 1.0
+    return {t: known.get(t.split("::", 1)[0], fallback) for t in test_files}
+
+
+def _failure_probability(entry: dict) -> float:
+    """Chance a test file fails on its next run, from its metrics entry.
+
+    Laplace-smoothed failure rate (an unseen file scores 0.5), pulled
+    halfway towards 1 when the most recent run failed.
+    """
+    runs = entry.get("runs") or 0
+    failures = entry.get("failures") or 0
+    p = (failures + 1) / (runs + 2)
+    if entry.get("last_failure") and entry.get("last_failure") == entry.get("last_run"):
+        p = (1 + p) / 2
+    return p
+
+
+def order_tests_failure_first(project_dir: str, test_files: list[str]) -> list[str]:
+    """Order tests (files, node IDs or globs) most-likely-to-fail and fastest first.
+
+    Sorts by failure probability per expected second, which minimises the
+    expected time until a fail-fast (`-x`) run reports its first failure.
+    Node IDs are scored by their file.
+    """
+    tests = load_test_metrics(project_dir).get("tests", {})
+    estimates = _estimate_durations(project_dir, test_files)
+
+    def score(t: str) -> float:
+        entry = tests.get(t.split("::", 1)[0]) or {}
+        return _failure_probability(entry) / max(estimates[t], 0.05)
+
+    return sorted(test_files, key=lambda t: (-score(t), t))
+
+
+def _recently_failed(project_dir: str, test_files: list[str]) -> set[str]:
+    """Files among `test_files` (by file) whose most recent run failed."""
+    tests = load_test_metrics(project_dir).get("tests", {})
+    failed = set()
+    for path in {t.split("::", 1)[0] for t in test_files}:
+        entry = tests.get(path) or {}
+        if entry.get("last_failure") and entry.get("last_failure") == entry.get("last_run"):
+            failed.add(path)
+    return failed
+
+
+def _plan_regression_shards(
+    test_files: list[str], estimates: dict[str, float], recently_failed: set[str] | None = None,
+) -> list[list[str]]:
+    """Group test files (or node IDs, by file) into shards, longest expected first.
+
+    Up to REGRESSION_SHARD_MAX files get a shard each; beyond that files are
+    packed longest-first into the least-loaded of REGRESSION_SHARD_MAX shards.
+    Shards holding a file in `recently_failed` are queued ahead of the rest,
+    and within a packed shard those files run first.
+    """
+    recently_failed = recently_failed or set()
+    by_file: dict[str, list[str]] = {}
+    for t in test_files:
+        by_file.setdefault(t.split("::", 1)[0], []).append(t)
+    weight = {f: sum(estimates[t] for t in tests) for f, tests in by_file.items()}
+    ordered = sorted(by_file, key=lambda f: weight[f], reverse=True)
+    if len(ordered) <= REGRESSION_SHARD_MAX:
+        return sorted((by_file[f] for f in ordered), key=lambda shard: shard[0].split("::", 1)[0] not in recently_failed)
+    shards: list[list[str]] = [[] for _ in range(REGRESSION_SHARD_MAX)]
+    loads = [0.0] * REGRESSION_SHARD_MAX
+    for f in ordered:
+        slot = loads.index(min(loads))
+        shards[slot].extend(by_file[f])
+        loads[slot] += weight[f]
+    for shard in shards:
+        shard.sort(key=lambda t: t.split("::", 1)[0] not in recently_failed)  # stable
+    order = sorted(
+        range(REGRESSION_SHARD_MAX),
+        key=lambda i: (not any(t.split("::", 1)[0] in recently_failed for t in shards[i]), -loads[i]),
+    )
+    return [shards[i] for i in order if shards[i]]
+
+
+async def _run_shards_async(
+    project_dir: str, shards: list[list[str]], workers: int, sandbox_limits: dict | None = None,
+) -> list[dict]:
+    """Run shards on a pool of `workers` subprocesses; stop the rest on the first failure."""
+    semaphore = asyncio.Semaphore(workers)
+
+    async def run_shard(shard: list[str]) -> dict:
+        async with semaphore:
+            started = time.monotonic()
+            returncode, stdout, stderr_out = await run_command_async(
+                ["python3", "-m", "pytest"] + shard + ["-x", "-q", "--tb=short"],
+                project_dir, REGRESSION_TIMEOUT, sandbox_limits=sandbox_limits,
+            )
+        return {
+            "tests": shard, "returncode": returncode, "output": stdout + stderr_out,
+            "duration_s": time.monotonic() - started,
+        }
+
+    # Tasks queue on the semaphore in creation order, i.e. longest shard first
+    pending = [asyncio.ensure_future(run_shard(shard)) for shard in shards]
+    results = []
+    try:
+        for finished in asyncio.as_completed(pending):
+            result = await finished
+            results.append(result)
+            if result["returncode"] not in (0, None):
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    return results
+
+
+def _run_regression_tests(
+    project_dir: str, test_files: list[str], current_story_id: str, source: str,
+    sandbox_limits: dict | None = None,
+) -> tuple[bool, str]:
+    """Run the selected regression tests (files or node IDs) and record metrics.
+
+    With pytest-xdist the whole set is one `pytest -n <workers>` run, files
+    passed failure-first. Otherwise the set is split into shards that run as
+    parallel pytest subprocesses: shards with a recent failure first, then
+    longest expected first (with a single worker there is no load to
+    balance, so shards go failure-first). REGRESSION_TIMEOUT applies per
+    shard. An xdist run that times out is rerun as the planned shards, so
+    here too only a shard that times out is skipped, never the whole check.
+    """
+    estimates = _estimate_durations(project_dir, test_files)
+    shards = _plan_regression_shards(test_files, estimates, _recently_failed(project_dir, test_files))
+    workers = max(1, min(REGRESSION_WORKERS, len(shards)))
+    if workers == 1:
+        rank = {t: i for i, t in enumerate(order_tests_failure_first(project_dir, [sh[0] for sh in shards]))}
+        shards.sort(key=lambda shard: rank[shard[0]])
+    planned = shards
+    if workers > 1 and _has_xdist(project_dir):
+        shards = [order_tests_failure_first(project_dir, test_files)]
+        extra = ["-n", str(workers), "--dist", "loadfile"]
+        log(f"  Regression check: {len(test_files)} tests/files {source} (xdist, {workers} workers)")
+    else:
+        extra = []
+        log(f"  Regression check: {len(test_files)} tests/files {source} "
+            f"({len(shards)} shards, {workers} workers)")
+
+    try:
+        if extra:
+            started = time.monotonic()
+            returncode, stdout, stderr_out = run_command(
+                ["python3", "-m", "pytest"] + shards[0] + extra + ["-x", "-q", "--tb=short"],
+                project_dir, REGRESSION_TIMEOUT, sandbox_limits=sandbox_limits,
+            )
+            results = [{"tests": shards[0], "returncode": returncode, "output": stdout + stderr_out,
+                        "duration_s": time.monotonic() - started}]
+            if returncode is None:
+                log(f"  Regression check: xdist run timed out after {REGRESSION_TIMEOUT}s — "
+                    f"rerunning as {len(planned)} shards")
+                extra = []
+                results = run_on_engine(_run_shards_async(project_dir, planned, workers, sandbox_limits))
+        else:
+            results = run_on_engine(_run_shards_async(project_dir, shards, workers, sandbox_limits))
     except OSError as e:
         log(f"  WARNING: Regression check error: {e}")
         return True, f"Error: {e} — skipped"
 
+    timed_out = []
+    failed = None
+    for result in results:
+        metric_files = sorted({t.split("::", 1)[0] for t in result["tests"]})
+        if result["returncode"] is None:
+            timed_out.extend(metric_files)
+            update_test_metrics_from_regression(
+                project_dir, metric_files, False, current_story_id, timed_out=True
+            )
+            continue
+        passed = result["returncode"] == 0
+        update_test_metrics_from_regression(
+            project_dir, metric_files, passed, current_story_id,
+            duration_s=result["duration_s"] if not extra else None,
+        )
+        if not passed and failed is None:
+            failed = result
+
+    if failed is not None:
+        # Tests failed — regression detected
+        output_lines = failed["output"].strip().split("\n")
+        partial = "\n".join(output_lines[:50])
+        return False, f"REGRESSION: tests failed\n{partial}"
+    if timed_out:
+        log(f"  WARNING: Regression shard(s) timed out after {REGRESSION_TIMEOUT}s: "
+            f"{', '.join(timed_out[:5])}{' ...' if len(timed_out) > 5 else ''}")
+        if len(timed_out) == len({t.split("::", 1)[0] for t in test_files}):
+            return True, f"Timed out after {REGRESSION_TIMEOUT}s — skipped (best-effort)"
+        return True, (f"Passed ({len(test_files)} tests/files; {len(timed_out)} "
+                      f"timed out after {REGRESSION_TIMEOUT}s — skipped)")
+    return True, f"Passed ({len(test_files)} tests/files)"
+
 
 def make_quiet(test_command: str) -> str:
     """Add quiet flags for full-suite runs. Suppresses PASSED noise, preserves failure tracebacks."""
@@ -563,6 +970,15 @@ def make_quiet(test_command: str) -> str:
 
 
 def detect_test_command(project_dir: str) -> str | None:
+    """Auto-detect the project's test command, or None if not detected.
+
+    Cached per checkout; see `get_project_profile` and
+    `_detect_test_command_uncached` for the detection order.
+    """
+    return get_project_profile(project_dir)["test_command"]
+
+
+def _detect_test_command_uncached(project_dir: str) -> str | None:
     """Auto-detect the project's test command.
 
     Checks in order:
@@ -7,6 +7,8 @@ import os
 import re
 import subprocess
 import tempfile
+import threading
+import time
 from datetime import datetime, timezone
 import yaml
 
@@ -145,6 +147,41 @@ def log(message: str) -> None:
 # --- domain module depend on utils without circular imports.)
 
 
+# Wall-clock spent in git, per operation ("git checkout", "cat-file resolve", ...):
+# op -> [calls, seconds]. Lets a run show where its git time goes.
+_GIT_TIMINGS: dict[str, list] = {}
+_GIT_TIMINGS_LOCK = threading.Lock()
+
+
+def record_git_timing(op: str, seconds: float) -> None:
+    """Add one git call's duration to the per-operation totals."""
+    with _GIT_TIMINGS_LOCK:
+        entry = _GIT_TIMINGS.setdefault(op, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+
+def get_git_timings() -> dict[str, dict]:
+    """Return `{op: {"calls", "total_s", "avg_ms"}}` for git calls made so far."""
+    with _GIT_TIMINGS_LOCK:
+        return {
+            op: {"calls": calls, "total_s": round(total, 3), "avg_ms": round(total / calls * 1000, 2)}
+            for op, (calls, total) in _GIT_TIMINGS.items()
+        }
+
+
+def format_git_timings(top: int = 8) -> str:
+    """One-line summary of the slowest git operations, or "" if none ran."""
+    timings = get_git_timings()
+    if not timings:
+        return ""
+    ordered = sorted(timings.items(), key=lambda item: item[1]["total_s"], reverse=True)
+    total = sum(t["total_s"] for t in timings.values())
+    calls = sum(t["calls"] for t in timings.values())
+    parts = [f"{op} {t['calls']}x/{t['total_s']:.2f}s" for op, t in ordered[:top]]
+    return f"Git time: {total:.2f}s over {calls} calls ({', '.join(parts)})"
+
+
 def run_git(args: list[str], project_dir: str, check: bool = False) -> subprocess.CompletedProcess:
     """Run a git command with optional error logging.
 
@@ -153,9 +190,11 @@ def run_git(args: list[str], project_dir: str, check: bool = False) -> subproces
         project_dir: Working directory for the command.
         check: If True, log a warning when the command fails (non-fatal).
     """
+    started = time.monotonic()
     result = subprocess.run(
         ["git"] + args, cwd=project_dir, capture_output=True, text=True
     )
+    record_git_timing(f"git {args[0] if args else ''}", time.monotonic() - started)
     if check and result.returncode != 0:
         cmd_str = "git " + " ".join(args)
         log(f"  WARNING: git command failed: {cmd_str}\n    stderr: {result.stderr.strip()[:200]}")
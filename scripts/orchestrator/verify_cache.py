@@ -0,0 +1,129 @@
+"""Part of the KitTools orchestrator package (split from the monolithic
+execute_orchestrator.py during the 2.4.0 refactor). See the package-level
+__init__ for the full public API.
+
+Content-addressed cache of verifier verdicts. An attempt whose tree, story
+criteria, verifier model and verifier template all match an earlier judged
+attempt reuses that verdict instead of paying for another verifier session
+(merge-conflict retries that reproduce the same tree, resumed runs).
+"""
+from __future__ import annotations
+import fcntl
+import hashlib
+import json
+import os
+import threading
+
+from .git_ops import TRACKING_FILES, get_git_repo
+from .sessions import IMPL_RESULT_FILE, VERIFY_RESULT_FILE
+from .test_impact import TEST_IMPACT_FILE
+from .tests_metrics import TEST_METRICS_FILE
+from .utils import log, now_iso, run_git
+
+VERIFY_CACHE_FILE = os.path.join("kit_tools", ".execution-verify-cache.json")
+VERIFY_CACHE_MAX = 200  # entries kept; least recently used are evicted
+
+# Bookkeeping the orchestrator itself writes into the checkout (glob
+# pathspecs). Uncommitted changes to these do not make a tree "dirty" for
+# the cache key: they are not what the verifier judges.
+ORCHESTRATOR_OWNED_PATHS = TRACKING_FILES + (
+    TEST_METRICS_FILE,
+    TEST_IMPACT_FILE,
+    IMPL_RESULT_FILE,
+    VERIFY_RESULT_FILE,
+    os.path.join("kit_tools", ".execution-*"),
+    os.path.join("kit_tools", "specs", ".execution-*"),
+    os.path.join("kit_tools", ".pause_execution"),
+)
+
+# Serialises cache access between parallel worker threads; fcntl covers
+# other processes sharing the project.
+_VERIFY_CACHE_LOCK = threading.Lock()
+
+
+def get_verify_cache_path(project_dir: str) -> str:
+    """Return absolute path to the verification cache file."""
+    return os.path.join(project_dir, VERIFY_CACHE_FILE)
+
+
+def get_verify_cache_key(config: dict, work_dir: str, story: dict, model: str | None) -> str | None:
+    """Hash (attempt tree SHA, criteria text, verifier model, verifier template).
+
+    Returns None when `verify_cache` is disabled in the config, the tree SHA
+    cannot be resolved, or `work_dir` has uncommitted changes other than the
+    orchestrator's own bookkeeping (ORCHESTRATOR_OWNED_PATHS) — the commit
+    tree would not be what the verifier sees.
+    """
+    if config.get("verify_cache", True) is False:
+        return None
+    status = run_git(
+        ["status", "--porcelain", "--", "."]
+        + [f":(exclude,glob){p}" for p in ORCHESTRATOR_OWNED_PATHS],
+        work_dir,
+    )
+    if status.returncode != 0 or status.stdout.strip():
+        return None
+    tree = get_git_repo(work_dir).resolve("HEAD^{tree}")
+    if not tree:
+        return None
+    template_hash = hashlib.sha256(config.get("verifier_template", "").encode()).hexdigest()
+    material = "\0".join([tree, story.get("criteria_text", ""), model or "", template_hash])
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+def _with_cache(project_dir: str, update) -> dict | None:
+    """Run `update(entries) -> result` on the cache under both locks, then persist it."""
+    path = get_verify_cache_path(project_dir)
+    with _VERIFY_CACHE_LOCK:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a+") as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                f.seek(0)
+                try:
+                    entries = json.loads(f.read() or "{}")
+                except ValueError:
+                    log("  WARNING: verification cache corrupted — starting fresh")
+                    entries = {}
+                if not isinstance(entries, dict):
+                    entries = {}
+                result = update(entries)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(entries, indent=2))
+                return result
+        except OSError as e:
+            log(f"  WARNING: verification cache unavailable: {e}")
+            return None
+
+
+def lookup_cached_verdict(project_dir: str, key: str | None) -> dict | None:
+    """Return the cached verdict for `key` (marking it recently used), or None."""
+    if not key:
+        return None
+
+    def touch(entries: dict) -> dict | None:
+        entry = entries.get(key)
+        if not isinstance(entry, dict) or not isinstance(entry.get("verdict"), dict):
+            return None
+        entry["last_used"] = now_iso()
+        entry["hits"] = entry.get("hits", 0) + 1
+        return entry["verdict"]
+
+    return _with_cache(project_dir, touch)
+
+
+def store_cached_verdict(project_dir: str, key: str | None, verdict: dict, story_id: str) -> None:
+    """Cache a definitive verdict, evicting the least recently used entries."""
+    if not key or verdict.get("verdict") not in ("pass", "pass_with_warnings", "fail"):
+        return
+
+    def put(entries: dict) -> None:
+        now = now_iso()
+        entries[key] = {"story_id": story_id, "verdict": verdict, "stored_at": now, "last_used": now, "hits": 0}
+        if len(entries) > VERIFY_CACHE_MAX:
+            by_age = sorted(entries, key=lambda k: entries[k].get("last_used", ""))
+            for stale in by_age[:len(entries) - VERIFY_CACHE_MAX]:
+                del entries[stale]
+
+    _with_cache(project_dir, put)